@@ -0,0 +1,2 @@
+# Benchmarks for the ticket assignment system. Run from the repository root, e.g.
+# python -m benchmarks.bench_skill_matcher
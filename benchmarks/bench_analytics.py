@@ -0,0 +1,63 @@
+"""
+Benchmark the vectorized fairness report over a large synthetic assignment history.
+
+Builds the columns of --rows assignments spread over --runs runs and
+--agents agents (skewed towards a few busy agents, with some fallbacks and
+tickets without matching skills) and times the report and a time-window
+filter. Loading outputs from disk is not included; it is dominated by JSON
+parsing and skill extraction, once per ticket.
+
+Usage: python -m benchmarks.bench_analytics [--rows 5000000] [--runs 60] [--agents 500]
+"""
+import argparse
+import time
+import numpy as np
+from src.analytics import AssignmentHistory
+
+
+def synthetic_history(rows: int, runs: int, agents: int, seed: int = 42) -> AssignmentHistory:
+    """A random history with Zipf-like agent loads and one day of tickets per run."""
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, agents + 1) ** 0.5
+    run = np.sort(rng.integers(0, runs, rows))
+    match = rng.random(rows).astype(np.float32)
+    match[rng.random(rows) < 0.2] = 0.0
+    return AssignmentHistory(
+        run_names=[f"run_{index:03d}" for index in range(runs)],
+        agent_ids=[f"agent_{index:04d}" for index in range(agents)],
+        available=rng.random(agents) < 0.9,
+        run=run,
+        agent=rng.choice(agents, rows, p=weights / weights.sum()),
+        timestamp=1757827200 + run * 86400 + rng.integers(0, 86400, rows),
+        match=match,
+        fallback=rng.random(rows) < 0.02
+    )
+
+
+def main():
+    """Time the report over the whole history and over a one-week window."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5_000_000)
+    parser.add_argument("--runs", type=int, default=60)
+    parser.add_argument("--agents", type=int, default=500)
+    args = parser.parse_args()
+    
+    history = synthetic_history(args.rows, args.runs, args.agents)
+    start = time.perf_counter()
+    report = history.report()
+    report_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    week = history.window(1757827200, 1757827200 + 7 * 86400)
+    week_report = week.report()
+    window_seconds = time.perf_counter() - start
+    
+    print(f"rows: {len(history)}, runs: {args.runs}, agents: {args.agents}")
+    print(f"{'pass':<16} {'rows':>10} {'seconds':>9} {'rows/s':>12} {'gini':>6} {'over cap':>9}")
+    for name, result, seconds in (("full history", report, report_seconds), ("one week", week_report, window_seconds)):
+        print(f"{name:<16} {result['assignments']:>10} {seconds:>9.3f} {result['assignments'] / seconds:>12.0f} "
+              f"{result['load_gini']:>6.3f} {result['agents_over_cap']:>9}")
+
+
+if __name__ == "__main__":
+    main()
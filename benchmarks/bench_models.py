@@ -0,0 +1,115 @@
+"""
+Benchmark the memory footprint of the agent and ticket models.
+
+Compares the previous representation (plain dataclasses with a dict of skills
+per agent and every description in memory) with the slotted models, interned
+skill names and lazily loaded descriptions, on any dataset in the
+dataset.json schema (see benchmarks.generate_dataset for large ones).
+
+Usage: python -m benchmarks.bench_models [--dataset big.json] [--lookups N]
+"""
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict
+from src.data_loader import DataLoader, iter_json_array
+
+
+@dataclass
+class LegacyAgent:
+    """The previous agent model: a regular dataclass with a dict of skills."""
+    agent_id: str
+    name: str
+    skills: Dict[str, int]
+    current_load: int
+    availability_status: str
+    experience_level: int
+    
+    def get_skill_score(self, skill_name: str) -> int:
+        return self.skills.get(skill_name, 0)
+
+
+@dataclass
+class LegacyTicket:
+    """The previous ticket model: a regular dataclass holding the description."""
+    ticket_id: str
+    title: str
+    description: str
+    creation_timestamp: int
+
+
+def load_legacy(dataset_path: str):
+    """Load agents and tickets into the previous models."""
+    agents = {}
+    for data in iter_json_array(dataset_path, 'agents'):
+        agents[data['agent_id']] = LegacyAgent(
+            agent_id=data['agent_id'],
+            name=data['name'],
+            skills={skill: int(level) for skill, level in data['skills'].items()},
+            current_load=data['current_load'],
+            availability_status=data['availability_status'],
+            experience_level=data['experience_level']
+        )
+    tickets = [LegacyTicket(**data) for data in iter_json_array(dataset_path, 'tickets')]
+    return agents, tickets
+
+
+def load_compact(dataset_path: str, lazy: bool):
+    """Load agents and tickets into the current models."""
+    return DataLoader(dataset_path, lazy_descriptions=lazy).load_data()
+
+
+def measure(load):
+    """Return (result, retained MB, seconds) of a loading function."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = load()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return result, retained / 1e6, elapsed
+
+
+def lookup_rate(agents, skills, lookups: int) -> float:
+    """get_skill_score calls per second over all agents and skills."""
+    agent_list = list(agents.values())
+    start = time.perf_counter()
+    done = 0
+    while done < lookups:
+        for agent in agent_list:
+            for skill in skills:
+                agent.get_skill_score(skill)
+            done += len(skills)
+    return done / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark and print retained memory per representation."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dataset", default="dataset.json")
+    parser.add_argument("--lookups", type=int, default=200000, help="get_skill_score calls to time")
+    args = parser.parse_args()
+    
+    with open(args.dataset, 'r', encoding='utf-8') as file:
+        skills = sorted({skill for agent in json.load(file)['agents'] for skill in agent['skills']})
+    
+    rows = []
+    for name, load in (("legacy dataclasses", lambda: load_legacy(args.dataset)),
+                       ("slotted models", lambda: load_compact(args.dataset, lazy=False)),
+                       ("slotted + lazy descriptions", lambda: load_compact(args.dataset, lazy=True))):
+        (agents, tickets), megabytes, seconds = measure(load)
+        rows.append((name, len(agents), len(tickets), megabytes, seconds, lookup_rate(agents, skills, args.lookups)))
+        del agents, tickets
+    
+    print(f"{'representation':<28} {'agents':>7} {'tickets':>8} {'retained MB':>12} {'load s':>8} {'lookups/s':>11}")
+    for name, agent_count, ticket_count, megabytes, seconds, rate in rows:
+        print(f"{name:<28} {agent_count:>7} {ticket_count:>8} {megabytes:>12.2f} {seconds:>8.2f} {rate:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
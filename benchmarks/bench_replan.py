@@ -0,0 +1,62 @@
+"""
+Benchmark incremental re-planning against re-running the whole assignment.
+
+Assigns a dataset with the local backend, then takes the busiest agent
+offline, brings it back with rebalancing and adds a new agent, timing each
+update next to a full re-run and checking that only the affected tickets
+changed and the 11% cap still holds.
+
+Usage: python -m benchmarks.bench_replan [--dataset big.json] [--backend local]
+"""
+import argparse
+import time
+from collections import Counter
+from src.models import Agent
+from src.ticket_processor import QUIET, TicketProcessor
+
+
+def timed(update) -> tuple:
+    """Run an update and return (seconds, result)."""
+    start = time.perf_counter()
+    result = update()
+    return time.perf_counter() - start, result
+
+
+def main():
+    """Run the updates and print their cost next to a full re-run."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dataset", default="dataset.json")
+    parser.add_argument("--backend", default="local", choices=("local", "optimal"))
+    args = parser.parse_args()
+    
+    processor = TicketProcessor(args.dataset, backend=args.backend, verbosity=QUIET)
+    processor.initialize()
+    full_seconds, _ = timed(processor.process_all_tickets)
+    total_tickets = len(processor.tickets)
+    max_workload = int(total_tickets * 0.11)
+    busiest = Counter(assignment.assigned_agent_id for assignment in processor.assignments).most_common(1)[0][0]
+    template = processor.agents[busiest]
+    newcomer = Agent("agent_new", "New Agent", {skill: 10 for skill in template.skills}, 0, "Available", 10)
+    
+    updates = [
+        (f"{busiest} offline", lambda: processor.update_agent(busiest, availability_status="Offline")),
+        (f"{busiest} back", lambda: processor.update_agent(busiest, availability_status="Available", rebalance=True)),
+        ("agent_new joins", lambda: processor.add_agent(newcomer)),
+    ]
+    print(f"agents: {len(processor.agents)}, tickets: {total_tickets}, backend: {args.backend}")
+    print(f"{'update':<22} {'seconds':>9} {'re-assigned':>12} {'untouched':>10}")
+    print(f"{'(full run)':<22} {full_seconds:>9.4f} {total_tickets:>12}")
+    for name, update in updates:
+        before = list(processor.assignments)
+        seconds, changed = timed(update)
+        untouched = sum(old is new for old, new in zip(before, processor.assignments))
+        print(f"{name:<22} {seconds:>9.4f} {len(changed):>12} {untouched:>10}")
+    
+    # Fallbacks may exceed the cap on oversubscribed datasets, as in a full run
+    over = [agent_id for agent_id, count in Counter(
+        assignment.assigned_agent_id for assignment in processor.assignments).items() if count > max_workload]
+    print(f"agents over the cap of {max_workload}: {len(over)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Benchmark top-k candidate shortlisting of LLM prompts.
+
+Asks for an assignment of each ticket twice, once with the whole roster in
+the prompt and once with only the top-k shortlist, and reports the prompt
+tokens saved and how often both prompts get the same answer. By default the
+answers come from a skill-aware fake model that picks the listed agent with
+the best level in the ticket's skills (lower load breaks ties); --live uses
+the configured OpenAI model instead (needs OPENAI_API_KEY, costs tokens).
+
+Usage: python -m benchmarks.bench_shortlist [--dataset big.json] [--k 5] [--tickets N] [--live]
+"""
+import argparse
+import os
+import re
+from typing import Dict
+from benchmarks.fake_llm import FakeResult, TICKET_ID
+from src.data_loader import DataLoader
+from src.llm_assigner import LLMAssigner
+from src.metrics import Metrics
+from src.models import Ticket
+from src.skills import extract_relevant_skills
+
+AGENT_LINE = re.compile(r"^- .*?\((\S+)\): Skills: (.*?), Current Load: (\d+)/", re.MULTILINE)
+TICKET_TEXT = re.compile(r"^- Title: (.*)\n- Description: (.*)$", re.MULTILINE)
+
+
+class SkillAwareFakeLLM:
+    """Picks the listed agent with the highest total level in the ticket's skills."""
+    
+    def __call__(self, prompt: str) -> FakeResult:
+        title, description = TICKET_TEXT.search(prompt).groups()
+        wanted = extract_relevant_skills(Ticket(TICKET_ID.search(prompt).group(1), title, description, 0))
+        best = None
+        for agent_id, skills_str, load in AGENT_LINE.findall(prompt):
+            levels: Dict[str, int] = {}
+            for item in skills_str.split(", "):
+                skill, _, level = item.partition(": ")
+                levels[skill] = int(level)
+            key = (-sum(levels.get(skill, 0) for skill in wanted), int(load))
+            if best is None or key < best[0]:
+                best = (key, agent_id)
+        return FakeResult(best[1] if best else "agent_unknown", prompt)
+
+
+def make_assigner(k: int, live: bool, metrics: Metrics) -> LLMAssigner:
+    """An LLMAssigner with a shortlist of k (0 = whole roster)."""
+    if live:
+        return LLMAssigner(os.getenv("OPENAI_API_KEY"), metrics=metrics, shortlist_k=k)
+    fake = SkillAwareFakeLLM()
+    return LLMAssigner("fake-key", agent_factory=lambda: fake, metrics=metrics, shortlist_k=k)
+
+
+def main():
+    """Run both prompt variants over the tickets and print the comparison."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dataset", default="dataset.json")
+    parser.add_argument("--k", type=int, default=5, help="agents per shortlisted prompt")
+    parser.add_argument("--tickets", type=int, default=200, help="tickets to compare")
+    parser.add_argument("--live", action="store_true", help="use the real OpenAI model")
+    args = parser.parse_args()
+    
+    agents, tickets = DataLoader(args.dataset).load_data()
+    tickets = tickets[:args.tickets]
+    total_tickets = len(tickets)
+    
+    full_metrics, short_metrics = Metrics(), Metrics()
+    full_assigner = make_assigner(0, args.live, full_metrics)
+    short_assigner = make_assigner(args.k, args.live, short_metrics)
+    
+    agreed = 0
+    for ticket in tickets:
+        # Agent state is not changed, so both prompts see the same roster
+        full_answer = full_assigner.assign_ticket(ticket, agents, total_tickets).assigned_agent_id
+        short_answer = short_assigner.assign_ticket(ticket, agents, total_tickets).assigned_agent_id
+        agreed += full_answer == short_answer
+    
+    full_tokens = full_metrics.counter("llm_tokens_in")
+    short_tokens = short_metrics.counter("llm_tokens_in")
+    print(f"agents: {len(agents)}, tickets: {len(tickets)}, k: {args.k}")
+    print(f"{'prompt':<12} {'tokens in':>10} {'per ticket':>11}")
+    for name, tokens in (("full roster", full_tokens), ("shortlist", short_tokens)):
+        print(f"{name:<12} {int(tokens):>10} {tokens / max(len(tickets), 1):>11.1f}")
+    if full_tokens:
+        print(f"tokens saved: {1 - short_tokens / full_tokens:.1%}")
+    print(f"agreement with full-roster answers: {agreed / max(len(tickets), 1):.1%}")
+
+
+if __name__ == "__main__":
+    main()
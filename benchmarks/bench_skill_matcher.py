@@ -0,0 +1,80 @@
+"""
+Benchmark skill keyword extraction on long ticket descriptions.
+
+Compares the single-pass matcher with the previous approach of one substring
+scan per keyword, for the default mapping and for a mapping extended with
+--extra-keywords synthetic entries (as ops would add through config).
+
+Usage: python -m benchmarks.bench_skill_matcher [--tickets N] [--repeat R] [--extra-keywords K]
+"""
+import argparse
+import json
+import time
+from src.models import Ticket
+from src.skills import SKILL_MAPPING, SkillMatcher
+
+
+def make_substring_scan(mapping):
+    """The previous extraction: one substring scan per keyword, no dedup."""
+    def substring_scan(ticket: Ticket):
+        text = f"{ticket.title} {ticket.description}".lower()
+        return [skill for keyword, skill in mapping.items() if keyword in text]
+    return substring_scan
+
+
+def make_matcher(mapping):
+    """The single-pass matcher used by extract_relevant_skills."""
+    matcher = SkillMatcher(mapping)
+    return lambda ticket: matcher.match(f"{ticket.title} {ticket.description}")
+
+
+def load_long_tickets(dataset_path: str, count: int, repeat: int):
+    """Build tickets whose descriptions are dataset descriptions repeated `repeat` times."""
+    with open(dataset_path, 'r', encoding='utf-8') as file:
+        source = json.load(file)['tickets']
+    tickets = []
+    for i in range(count):
+        data = source[i % len(source)]
+        tickets.append(Ticket(
+            ticket_id=f"BENCH-{i:06d}",
+            title=data['title'],
+            description=" ".join([data['description']] * repeat),
+            creation_timestamp=data['creation_timestamp']
+        ))
+    return tickets
+
+
+def measure(extract, tickets):
+    """Return (tickets/sec, MB/sec) for an extraction function."""
+    total_chars = sum(len(t.title) + len(t.description) + 1 for t in tickets)
+    start = time.perf_counter()
+    for ticket in tickets:
+        extract(ticket)
+    elapsed = time.perf_counter() - start
+    return len(tickets) / elapsed, total_chars / elapsed / 1e6
+
+
+def main():
+    """Run the benchmark and print throughput for both extractors."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dataset", default="dataset.json")
+    parser.add_argument("--tickets", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=20, help="description length multiplier")
+    parser.add_argument("--extra-keywords", type=int, default=500, help="synthetic keywords for the extended mapping")
+    args = parser.parse_args()
+    
+    tickets = load_long_tickets(args.dataset, args.tickets, args.repeat)
+    avg_chars = sum(len(t.description) for t in tickets) / len(tickets)
+    print(f"{len(tickets)} tickets, average description length {avg_chars:.0f} chars")
+    
+    extended = dict(SKILL_MAPPING)
+    extended.update({f"product{i:04d}": f"Product_{i:04d}" for i in range(args.extra_keywords)})
+    for label, mapping in (("default", SKILL_MAPPING), ("extended", extended)):
+        print(f"{label} mapping ({len(mapping)} keywords):")
+        for name, extract in (("substring scan", make_substring_scan(mapping)), ("single-pass matcher", make_matcher(mapping))):
+            per_sec, mb_per_sec = measure(extract, tickets)
+            print(f"  {name:<20} {per_sec:>10.0f} tickets/s  {mb_per_sec:>7.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
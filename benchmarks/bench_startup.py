@@ -0,0 +1,89 @@
+"""
+Benchmark cold-start time of the offline CLI commands.
+
+Runs each command in a fresh interpreter several times and reports the
+median wall time and which heavy packages (LLM SDK, NumPy, dotenv) it
+imported. With --max-seconds, exits non-zero when a command is slower, so
+the check can guard cron jobs and short-lived containers.
+
+Usage: python -m benchmarks.bench_startup [--runs 5] [--max-seconds 0.5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import List, Tuple
+
+HEAVY_PACKAGES = ("strands", "openai", "numpy", "dotenv")
+
+
+def command_lines(dataset: str, output: str) -> List[Tuple[str, List[str]]]:
+    """The offline commands to time, as (name, main.py arguments)."""
+    return [
+        ("validate", ["validate", "--dataset", dataset]),
+        ("summarize", ["summarize", "--dataset", dataset, "--output", output]),
+        ("plan", ["plan", "--dataset", dataset, "--output", output, "--verbosity", "0"]),
+        ("assign local", ["assign", "--backend", "local", "--dataset", dataset, "--output", output, "--verbosity", "0"]),
+    ]
+
+
+def run_once(arguments: List[str]) -> float:
+    """Wall time of one run of main.py in a fresh interpreter."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "main.py"] + arguments, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def run_python() -> float:
+    """Wall time of an empty interpreter start, for reference."""
+    start = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], check=True)
+    return time.perf_counter() - start
+
+
+def heavy_imports(arguments: List[str]) -> List[str]:
+    """Heavy top-level packages imported by a run (from python -X importtime)."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "main.py"] + arguments,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    imported = {line.rsplit("|", 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+    return [package for package in HEAVY_PACKAGES if package in imported]
+
+
+def main():
+    """Time every offline command and print a table."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--dataset", default="dataset.json")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--max-seconds", type=float, default=None, help="fail when a median is above this")
+    args = parser.parse_args()
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output = os.path.join(temp_dir, "output.json")
+        commands = command_lines(args.dataset, output)
+        # summarize needs an output file to read
+        run_once(commands[2][1])
+        
+        rows = []
+        for name, arguments in commands:
+            median = statistics.median(run_once(arguments) for _ in range(max(1, args.runs)))
+            rows.append((name, median, heavy_imports(arguments)))
+    
+    baseline = statistics.median(run_python() for _ in range(max(1, args.runs)))
+    print(f"{'command':<14} {'median s':>9}  heavy imports")
+    print(f"{'(interpreter)':<14} {baseline:>9.3f}")
+    for name, median, heavy in rows:
+        print(f"{name:<14} {median:>9.3f}  {', '.join(heavy) or '-'}")
+    
+    if args.max_seconds is not None:
+        slow = [name for name, median, _ in rows if median > args.max_seconds]
+        if slow:
+            print(f"Slower than {args.max_seconds}s: {', '.join(slow)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Local stand-in for the LLM backend used by the benchmarks.
+
+FakeLLM answers the prompts built by LLMAssigner without any network access,
+with configurable latency and error rates. Pass it to LLMAssigner through
+agent_factory in place of the strands agent.
+"""
+import json
+import random
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Optional
+
+AGENT_LINE = re.compile(r"^- .*?\((\S+)\): Skills: .*?Current Load: (\S+)", re.MULTILINE)
+TICKET_ID = re.compile(r"^- ID: (\S+)", re.MULTILINE)
+
+
+class FakeLLMError(RuntimeError):
+    """Raised by FakeLLM to simulate a failed request (rate limit, timeout, ...)."""
+    
+    # Looks like a server error to the request scheduler, so it is retried
+    status_code = 503
+
+
+class FakeResult:
+    """Response text plus token usage, shaped like a strands AgentResult."""
+    
+    def __init__(self, text: str, prompt: str):
+        self.text = text
+        # Rough estimate of 4 characters per token
+        self.metrics = SimpleNamespace(accumulated_usage={
+            "inputTokens": len(prompt) // 4,
+            "outputTokens": max(1, len(text) // 4)
+        })
+    
+    def __str__(self) -> str:
+        return self.text
+
+
+class FakeLLM:
+    """Callable that mimics the strands agent: takes a prompt, returns a result.
+    
+    It picks the least-loaded agent listed in the prompt (so answers stay
+    valid against the roster), sleeps latency_ms +/- jitter_ms, and raises
+    FakeLLMError with probability error_rate. invalid_rate answers with an
+    unknown agent id to exercise validation fallbacks.
+    """
+    
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 invalid_rate: float = 0.0, seed: Optional[int] = 0):
+        """Configure simulated latency and failure behaviour."""
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.invalid_rate = invalid_rate
+        self.calls = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+    
+    def __call__(self, prompt: str) -> FakeResult:
+        return FakeResult(self._answer(prompt), prompt)
+    
+    def _answer(self, prompt: str) -> str:
+        """Sleep, maybe fail, then pick agents from the prompt's roster."""
+        with self._lock:
+            self.calls += 1
+            delay = max(0.0, self.latency_ms + self._rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0
+            fail = self._rng.random() < self.error_rate
+            invalid = self._rng.random() < self.invalid_rate
+        if delay:
+            time.sleep(delay)
+        if fail:
+            raise FakeLLMError("Simulated LLM failure")
+        
+        candidates = [
+            (int(load.split("/")[0]), agent_id)
+            for agent_id, load in AGENT_LINE.findall(prompt)
+            if load[0].isdigit()
+        ]
+        candidates.sort()
+        ticket_ids = TICKET_ID.findall(prompt)
+        if "JSON object mapping" in prompt:
+            return json.dumps({
+                ticket_id: "agent_unknown" if invalid or not candidates else candidates[i % len(candidates)][1]
+                for i, ticket_id in enumerate(ticket_ids)
+            })
+        if invalid or not candidates:
+            return "agent_unknown"
+        return candidates[0][1]
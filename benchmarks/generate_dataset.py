@@ -0,0 +1,110 @@
+"""
+Synthetic dataset generator in the dataset.json agents/tickets schema.
+
+Tickets are written one at a time, so million-ticket files can be generated
+with flat memory. A .jsonl output path gets one ticket per line (agents then
+go to a separate --agents-output JSON file).
+
+Usage: python -m benchmarks.generate_dataset --agents 5000 --tickets 1000000 --output big.json
+"""
+import argparse
+import json
+import random
+from typing import Dict, List, Optional
+from src.skills import SKILL_MAPPING
+
+FIRST_NAMES = ["Alex", "Sam", "Jordan", "Taylor", "Morgan", "Casey", "Riley", "Jamie", "Avery", "Quinn"]
+LAST_NAMES = ["Chen", "Patel", "Garcia", "Kim", "Novak", "Okafor", "Silva", "Jensen", "Haddad", "Ito"]
+TITLE_TEMPLATES = [
+    "{keyword} issue affecting {scope}",
+    "Cannot access {keyword} since this morning",
+    "{keyword} failing intermittently for {scope}",
+    "Request for help with {keyword} configuration",
+    "Urgent: {keyword} outage reported by {scope}",
+]
+SCOPES = ["one user", "the finance team", "all remote users", "the London office", "a new hire", "several departments"]
+FILLER = [
+    "The user reports that the problem started after the latest update.",
+    "Restarting the device did not resolve the issue.",
+    "This is blocking daily work and needs attention.",
+    "Logs show repeated errors around the time of the failure.",
+    "The issue could not be reproduced on a second machine.",
+    "Several colleagues have reported similar symptoms.",
+]
+
+
+def generate_agent(index: int, rng: random.Random, skills: List[str]) -> Dict:
+    """Create one agent record."""
+    return {
+        "agent_id": f"agent_{index:05d}",
+        "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+        "skills": {skill: rng.randint(1, 10) for skill in rng.sample(skills, rng.randint(3, 7))},
+        "current_load": rng.randint(0, 5),
+        "availability_status": "Available" if rng.random() < 0.9 else "On Leave",
+        "experience_level": rng.randint(1, 15),
+    }
+
+
+def generate_ticket(index: int, rng: random.Random, keywords: List[str], timestamp: int) -> Dict:
+    """Create one ticket record mentioning one to three skill keywords."""
+    mentioned = rng.sample(keywords, rng.randint(1, 3))
+    title = rng.choice(TITLE_TEMPLATES).format(keyword=mentioned[0].upper() if len(mentioned[0]) <= 4 else mentioned[0].title(),
+                                               scope=rng.choice(SCOPES))
+    sentences = [f"There is a problem with {keyword}." for keyword in mentioned]
+    sentences += rng.sample(FILLER, rng.randint(2, 4))
+    rng.shuffle(sentences)
+    return {
+        "ticket_id": f"TKT-SYN-{index:07d}",
+        "title": title,
+        "description": " ".join(sentences),
+        "creation_timestamp": timestamp,
+    }
+
+
+def generate_dataset(num_agents: int, num_tickets: int, output_path: str, seed: int = 42,
+                     agents_output_path: Optional[str] = None, start_timestamp: int = 1757827200):
+    """Write a synthetic dataset with num_agents agents and num_tickets tickets."""
+    rng = random.Random(seed)
+    skills = sorted(set(SKILL_MAPPING.values()))
+    keywords = sorted(SKILL_MAPPING)
+    agents = [generate_agent(i + 1, rng, skills) for i in range(num_agents)]
+    
+    def tickets():
+        timestamp = start_timestamp
+        for i in range(num_tickets):
+            timestamp += rng.randint(0, 600)
+            yield generate_ticket(i + 1, rng, keywords, timestamp)
+    
+    if output_path.endswith(".jsonl"):
+        with open(agents_output_path or "agents.json", "w", encoding="utf-8") as file:
+            json.dump({"agents": agents, "tickets": []}, file)
+        with open(output_path, "w", encoding="utf-8") as file:
+            for ticket in tickets():
+                file.write(json.dumps(ticket) + "\n")
+        return
+    
+    with open(output_path, "w", encoding="utf-8") as file:
+        file.write('{"agents": ')
+        json.dump(agents, file)
+        file.write(', "tickets": [')
+        for i, ticket in enumerate(tickets()):
+            file.write((",\n" if i else "\n") + json.dumps(ticket))
+        file.write("\n]}\n")
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Generate a synthetic ticket assignment dataset")
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--tickets", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", default="synthetic_dataset.json", help=".json (full dataset) or .jsonl (tickets only)")
+    parser.add_argument("--agents-output", default=None, help="agents file when --output is .jsonl")
+    args = parser.parse_args()
+    
+    generate_dataset(args.agents, args.tickets, args.output, args.seed, args.agents_output)
+    print(f"Wrote {args.agents} agents and {args.tickets} tickets to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,284 @@
+"""
+Benchmark harness for the ticket assignment pipeline.
+
+Generates a synthetic dataset (or uses --dataset), then runs each scenario in
+a fresh process and reports tickets/sec, p50/p99 per-ticket latency and peak
+RSS. LLM scenarios use FakeLLM, so no API key or network is needed.
+
+Usage:
+    python -m benchmarks.run --agents 500 --tickets 20000
+    python -m benchmarks.run --scenarios assign_local,save --report bench.json
+    python -m benchmarks.run --baseline bench.json --max-regression 0.2
+"""
+import argparse
+import contextlib
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+from queue import Empty
+from typing import Callable, Dict, List, Optional
+from benchmarks.fake_llm import FakeLLM
+from benchmarks.generate_dataset import generate_dataset
+
+SCENARIOS = ["load", "load_stream", "assign_llm", "assign_hybrid", "assign_local",
+             "assign_optimal", "assign_sharded", "fallback", "retry", "serve_local", "save"]
+
+
+def _percentile(values: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of values (None if empty)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _time_per_ticket(processor, latencies: List[float]):
+    """Record per-ticket latency of every assignment request made by the processor."""
+    request = processor._request_assignments
+    
+    def timed_request(batch, total_tickets):
+        start = time.perf_counter()
+        results = request(batch, total_tickets)
+        per_ticket = (time.perf_counter() - start) / len(batch)
+        latencies.extend([per_ticket] * len(batch))
+        return results
+    
+    processor._request_assignments = timed_request
+
+
+def _make_processor(dataset_path: str, backend: str, options: Dict):
+    """Create a TicketProcessor whose LLM is a FakeLLM."""
+    from src.llm_assigner import LLMAssigner
+    from src.scheduler import RequestScheduler
+    from src.ticket_processor import LLM_BACKENDS, TicketProcessor
+    
+    llm_assigner = None
+    if backend in LLM_BACKENDS:
+        fake = FakeLLM(latency_ms=options["latency_ms"], jitter_ms=options["jitter_ms"],
+                       error_rate=options["error_rate"], invalid_rate=options["invalid_rate"])
+        # Millisecond backoff keeps the retry scenario about the scheduling overhead
+        scheduler = RequestScheduler(base_delay=0.001, max_delay=0.01) if options.get("retries") else None
+        llm_assigner = LLMAssigner("fake-key", agent_factory=lambda: fake, scheduler=scheduler)
+    return TicketProcessor(dataset_path, backend=backend, llm_assigner=llm_assigner)
+
+
+def _run_scenario(name: str, dataset_path: str, options: Dict) -> Dict:
+    """Run one scenario and return its measurements (called in a child process)."""
+    from src.data_loader import DataLoader
+    
+    latencies: List[float] = []
+    work: Callable[[], int]
+    
+    if name == "load":
+        work = lambda: len(DataLoader(dataset_path).load_data()[1])
+    elif name == "load_stream":
+        work = lambda: DataLoader(dataset_path).count_tickets()
+    elif name == "save":
+        processor = _make_processor(dataset_path, "local", options)
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            processor.initialize()
+            processor.process_all_tickets()
+        output_dir = tempfile.mkdtemp()
+        
+        def work():
+            with contextlib.redirect_stdout(open(os.devnull, "w")):
+                processor.save_assignments(os.path.join(output_dir, "out.json"))
+                processor.save_assignments(os.path.join(output_dir, "out.jsonl"))
+            return 2 * len(processor.assignments)
+    elif name == "serve_local":
+        from src.data_loader import iter_json_array
+        from src.service import TicketQueue
+        
+        processor = _make_processor(dataset_path, "local", options)
+        # Latency from arrival in the queue to the written assignment
+        processor.metrics.add_hook(
+            lambda kind, metric, value, labels: latencies.append(value) if metric == "ticket_latency_seconds" else None
+        )
+        output_dir = tempfile.mkdtemp()
+        
+        def work():
+            ticket_queue = TicketQueue(processor.metrics)
+            ticket_queue.feed(iter_json_array(dataset_path, "tickets"))
+            return processor.serve(ticket_queue, os.path.join(output_dir, "service.jsonl"))
+    elif name == "assign_sharded":
+        processor = _make_processor(dataset_path, "local", options)
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            processor.initialize()
+        
+        def work():
+            return len(processor.process_sharded(options["workers"]))
+    else:
+        backend = {"assign_llm": "llm", "assign_hybrid": "hybrid", "assign_local": "local",
+                   "assign_optimal": "optimal", "fallback": "llm", "retry": "llm"}[name]
+        if name == "fallback":
+            options = dict(options, error_rate=1.0, latency_ms=0.0, jitter_ms=0.0)
+        elif name == "retry":
+            # Transient failures on a fifth of the requests, retried by the scheduler
+            options = dict(options, error_rate=max(options["error_rate"], 0.2), retries=True)
+        processor = _make_processor(dataset_path, backend, options)
+        with contextlib.redirect_stdout(open(os.devnull, "w")):
+            processor.initialize()
+        _time_per_ticket(processor, latencies)
+        
+        def work():
+            processor.process_all_tickets(max_in_flight=options["in_flight"], batch_size=options["batch_size"])
+            return len(processor.assignments)
+    
+    with contextlib.redirect_stdout(open(os.devnull, "w")):
+        start = time.perf_counter()
+        tickets = work()
+        elapsed = time.perf_counter() - start
+    
+    p50 = _percentile(latencies, 0.50)
+    p99 = _percentile(latencies, 0.99)
+    return {
+        "scenario": name,
+        "tickets": tickets,
+        "seconds": round(elapsed, 4),
+        "tickets_per_sec": round(tickets / elapsed, 1) if elapsed > 0 else None,
+        "p50_ms": round(p50 * 1000, 3) if p50 is not None else None,
+        "p99_ms": round(p99 * 1000, 3) if p99 is not None else None,
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def _child(name: str, dataset_path: str, options: Dict, queue):
+    """Child process entry point: run a scenario and send back the result."""
+    try:
+        queue.put(_run_scenario(name, dataset_path, options))
+    except Exception as e:
+        queue.put({"scenario": name, "error": f"{type(e).__name__}: {e}"})
+
+
+def _wait_for_result(name: str, process, queue, timeout: float) -> Dict:
+    """Wait for a scenario's result, reporting a crashed or hung child instead of blocking forever."""
+    deadline = time.monotonic() + timeout if timeout > 0 else None
+    while True:
+        try:
+            return queue.get(timeout=1.0)
+        except Empty:
+            pass
+        if not process.is_alive():
+            try:
+                # The result may have been sent just before the process exited
+                return queue.get(timeout=1.0)
+            except Empty:
+                return {"scenario": name, "error": f"process exited with code {process.exitcode} without a result"}
+        if deadline is not None and time.monotonic() >= deadline:
+            process.terminate()
+            return {"scenario": name, "error": f"no result after {timeout:g} s, process terminated"}
+
+
+def run_scenarios(names: List[str], dataset_path: str, options: Dict, timeout: float = 0.0) -> List[Dict]:
+    """Run each scenario in a fresh process so peak RSS is measured per scenario.
+    
+    A scenario whose process dies, or that takes longer than timeout seconds
+    (0 = no limit), is reported as an error and the next one runs.
+    """
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for name in names:
+        queue = context.Queue()
+        process = context.Process(target=_child, args=(name, dataset_path, options, queue))
+        process.start()
+        results.append(_wait_for_result(name, process, queue, timeout))
+        process.join()
+    return results
+
+
+def print_report(results: List[Dict]):
+    """Print the results as a table."""
+    print(f"{'scenario':<16}{'tickets':>10}{'seconds':>10}{'tickets/s':>12}{'p50 ms':>10}{'p99 ms':>10}{'peak MB':>10}")
+    for result in results:
+        if "error" in result:
+            print(f"{result['scenario']:<16} ERROR {result['error']}")
+            continue
+        cells = [result["tickets"], result["seconds"], result["tickets_per_sec"],
+                 result["p50_ms"], result["p99_ms"], result["peak_rss_mb"]]
+        widths = [10, 10, 12, 10, 10, 10]
+        print(f"{result['scenario']:<16}" + "".join(
+            f"{'-' if cell is None else cell:>{width}}" for cell, width in zip(cells, widths)
+        ))
+
+
+def find_regressions(results: List[Dict], baseline: List[Dict], max_regression: float) -> List[str]:
+    """Compare throughput with a previous report; returns human-readable regressions."""
+    previous = {result["scenario"]: result for result in baseline if "error" not in result}
+    regressions = []
+    for result in results:
+        before = previous.get(result["scenario"])
+        if "error" in result or not before or not before.get("tickets_per_sec"):
+            continue
+        change = result["tickets_per_sec"] / before["tickets_per_sec"] - 1
+        if change < -max_regression:
+            regressions.append(f"{result['scenario']}: {before['tickets_per_sec']} -> "
+                               f"{result['tickets_per_sec']} tickets/s ({change:+.0%})")
+    return regressions
+
+
+def main():
+    """Command line entry point."""
+    parser = argparse.ArgumentParser(description="Benchmark the ticket assignment pipeline")
+    parser.add_argument("--dataset", default=None, help="existing dataset (default: generate one)")
+    parser.add_argument("--agents", type=int, default=100)
+    parser.add_argument("--tickets", type=int, default=5000)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="fake LLM latency")
+    parser.add_argument("--jitter-ms", type=float, default=2.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--invalid-rate", type=float, default=0.0)
+    parser.add_argument("--in-flight", type=int, default=1)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes for assign_sharded")
+    parser.add_argument("--report", default=None, help="write results as JSON")
+    parser.add_argument("--baseline", default=None, help="previous JSON report to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2, help="allowed tickets/s drop vs baseline")
+    parser.add_argument("--timeout", type=float, default=600.0, help="seconds allowed per scenario (0: no limit)")
+    args = parser.parse_args()
+    
+    names = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(names) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+    
+    options = {
+        "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "error_rate": args.error_rate,
+        "invalid_rate": args.invalid_rate, "in_flight": args.in_flight, "batch_size": args.batch_size,
+        "workers": args.workers,
+    }
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dataset_path = args.dataset
+        if dataset_path is None:
+            dataset_path = os.path.join(temp_dir, "dataset.json")
+            generate_dataset(args.agents, args.tickets, dataset_path)
+            print(f"Generated {args.agents} agents and {args.tickets} tickets")
+        results = run_scenarios(names, dataset_path, options, args.timeout)
+    
+    print_report(results)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+    
+    failed = [result["scenario"] for result in results if "error" in result]
+    if failed:
+        print(f"Failed scenarios: {', '.join(failed)}")
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            regressions = find_regressions(results, json.load(file), args.max_regression)
+        if regressions:
+            print("Regressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,75 @@
 """
 Configuration settings for the ticket assignment system.
 """
-import os
-import dotenv
 
 
-dotenv.load_dotenv()
-# OpenAI Configuration
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# OpenAI Configuration (main.py loads .env and reads OPENAI_API_KEY only for LLM backends)
 OPENAI_MODEL = "gpt-4o"
 OPENAI_MAX_TOKENS = 1000
 OPENAI_TEMPERATURE = 0.3
+SHORTLIST_K = 0  # Agents listed per LLM prompt, best skill match first (0 = whole roster)
 
 # File paths
 DATASET_PATH = "dataset.json"
 OUTPUT_PATH = "output_result.json"
 
 # Processing settings
-BATCH_SIZE = 1  # Process one ticket at a time for better LLM context
-MAX_RETRIES = 3  # Maximum retries for failed assignments
+BATCH_SIZE = 1  # Tickets per LLM prompt (1 = one ticket at a time for better LLM context)
+MAX_RETRIES = 3  # Retries per LLM request for transient errors (rate limits, timeouts, 5xx)
+MAX_IN_FLIGHT = 1  # Concurrent LLM requests (1 = sequential; higher values multiply the request rate)
+WORKERS = 1  # Worker processes sharing the ticket list (1 = single process)
+DEDUP_THRESHOLD = 0.0  # LLM backends: similarity above which near-duplicate tickets reuse one decision (0 = off)
+LAZY_DESCRIPTIONS = False  # Keep ticket descriptions on disk and read them on access (saves memory)
 
+
+# LLM request scheduling (0 = no limit); set to the provider's limits for the model
+LLM_REQUESTS_PER_MINUTE = 0
+LLM_TOKENS_PER_MINUTE = 0
+RETRY_BASE_DELAY_SECONDS = 1.0  # Backoff before the first retry, doubled per retry (with jitter)
+RETRY_MAX_DELAY_SECONDS = 30.0
+CIRCUIT_FAILURE_THRESHOLD = 5  # Consecutive failed requests before switching to local scoring
+CIRCUIT_COOLDOWN_SECONDS = 30.0  # Time on local scoring before trying the LLM again
+
+
+# Assignment backend: "llm", "local" (no network) or "hybrid" (local pre-filter + LLM)
+ASSIGNMENT_BACKEND = "llm"
+
+# Local scoring weights (see src/local_scorer.py)
+LOCAL_SKILL_WEIGHT = 1.0
+LOCAL_LOAD_WEIGHT = 0.5
+LOCAL_EXPERIENCE_WEIGHT = 0.2
+LOCAL_CONFIDENCE_MARGIN = 0.1  # Hybrid mode: score gap below which tickets go to the LLM
+
+# LLM response cache (reruns over the same data skip the network)
+LLM_CACHE_ENABLED = True
+LLM_CACHE_PATH = ".llm_cache.sqlite3"
+LLM_CACHE_TTL_SECONDS = 7 * 24 * 3600  # Entries older than this are evicted
+LLM_CACHE_MAX_ENTRIES = 100_000  # Least recently used entries beyond this are evicted
+
+# Optional JSON file of extra keyword -> skill entries for skill extraction
+SKILL_KEYWORDS_PATH = ""
+
+# Output and instrumentation
+VERBOSITY = 2  # 0 = errors only, 1 = run-level messages, 2 = per-ticket progress
+METRICS_REPORT_PATH = ""  # Run report with stage timings and token counts (.json, or .prom for Prometheus text)
+
+# Checkpoint journal for LLM runs (python main.py --resume continues an interrupted run)
+JOURNAL_ENABLED = True
+JOURNAL_PATH = ".assignment_journal.jsonl"
+JOURNAL_FSYNC_EVERY = 50  # Records between fsyncs (also synced at least once per second)
+
+
+# Long-running service (python main.py serve)
+SERVICE_OUTPUT_PATH = "service_assignments.jsonl"
+SERVICE_BATCH_SIZE = 16  # Most tickets assigned together per micro-batch
+SERVICE_BATCH_WAIT_MS = 50  # Longest wait for a micro-batch to fill
+SERVICE_WINDOW = 100  # Fewest open tickets the 11% cap is computed from
+SERVICE_TICKET_TTL_SECONDS = 0  # Release tickets open this long without a close event (0 = never)
+SERVICE_HTTP_PORT = 0  # Also accept tickets over HTTP on this localhost port (0 = off)
+
+
+# Offline policy simulation (python main.py simulate)
+SIM_HANDLING_MINUTES = 30.0  # Handling time of a ticket without matching skills
+SIM_SKILL_SPEEDUP = 0.5  # Share of the handling time saved at a full skill match
+SIM_HANDLING_SIGMA = 0.5  # Spread of the lognormal noise on handling times
+SIM_WORKERS = 0  # Worker processes for parameter sweeps (0 = one per CPU)
@@ -1,72 +1,568 @@
 """
 Main entry point for the PyCon25 Hackathon: Intelligent Support Ticket Assignment System.
+
+Subcommands:
+    validate   check the dataset (and ticket file) schema, offline
+    plan       assign all tickets with the offline global capacity plan
+    assign     assign tickets with any backend (the default command)
+    summarize  print the workload summary of an existing output file
+    serve      run as a service assigning tickets from a JSONL queue as they arrive
+    simulate   replay tickets in timestamp order to compare assignment policies, offline
+    analyze    report workload fairness, skill match and cap violations over past outputs
+
+The assignment and LLM stacks are imported only by the commands that use
+them, so validate, summarize and the offline backends start quickly and
+need no credentials.
 """
+import argparse
+import contextlib
 import os
 import sys
-from dotenv import load_dotenv
-from src.ticket_processor import TicketProcessor
+from typing import List, Optional, TextIO
+import config
+from src.backends import BACKENDS, LLM_BACKENDS
 
 
-def main():
-    """Main function to run the ticket assignment system."""
+COMMANDS = ("validate", "plan", "assign", "summarize", "serve", "simulate", "analyze")
+
+
+def float_list(text: str) -> List[float]:
+    """Parse a comma-separated list of numbers (one sweep dimension)."""
+    try:
+        return [float(value) for value in text.split(",") if value.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected comma-separated numbers, got '{text}'")
+
+
+def timestamp(text: str) -> int:
+    """Parse a Unix timestamp or an ISO 8601 date/time (UTC unless it has an offset)."""
+    from datetime import datetime, timezone
+    if text.lstrip("-").isdigit():
+        return int(text)
+    try:
+        moment = datetime.fromisoformat(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a Unix timestamp or ISO date, got '{text}'")
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp())
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Command line parser with one subparser per command."""
+    parser = argparse.ArgumentParser(description="Intelligent Support Ticket Assignment System")
+    commands = parser.add_subparsers(dest="command", metavar="{" + ",".join(COMMANDS) + "}")
+    
+    validate = commands.add_parser("validate", help="check the dataset schema (offline)")
+    plan = commands.add_parser("plan", help="assign with the offline global capacity plan")
+    assign = commands.add_parser("assign", help="assign tickets (default command)")
+    summarize = commands.add_parser("summarize", help="print the workload summary of an output file (offline)")
+    serve = commands.add_parser("serve", help="assign tickets from a JSONL queue (stdin, file or HTTP) as they arrive")
+    simulate = commands.add_parser("simulate", help="replay tickets over time to compare assignment policies (offline)")
+    analyze = commands.add_parser("analyze", help="fairness and cap report over the outputs of past runs (offline)")
+    
+    for command in (validate, summarize, plan, assign, serve, simulate, analyze):
+        command.add_argument("--dataset", default=config.DATASET_PATH, help="dataset with agents (and tickets)")
+    for command in (validate, plan, assign, simulate, analyze):
+        command.add_argument("--tickets", default=None,
+                             help="separate JSON or JSONL ticket file (agents still come from the dataset)")
+    for command in (summarize, plan, assign):
+        command.add_argument("--output", default=config.OUTPUT_PATH,
+                             help="assignment file; a .jsonl path has one assignment per line")
+    for command in (plan, assign, serve):
+        command.add_argument("--verbosity", type=int, choices=(0, 1, 2), default=config.VERBOSITY,
+                             help="0: errors only, 1: run-level messages, 2: per-ticket progress")
+        command.add_argument("--metrics-report", default=config.METRICS_REPORT_PATH or None,
+                             help="write stage timings and counters to this file (.json, or .prom for Prometheus text)")
+    for command in (plan, assign):
+        command.add_argument("--lazy-descriptions", action="store_true", default=config.LAZY_DESCRIPTIONS,
+                             help="keep ticket descriptions on disk and read them back when needed (less memory)")
+    
+    assign.add_argument("--backend", choices=BACKENDS, default=config.ASSIGNMENT_BACKEND,
+                        help="llm: ask the LLM for every ticket; local: offline vectorized scoring; "
+                             "hybrid: local scoring with the LLM for low-confidence tickets; "
+                             "optimal: offline global plan under the 11%% cap")
+    serve.add_argument("--backend", choices=[backend for backend in BACKENDS if backend != "optimal"],
+                       default=config.ASSIGNMENT_BACKEND, help="how each arriving ticket is assigned (see assign)")
+    assign.add_argument("--stream", action="store_true",
+                        help="read tickets lazily and write each assignment as it is made (flat memory)")
+    assign.add_argument("--journal", default=config.JOURNAL_PATH,
+                        help="checkpoint journal of committed assignments (LLM backends)")
+    assign.add_argument("--resume", action="store_true",
+                        help="replay the journal of an interrupted run and assign only the remaining tickets")
+    assign.add_argument("--workers", type=int, default=config.WORKERS,
+                        help="worker processes sharing the ticket list (agent loads are kept in shared memory)")
+    for command in (assign, serve):
+        command.add_argument("--shortlist-k", type=int, default=config.SHORTLIST_K,
+                             help="list only the k best-matching available agents in each LLM prompt (0: whole roster)")
+        command.add_argument("--dedup-threshold", type=float, default=config.DEDUP_THRESHOLD,
+                             help="LLM backends: reuse one decision for tickets at least this similar (0-1, 0: off)")
+    plan.set_defaults(backend="optimal", stream=False, journal=config.JOURNAL_PATH, resume=False,
+                      workers=1, shortlist_k=0, dedup_threshold=0.0)
+    
+    serve.add_argument("--input", default=None,
+                       help="JSONL file of tickets and close events ('-': stdin, the default without --http-port)")
+    serve.add_argument("--follow", action="store_true", help="keep reading --input as lines are appended (like tail -f)")
+    serve.add_argument("--from-end", action="store_true", help="with --follow, skip the lines already in the file")
+    serve.add_argument("--http-port", type=int, default=config.SERVICE_HTTP_PORT,
+                       help="also accept tickets with POST /tickets on this localhost port (0: off)")
+    serve.add_argument("--output", default=config.SERVICE_OUTPUT_PATH,
+                       help="JSONL stream of assignments ('-': stdout)")
+    serve.add_argument("--batch-size", type=int, default=config.SERVICE_BATCH_SIZE,
+                       help="most tickets assigned together in one micro-batch")
+    serve.add_argument("--batch-wait-ms", type=float, default=config.SERVICE_BATCH_WAIT_MS,
+                       help="longest wait for a micro-batch to fill")
+    serve.add_argument("--window", type=int, default=config.SERVICE_WINDOW,
+                       help="fewest open tickets the 11%% cap is computed from")
+    serve.add_argument("--ticket-ttl", type=float, default=config.SERVICE_TICKET_TTL_SECONDS,
+                       help="release an agent's load for a ticket open this long (seconds) without a close event (0: never)")
+    serve.add_argument("--exit-when-idle", type=float, default=None,
+                       help="stop after this many seconds without new records")
+    # The service writes each assignment to its output stream as it is made, so it keeps no journal
+    serve.set_defaults(tickets=None, stream=False, journal=None, resume=False, workers=1, lazy_descriptions=False)
+    
+    simulate.add_argument("--cap", type=float_list, default=[0.11],
+                          help="share of the open tickets one agent may hold; comma-separated values are swept")
+    simulate.add_argument("--skill-weight", type=float_list, default=[config.LOCAL_SKILL_WEIGHT])
+    simulate.add_argument("--load-weight", type=float_list, default=[config.LOCAL_LOAD_WEIGHT])
+    simulate.add_argument("--experience-weight", type=float_list, default=[config.LOCAL_EXPERIENCE_WEIGHT])
+    simulate.add_argument("--window", type=int, default=config.SERVICE_WINDOW,
+                          help="fewest open tickets the cap is computed from")
+    simulate.add_argument("--handling-minutes", type=float, default=config.SIM_HANDLING_MINUTES,
+                          help="handling time of a ticket by an agent without matching skills")
+    simulate.add_argument("--skill-speedup", type=float, default=config.SIM_SKILL_SPEEDUP,
+                          help="share of the handling time saved at a full skill match")
+    simulate.add_argument("--handling-sigma", type=float, default=config.SIM_HANDLING_SIGMA,
+                          help="spread of the lognormal noise on handling times (0: none)")
+    simulate.add_argument("--seed", type=int, default=1)
+    simulate.add_argument("--workers", type=int, default=config.SIM_WORKERS,
+                          help="worker processes for parameter sweeps (0: one per CPU)")
+    simulate.add_argument("--report", default=None, help="write every run's results to this JSON file")
+    
+    analyze.add_argument("outputs", nargs="*", default=[config.OUTPUT_PATH],
+                         help="assignment files of the runs to analyze (JSON or JSONL; one run each)")
+    analyze.add_argument("--since", type=timestamp, default=None,
+                         help="only tickets created at or after this time (Unix timestamp or ISO date)")
+    analyze.add_argument("--until", type=timestamp, default=None,
+                         help="only tickets created before this time (Unix timestamp or ISO date)")
+    analyze.add_argument("--report", default=None, help="write the full report, per run and agent, to this JSON file")
+    
+    summarize.add_argument("--total-tickets", type=int, default=None,
+                           help="tickets the 11%% cap is computed from (default: number of assignments)")
+    return parser
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse the command line; without a command, the arguments are those of assign."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if not argv or argv[0] not in COMMANDS + ("-h", "--help"):
+        argv = ["assign"] + argv
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command == "assign":
+        if args.resume and args.stream:
+            parser.error("--resume cannot be combined with --stream")
+        if args.workers > 1 and (args.stream or args.resume):
+            parser.error("--workers cannot be combined with --stream or --resume")
+        if args.workers > 1 and args.dedup_threshold > 0:
+            parser.error("--dedup-threshold cannot be combined with --workers")
+    return args
+
+
+def validate(args: argparse.Namespace) -> int:
+    """Check the dataset schema; returns the exit status."""
+    from src.validation import validate_dataset
+    
+    counts, problems = validate_dataset(args.dataset, args.tickets)
+    print(f"Checked {counts['agents']} agents and {counts['tickets']} tickets")
+    if not problems:
+        print("Dataset is valid")
+        return 0
+    print(f"Found {len(problems)} problems:")
+    for problem in problems[:50]:
+        print(f"  - {problem}")
+    if len(problems) > 50:
+        print(f"  ... and {len(problems) - 50} more")
+    return 1
+
+
+def summarize(args: argparse.Namespace) -> int:
+    """Print the workload summary of an existing output file; returns the exit status."""
+    from src.output_writer import read_assignments
+    from src.summary import count_assignments, workload_summary
     
+    counts = count_assignments(read_assignments(args.output))
+    total_tickets = args.total_tickets or sum(counts.values())
+    if not total_tickets:
+        print(f"Error: No assignments in '{args.output}'")
+        return 1
+    print_summary(workload_summary(counts, total_tickets))
+    print("="*60)
+    return 0
+
+
+def print_summary(summary: dict, metrics=None):
+    """Print an assignment summary (and LLM counters, if metrics are given)."""
+    print("\n" + "="*60)
+    print("ASSIGNMENT SUMMARY")
+    print("="*60)
+    print(f"Total tickets processed: {summary['total_tickets']}")
+    print(f"Total assignments created: {summary['total_assignments']}")
+    print(f"Number of agents used: {summary['agents_used']}")
+    print(f"Max workload per agent: {summary['max_workload_per_agent']} tickets (11% threshold)")
+    if "llm_cache" in summary:
+        cache_stats = summary["llm_cache"]
+        print(f"LLM cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} entries")
+    if "duplicate_clusters" in summary:
+        clusters = summary["duplicate_clusters"]
+        print(f"Near-duplicate clusters: {clusters['clusters']} covering {clusters['clustered_tickets']} tickets, "
+              f"{clusters['decisions_reused']} decisions reused")
+        for cluster in clusters["largest"]:
+            print(f"  {cluster['tickets']} x {cluster['representative']}: {cluster['title']}")
+    if "decisions" in summary:
+        print(f"Decided locally: {summary['decisions']['local']}, by LLM: {summary['decisions']['llm']}")
+    if metrics is not None and metrics.counter("llm_requests"):
+        print(f"LLM requests: {int(metrics.counter('llm_requests'))}, tokens in/out: "
+              f"{int(metrics.counter('llm_tokens_in'))}/{int(metrics.counter('llm_tokens_out'))}")
+    if metrics is not None and (metrics.counter("llm_retries") or metrics.counter("circuit_opened")):
+        print(f"LLM retries: {int(metrics.counter('llm_retries'))}, circuit opened: "
+              f"{int(metrics.counter('circuit_opened'))} times, tickets scored locally meanwhile: "
+              f"{int(metrics.counter('circuit_local_decisions'))}")
+    if metrics is not None and metrics.counter("shortlist_prompts"):
+        print(f"Shortlisted prompts: {int(metrics.counter('shortlist_prompts'))}, agents omitted: "
+              f"{int(metrics.counter('shortlist_agents_omitted'))}, "
+              f"~{int(metrics.counter('shortlist_prompt_chars_saved')) // 4} prompt tokens saved")
+    
+    print("\nWorkload Distribution:")
+    for agent_id, workload_info in summary['workload_distribution'].items():
+        status_icon = "⚠️" if workload_info['status'] == "OVER_LIMIT" else "✅"
+        print(f"  {status_icon} {agent_id}: {workload_info['tickets']} tickets ({workload_info['percentage']}%) - {workload_info['status']}")
+
+
+def load_api_key() -> Optional[str]:
+    """Read the OpenAI API key (also from .env); prints how to set it when missing."""
     # Load environment variables from .env file
+    from dotenv import load_dotenv
     load_dotenv()
     
-    # Configuration
-    dataset_path = "dataset.json"
-    output_path = "output_result.json"
-    
     # Get API key from environment variable
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         print("Error: OPENAI_API_KEY environment variable not set")
         print("Please set your OpenAI API key in the .env file or as an environment variable")
         print("Example: export OPENAI_API_KEY='your-api-key-here'")
-        sys.exit(1)
+    return api_key
+
+
+def configure_skills():
+    """Extend the skill keywords from config.SKILL_KEYWORDS_PATH, if set, for every command."""
+    if config.SKILL_KEYWORDS_PATH:
+        from src.skills import configure_skill_mapping, load_skill_mapping
+        configure_skill_mapping(load_skill_mapping(config.SKILL_KEYWORDS_PATH))
+
+
+def scheduler_params(workers: int = 1) -> dict:
+    """LLM request scheduler settings from config (rate limits are shared between workers)."""
+    return {
+        "requests_per_minute": config.LLM_REQUESTS_PER_MINUTE / workers,
+        "tokens_per_minute": config.LLM_TOKENS_PER_MINUTE / workers,
+        "max_retries": config.MAX_RETRIES,
+        "base_delay": config.RETRY_BASE_DELAY_SECONDS,
+        "max_delay": config.RETRY_MAX_DELAY_SECONDS,
+        "failure_threshold": config.CIRCUIT_FAILURE_THRESHOLD,
+        "cooldown_seconds": config.CIRCUIT_COOLDOWN_SECONDS
+    }
+
+
+def build_processor(args: argparse.Namespace, api_key: Optional[str], metrics):
+    """Create the TicketProcessor for the selected backend, with the LLM stack if it needs one."""
+    from src.journal import AssignmentJournal
+    from src.local_scorer import LocalScorer
+    from src.ticket_processor import TicketProcessor
+    
+    local_scorer = LocalScorer(
+        skill_weight=config.LOCAL_SKILL_WEIGHT,
+        load_weight=config.LOCAL_LOAD_WEIGHT,
+        experience_weight=config.LOCAL_EXPERIENCE_WEIGHT,
+        confidence_margin=config.LOCAL_CONFIDENCE_MARGIN
+    )
+    llm_assigner = None
+    if args.backend in LLM_BACKENDS:
+        from src.llm_assigner import LLMAssigner
+        from src.llm_cache import ResponseCache
+        from src.scheduler import RequestScheduler
+        
+        cache = None
+        if config.LLM_CACHE_ENABLED:
+            cache = ResponseCache(
+                config.LLM_CACHE_PATH,
+                ttl_seconds=config.LLM_CACHE_TTL_SECONDS,
+                max_entries=config.LLM_CACHE_MAX_ENTRIES
+            )
+        llm_assigner = LLMAssigner(
+            api_key,
+            model_id=config.OPENAI_MODEL,
+            max_tokens=config.OPENAI_MAX_TOKENS,
+            temperature=config.OPENAI_TEMPERATURE,
+            cache=cache,
+            metrics=metrics,
+            shortlist_k=args.shortlist_k,
+            scheduler=RequestScheduler(metrics=metrics, **scheduler_params(max(1, args.workers)))
+        )
+    journal = None
+    if args.resume or (config.JOURNAL_ENABLED and args.journal and args.backend in LLM_BACKENDS
+                       and not args.stream and args.workers <= 1):
+        journal = AssignmentJournal(args.journal, fsync_every=config.JOURNAL_FSYNC_EVERY)
+    return TicketProcessor(args.dataset, api_key, backend=args.backend,
+                           local_scorer=local_scorer, llm_assigner=llm_assigner,
+                           tickets_path=args.tickets, metrics=metrics,
+                           verbosity=args.verbosity, journal=journal, resume=args.resume,
+                           lazy_descriptions=args.lazy_descriptions,
+                           dedup_threshold=args.dedup_threshold)
+
+
+def assign(args: argparse.Namespace) -> int:
+    """Assign tickets with the selected backend (plan: the optimal backend); returns the exit status."""
+    dataset_path = args.dataset
+    output_path = args.output
+    
+    api_key = None
+    if args.backend in LLM_BACKENDS:
+        api_key = load_api_key()
+        if not api_key:
+            return 1
     
     # Check if dataset exists
     if not os.path.exists(dataset_path):
         print(f"Error: Dataset file '{dataset_path}' not found")
-        sys.exit(1)
+        return 1
     
-    try:
-        # Initialize the ticket processor
-        processor = TicketProcessor(dataset_path, api_key)
-        
+    from src.metrics import Metrics
+    
+    # Initialize the ticket processor
+    metrics = Metrics()
+    processor = build_processor(args, api_key, metrics)
+    
+    if args.stream:
+        # Assign and save tickets one batch at a time
+        print("Streaming tickets and writing assignments...")
+        processor.process_stream(output_path, batch_size=config.BATCH_SIZE)
+    else:
         # Load data
         print("Loading dataset...")
         processor.initialize()
         
         # Process all tickets
         print("Processing tickets and generating assignments...")
-        assignments = processor.process_all_tickets()
+        if args.workers > 1:
+            from src.sharding import AssignerFactory
+            
+            # Each worker process builds its own assigner from these parameters
+            factory = AssignerFactory(
+                args.backend,
+                processor.local_scorer,
+                llm_params={
+                    "api_key": api_key,
+                    "model_id": config.OPENAI_MODEL,
+                    "max_tokens": config.OPENAI_MAX_TOKENS,
+                    "temperature": config.OPENAI_TEMPERATURE,
+                    "shortlist_k": args.shortlist_k
+                },
+                cache_params={
+                    "path": config.LLM_CACHE_PATH,
+                    "ttl_seconds": config.LLM_CACHE_TTL_SECONDS,
+                    "max_entries": config.LLM_CACHE_MAX_ENTRIES
+                } if config.LLM_CACHE_ENABLED else None,
+                scheduler_params=scheduler_params(args.workers)
+            )
+            processor.process_sharded(args.workers, factory)
+        else:
+            processor.process_all_tickets(
+                max_in_flight=config.MAX_IN_FLIGHT,
+                batch_size=config.BATCH_SIZE
+            )
         
         # Save results
         print("Saving assignments...")
         processor.save_assignments(output_path)
-        
-        # Display summary
-        summary = processor.get_assignment_summary()
-        print("\n" + "="*60)
-        print("ASSIGNMENT SUMMARY")
-        print("="*60)
-        print(f"Total tickets processed: {summary['total_tickets']}")
-        print(f"Total assignments created: {summary['total_assignments']}")
-        print(f"Number of agents used: {summary['agents_used']}")
-        print(f"Max workload per agent: {summary['max_workload_per_agent']} tickets (11% threshold)")
-        
-        print("\nWorkload Distribution:")
-        for agent_id, workload_info in summary['workload_distribution'].items():
-            status_icon = "⚠️" if workload_info['status'] == "OVER_LIMIT" else "✅"
-            print(f"  {status_icon} {agent_id}: {workload_info['tickets']} tickets ({workload_info['percentage']}%) - {workload_info['status']}")
-        
-        print(f"\nResults saved to: {output_path}")
-        print("="*60)
-        
+    
+    # Display summary
+    print_summary(processor.get_assignment_summary(), metrics)
+    print(f"\nResults saved to: {output_path}")
+    print("="*60)
+    
+    if args.metrics_report:
+        metrics.write_report(args.metrics_report)
+        print(f"Metrics report saved to: {args.metrics_report}")
+    return 0
+
+
+def serve(args: argparse.Namespace) -> int:
+    """Run the long-running assignment service until its input ends or it is interrupted."""
+    stdout = sys.stdout
+    if args.output != "-":
+        return run_service(args, stdout)
+    # Assignments stream to stdout: every other message goes to stderr so the JSONL stays parseable
+    with contextlib.redirect_stdout(sys.stderr):
+        return run_service(args, stdout)
+
+
+def run_service(args: argparse.Namespace, stdout: TextIO) -> int:
+    """Serve tickets as configured by args, writing a "-" output to stdout; returns the exit status."""
+    api_key = None
+    if args.backend in LLM_BACKENDS:
+        api_key = load_api_key()
+        if not api_key:
+            return 1
+    if not os.path.exists(args.dataset):
+        print(f"Error: Dataset file '{args.dataset}' not found")
+        return 1
+    
+    from src.metrics import Metrics
+    from src.service import TicketQueue, follow_jsonl, read_stdin, serve_http
+    
+    metrics = Metrics()
+    processor = build_processor(args, api_key, metrics)
+    ticket_queue = TicketQueue(metrics)
+    server = None
+    if args.http_port:
+        def status() -> dict:
+            latency = metrics.histogram("ticket_latency_seconds")
+            return {
+                **processor.service_status,
+                "latency_p50_seconds": latency.quantile(0.5) if latency else None,
+                "latency_p95_seconds": latency.quantile(0.95) if latency else None
+            }
+        server = serve_http(ticket_queue, args.http_port, status)
+        print(f"Accepting tickets on http://127.0.0.1:{args.http_port}/tickets")
+    if args.input == "-" or (args.input is None and server is None):
+        ticket_queue.feed(read_stdin())
+    elif args.input is not None:
+        if args.follow:
+            ticket_queue.feed(follow_jsonl(args.input, ticket_queue.stop, from_start=not args.from_end))
+        else:
+            ticket_queue.feed(open(args.input, encoding="utf-8"))
+    
+    try:
+        processor.serve(ticket_queue, args.output, batch_size=args.batch_size,
+                        batch_wait=args.batch_wait_ms / 1000, window=args.window,
+                        ticket_ttl=args.ticket_ttl, max_idle_seconds=args.exit_when_idle, stdout=stdout)
+    except KeyboardInterrupt:
+        print("Stopping service...")
+    finally:
+        ticket_queue.stop.set()
+        if server is not None:
+            server.shutdown()
+    
+    if args.verbosity >= 1:
+        # Per-agent totals of a service run span many cap windows, so only the live state is shown
+        status = processor.service_status
+        print(f"Assigned {status.get('assigned', 0)} tickets, {int(metrics.counter('service_closed'))} closed, "
+              f"{status.get('open_tickets', 0)} still open")
+        latency = metrics.histogram("ticket_latency_seconds")
+        if latency:
+            print(f"Latency per ticket: p50 {latency.quantile(0.5) * 1000:.0f} ms, "
+                  f"p95 {latency.quantile(0.95) * 1000:.0f} ms")
+    if args.metrics_report:
+        metrics.write_report(args.metrics_report)
+        print(f"Metrics report saved to: {args.metrics_report}")
+    return 0
+
+
+def simulate_policies(args: argparse.Namespace) -> int:
+    """Simulate each combination of policy parameters and print them ranked by queue wait."""
+    import json
+    from src.data_loader import DataLoader
+    from src.simulator import SimulationInput, SimulationParams, parameter_grid, run_sweep
+    
+    if not os.path.exists(args.dataset):
+        print(f"Error: Dataset file '{args.dataset}' not found")
+        return 1
+    agents, tickets = DataLoader(args.dataset, args.tickets).load_data()
+    inputs = SimulationInput(agents, tickets)
+    base = SimulationParams(window=args.window, handling_minutes=args.handling_minutes,
+                            skill_speedup=args.skill_speedup, handling_sigma=args.handling_sigma, seed=args.seed)
+    grid = parameter_grid(base, cap_fraction=args.cap, skill_weight=args.skill_weight,
+                          load_weight=args.load_weight, experience_weight=args.experience_weight)
+    print(f"Simulating {len(tickets)} tickets and {len(agents)} agents under {len(grid)} policies...")
+    results = run_sweep(inputs, grid, args.workers or os.cpu_count() or 1)
+    
+    results.sort(key=lambda result: (result["wait_minutes"]["p95"], result["utilization"]["max"]))
+    print(f"\n{'cap':>6} {'skill':>6} {'load':>6} {'exp':>6} | {'wait p50':>9} {'p95':>7} {'p99':>7} (min) | "
+          f"{'util mean':>9} {'max':>5} | {'over cap':>8}")
+    for result in results:
+        params, wait, utilization = result["params"], result["wait_minutes"], result["utilization"]
+        print(f"{params['cap_fraction']:>6.3f} {params['skill_weight']:>6.2f} {params['load_weight']:>6.2f} "
+              f"{params['experience_weight']:>6.2f} | {wait['p50']:>9.1f} {wait['p95']:>7.1f} {wait['p99']:>7.1f}       | "
+              f"{utilization['mean']:>9.2f} {utilization['max']:>5.2f} | {result['over_cap_arrivals']:>8}")
+    if len(results) == 1:
+        print("\nPer-agent utilization:")
+        for agent_id, stats in results[0]["agents"].items():
+            print(f"  {agent_id}: {stats['tickets']} tickets, {stats['utilization']:.0%} busy, "
+                  f"at most {stats['peak_open']} open")
+    
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+        print(f"Simulation report saved to: {args.report}")
+    return 0
+
+
+def analyze(args: argparse.Namespace) -> int:
+    """Print fairness and cap statistics of past assignment outputs; returns the exit status."""
+    import json
+    from src.analytics import load_history
+    
+    for path in [args.dataset] + args.outputs:
+        if not os.path.exists(path):
+            print(f"Error: File '{path}' not found")
+            return 1
+    history = load_history(args.outputs, args.dataset, args.tickets)
+    if args.since is not None or args.until is not None:
+        history = history.window(args.since, args.until)
+    if not len(history):
+        print("Error: No assignments to analyze")
+        return 1
+    report = history.report()
+    
+    print("\n" + "="*60)
+    print("WORKLOAD ANALYTICS")
+    print("="*60)
+    print(f"Runs: {report['runs']}, assignments: {report['assignments']}, agents counted: {report['agents_counted']}")
+    print(f"Load Gini: {report['load_gini']:.3f}, variance: {report['load_variance']:.1f}, "
+          f"coefficient of variation: {report['load_cv']:.3f}")
+    print(f"Mean skill match: {report['mean_skill_match']:.3f}, "
+          f"assignments without matching skills: {report['unmatched_rate']:.1%}")
+    print(f"Fallback rate: {report['fallback_rate']:.1%}")
+    print(f"Cap violations: {report['agents_over_cap']} agent-runs over the 11% cap, "
+          f"{report['tickets_over_cap']} tickets above it")
+    if report["runs"] > 1:
+        print(f"\n{'run':<40} {'tickets':>8} {'gini':>6} {'match':>6} {'fallback':>9} {'over cap':>9}")
+        for name, run in report["per_run"].items():
+            print(f"{name[-40:]:<40} {run['tickets']:>8} {run['load_gini']:>6.3f} {run['mean_skill_match']:>6.3f} "
+                  f"{run['fallback_rate']:>9.1%} {run['agents_over_cap']:>9}")
+    print("="*60)
+    
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"Analytics report saved to: {args.report}")
+    return 0
+
+
+def main(argv=None):
+    """Main function to run the ticket assignment system."""
+    args = parse_args(argv)
+    handlers = {"validate": validate, "summarize": summarize, "plan": assign, "assign": assign, "serve": serve,
+                "simulate": simulate_policies, "analyze": analyze}
+    try:
+        # Assignment, simulation and analytics must extract the same skills from a ticket
+        configure_skills()
+        status = handlers[args.command](args)
     except Exception as e:
         print(f"Error: {e}")
-        sys.exit(1)
+        status = 1
+    sys.exit(status)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,135 @@
+"""
+Indexed pool of agents for fast availability and least-loaded queries.
+"""
+import heapq
+import threading
+from collections.abc import Mapping
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .models import Agent
+
+
+class AgentPool(Mapping):
+    """Agents indexed by load and by skill, updated incrementally.
+    
+    Behaves like the read-only agents dict (agent_id -> Agent) it wraps, so it
+    can be passed wherever agents are expected. On top of that it keeps a
+    load-ordered heap of available agents and one per skill, so fallback and
+    candidate queries cost O(log A) instead of a scan over the roster.
+    
+    Heap entries are invalidated lazily: whoever changes an agent's
+    current_load or availability_status must call update(agent_id), which
+    pushes a fresh entry; outdated entries are skipped when they surface.
+    Index updates and queries are thread-safe.
+    """
+    
+    def __init__(self, agents: Dict[str, Agent]):
+        """Build the indexes for a roster."""
+        self.agents = agents
+        self._order: Dict[str, int] = {}
+        self._heap: List[Tuple[int, int, str]] = []
+        self._skill_heaps: Dict[str, List[Tuple[int, int, str]]] = {}
+        self._indexed_skills: Dict[str, Tuple[str, ...]] = {}
+        self._available_count = 0
+        self._available_load = 0
+        self._state: Dict[str, Tuple[bool, int]] = {}
+        self._lock = threading.RLock()
+        for agent_id in agents:
+            self.add(agent_id)
+    
+    def __getitem__(self, agent_id: str) -> Agent:
+        return self.agents[agent_id]
+    
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.agents)
+    
+    def __len__(self) -> int:
+        return len(self.agents)
+    
+    def add(self, agent_id: str):
+        """Index an agent that was added to the roster (or whose skills changed)."""
+        agent = self.agents[agent_id]
+        with self._lock:
+            self._order.setdefault(agent_id, len(self._order))
+            self._indexed_skills[agent_id] = tuple(agent.skills)
+            for skill in agent.skills:
+                self._skill_heaps.setdefault(skill, [])
+            self._push(agent_id)
+    
+    def update(self, agent_id: str):
+        """Re-index an agent after its load or availability changed."""
+        if tuple(self.agents[agent_id].skills) != self._indexed_skills.get(agent_id):
+            self.add(agent_id)
+        else:
+            with self._lock:
+                self._push(agent_id)
+    
+    def _push(self, agent_id: str):
+        """Update the counters and push the agent's current state onto its heaps."""
+        agent = self.agents[agent_id]
+        state = (agent.is_available(), agent.current_load)
+        previous = self._state.get(agent_id)
+        if previous != state:
+            if previous is not None and previous[0]:
+                self._available_count -= 1
+                self._available_load -= previous[1]
+            if state[0]:
+                self._available_count += 1
+                self._available_load += state[1]
+            self._state[agent_id] = state
+        if not state[0]:
+            return
+        entry = (agent.current_load, self._order[agent_id], agent_id)
+        self._heap = self._push_entry(self._heap, entry)
+        for skill in agent.skills:
+            self._skill_heaps[skill] = self._push_entry(self._skill_heaps[skill], entry, skill)
+    
+    def _push_entry(self, heap: List[Tuple[int, int, str]], entry: Tuple[int, int, str],
+                    skill: Optional[str] = None) -> List[Tuple[int, int, str]]:
+        """Push an entry, compacting the heap when outdated entries pile up."""
+        heapq.heappush(heap, entry)
+        if len(heap) > 4 * len(self.agents) + 64:
+            heap = list({item for item in heap if self._is_current(item, skill)})
+            heapq.heapify(heap)
+        return heap
+    
+    def _is_current(self, entry: Tuple[int, int, str], skill: Optional[str] = None) -> bool:
+        """Check whether a heap entry still describes the agent."""
+        load, _, agent_id = entry
+        agent = self.agents.get(agent_id)
+        if agent is None or not agent.is_available() or agent.current_load != load:
+            return False
+        return skill is None or skill in agent.skills
+    
+    def _peek(self, heap: List[Tuple[int, int, str]], skill: Optional[str] = None) -> Optional[Tuple[int, int, str]]:
+        """Drop outdated entries and return the least-loaded current one."""
+        while heap and not self._is_current(heap[0], skill):
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+    
+    def has_available(self) -> bool:
+        """Check whether any agent can take tickets, in O(1)."""
+        return self._available_count > 0
+    
+    def free_capacity(self, max_workload: int) -> int:
+        """Tickets the available agents can still take under max_workload, in O(1).
+        
+        Assumes available agents are below the cap, which holds because agents
+        are marked UNAVAILABLE when they reach it.
+        """
+        return max(0, self._available_count * max_workload - self._available_load)
+    
+    def least_loaded(self, skills: Optional[Iterable[str]] = None) -> Optional[Agent]:
+        """Return the least-loaded available agent, preferring agents with one of skills.
+        
+        Ties go to the agent listed first in the roster. Falls back to any
+        available agent when nobody has the skills; None if nobody is available.
+        """
+        best = None
+        with self._lock:
+            for skill in skills or ():
+                entry = self._peek(self._skill_heaps.get(skill, []), skill)
+                if entry is not None and (best is None or entry < best):
+                    best = entry
+            if best is None:
+                best = self._peek(self._heap)
+        return self.agents[best[2]] if best is not None else None
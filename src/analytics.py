@@ -0,0 +1,227 @@
+"""
+Columnar workload analytics and fairness reports over the assignment outputs of many runs.
+"""
+from array import array
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from .data_loader import DataLoader
+from .local_scorer import LocalScorer
+from .models import Agent
+from .output_writer import read_assignments
+from .skills import extract_relevant_skills
+
+
+# Rationale prefix of assignments made by the fallback path instead of the chosen backend
+FALLBACK_PREFIX = "Fallback assignment"
+
+
+class AssignmentHistory:
+    """Assignments of one or more runs as NumPy columns, one row per assignment.
+    
+    run and agent are codes into run_names and agent_ids; timestamp is the
+    ticket's creation_timestamp and match the agent's average skill level
+    (0-1) over the ticket's extracted skills, as in LocalScorer. Both are
+    -1 / NaN for tickets missing from the dataset. Every statistic is
+    computed over all rows at once, so histories of millions of
+    assignments take a fraction of a second once loaded.
+    """
+    
+    def __init__(self, run_names: List[str], agent_ids: List[str], available: np.ndarray, run: np.ndarray,
+                 agent: np.ndarray, timestamp: np.ndarray, match: np.ndarray, fallback: np.ndarray):
+        """Wrap columns of equal length (available has one entry per agent)."""
+        self.run_names = run_names
+        self.agent_ids = agent_ids
+        self.available = available
+        self.run = run
+        self.agent = agent
+        self.timestamp = timestamp
+        self.match = match
+        self.fallback = fallback
+    
+    def __len__(self) -> int:
+        return len(self.run)
+    
+    def window(self, start: Optional[int] = None, end: Optional[int] = None) -> "AssignmentHistory":
+        """Rows whose ticket was created in [start, end); tickets of unknown time are dropped."""
+        keep = self.timestamp >= 0
+        if start is not None:
+            keep &= self.timestamp >= start
+        if end is not None:
+            keep &= self.timestamp < end
+        return AssignmentHistory(self.run_names, self.agent_ids, self.available, self.run[keep], self.agent[keep],
+                                 self.timestamp[keep], self.match[keep], self.fallback[keep])
+    
+    def loads(self) -> np.ndarray:
+        """Tickets per run and agent (runs x agents)."""
+        num_runs, num_agents = len(self.run_names), len(self.agent_ids)
+        flat = np.bincount(self.run.astype(np.int64) * num_agents + self.agent, minlength=num_runs * num_agents)
+        return flat.reshape(num_runs, num_agents)
+    
+    def report(self) -> Dict:
+        """Load fairness, skill-match quality, fallback rate and 11% cap violations, per run and overall.
+        
+        Fairness (Gini, variance) is measured over the agents that were
+        available in the dataset or received tickets, so agents that were
+        offline all along do not count as under-used. The cap is 11% of each
+        run's tickets in the history (after any time window).
+        """
+        loads = self.loads()
+        tickets = loads.sum(axis=1)
+        caps = (tickets * 0.11).astype(np.int64)
+        excess = np.clip(loads - caps[:, None], 0, None)
+        counted = self.available | (loads.sum(axis=0) > 0)
+        fairness = _fairness(loads[:, counted])
+        
+        num_runs = len(self.run_names)
+        known = ~np.isnan(self.match)
+        matched = np.bincount(self.run[known], minlength=num_runs)
+        match_sum = np.bincount(self.run[known], weights=self.match[known], minlength=num_runs)
+        unmatched = np.bincount(self.run[known], weights=self.match[known] == 0, minlength=num_runs)
+        fallbacks = np.bincount(self.run, weights=self.fallback, minlength=num_runs)
+        
+        runs = {}
+        for index, name in enumerate(self.run_names):
+            runs[name] = {
+                "tickets": int(tickets[index]),
+                "max_workload_per_agent": int(caps[index]),
+                "agents_over_cap": int((excess[index] > 0).sum()),
+                "tickets_over_cap": int(excess[index].sum()),
+                "fallback_rate": _ratio(fallbacks[index], tickets[index]),
+                "mean_skill_match": _ratio(match_sum[index], matched[index]),
+                "unmatched_rate": _ratio(unmatched[index], matched[index]),
+                **{metric: round(float(values[index]), 4) for metric, values in fairness.items()}
+            }
+        
+        agent_tickets = loads.sum(axis=0)
+        agent_matched = np.bincount(self.agent[known], minlength=len(self.agent_ids))
+        agent_match = np.bincount(self.agent[known], weights=self.match[known], minlength=len(self.agent_ids))
+        agent_fallbacks = np.bincount(self.agent, weights=self.fallback, minlength=len(self.agent_ids))
+        agents = {
+            agent_id: {
+                "tickets": int(agent_tickets[index]),
+                "share": _ratio(agent_tickets[index], tickets.sum()),
+                "mean_skill_match": _ratio(agent_match[index], agent_matched[index]),
+                "fallbacks": int(agent_fallbacks[index]),
+                "runs_over_cap": int((excess[:, index] > 0).sum())
+            }
+            for index, agent_id in enumerate(self.agent_ids) if counted[index]
+        }
+        
+        overall = _fairness(agent_tickets[counted][None, :])
+        return {
+            "runs": len(self.run_names),
+            "assignments": len(self),
+            "agents_counted": int(counted.sum()),
+            "time_range": [int(self.timestamp[self.timestamp >= 0].min()), int(self.timestamp.max())]
+            if (self.timestamp >= 0).any() else None,
+            "fallback_rate": _ratio(fallbacks.sum(), len(self)),
+            "mean_skill_match": _ratio(match_sum.sum(), matched.sum()),
+            "unmatched_rate": _ratio(unmatched.sum(), matched.sum()),
+            "agents_over_cap": int((excess > 0).sum()),
+            "tickets_over_cap": int(excess.sum()),
+            **{metric: round(float(values[0]), 4) for metric, values in overall.items()},
+            "per_run": runs,
+            "per_agent": agents
+        }
+
+
+def _ratio(numerator, denominator) -> float:
+    """numerator / denominator rounded for reports (0 when the denominator is 0)."""
+    return round(float(numerator) / float(denominator), 4) if denominator else 0.0
+
+
+def _fairness(loads: np.ndarray) -> Dict[str, np.ndarray]:
+    """Gini coefficient, variance and coefficient of variation of each row of loads."""
+    count = loads.shape[1]
+    totals = loads.sum(axis=1).astype(np.float64)
+    means = loads.mean(axis=1) if count else np.zeros(len(loads))
+    variance = loads.var(axis=1) if count else np.zeros(len(loads))
+    ranks = np.arange(1, count + 1)
+    weighted = (np.sort(loads, axis=1) * ranks).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gini = np.where(totals > 0, 2 * weighted / (count * totals) - (count + 1) / max(count, 1), 0.0)
+        cv = np.where(means > 0, np.sqrt(variance) / means, 0.0)
+    return {"load_gini": gini, "load_variance": variance, "load_cv": cv}
+
+
+def _skill_match(agent_skills: np.ndarray, agent: np.ndarray, skill_counts: np.ndarray,
+                 skill_starts: np.ndarray, skill_ids: np.ndarray) -> np.ndarray:
+    """Average skill level of each row's agent over its ticket's skills, in one gather.
+    
+    Each ticket's skills are a slice of skill_ids (CSR layout); the slices
+    of all rows are expanded into one flat array, looked up in the agents x
+    skills matrix and summed back per row.
+    """
+    total = int(skill_counts.sum())
+    rows = np.repeat(np.arange(len(agent)), skill_counts)
+    row_starts = np.cumsum(skill_counts) - skill_counts
+    positions = np.arange(total) - np.repeat(row_starts - skill_starts, skill_counts)
+    levels = agent_skills[agent[rows], skill_ids[positions]]
+    sums = np.bincount(rows, weights=levels, minlength=len(agent))
+    return sums / np.maximum(skill_counts, 1)
+
+
+def load_history(output_paths: Iterable[str], dataset_path: str, tickets_path: Optional[str] = None,
+                 run_names: Optional[List[str]] = None) -> AssignmentHistory:
+    """Read assignment outputs (JSON or JSONL) into one columnar history.
+    
+    Agent skills and ticket timestamps come from the dataset (and ticket
+    file); ticket skills are extracted once per ticket, however many runs
+    assigned it. Each output file is one run, named by its path unless
+    run_names are given.
+    """
+    loader = DataLoader(dataset_path, tickets_path)
+    agents: Dict[str, Agent] = loader.load_agents()
+    scorer = LocalScorer()
+    scorer.build_index(agents)
+    
+    ticket_rows: Dict[str, int] = {}
+    timestamps = array("q")
+    skill_counts = array("l")
+    skill_ids = array("l")
+    for ticket in loader.iter_tickets():
+        skills = [scorer.skill_index[skill] for skill in extract_relevant_skills(ticket)]
+        ticket_rows[ticket.ticket_id] = len(timestamps)
+        timestamps.append(ticket.creation_timestamp)
+        skill_counts.append(len(skills))
+        skill_ids.extend(skills)
+    # Row -1 (tickets missing from the dataset) has no time and no skills
+    timestamps.append(-1)
+    skill_counts.append(0)
+    
+    agent_codes = {agent_id: code for code, agent_id in enumerate(scorer.agent_ids)}
+    paths = list(output_paths)
+    run_column, agent_column, ticket_column, fallback_column = array("l"), array("l"), array("l"), array("b")
+    for run, path in enumerate(paths):
+        for assignment in read_assignments(path):
+            agent_id = assignment.assigned_agent_id
+            if agent_id not in agent_codes:
+                agent_codes[agent_id] = len(agent_codes)
+            run_column.append(run)
+            agent_column.append(agent_codes[agent_id])
+            ticket_column.append(ticket_rows.get(assignment.ticket_id, -1))
+            fallback_column.append(assignment.rationale.startswith(FALLBACK_PREFIX))
+    
+    agent = np.asarray(agent_column, dtype=np.int64)
+    ticket = np.asarray(ticket_column, dtype=np.int64)
+    counts = np.asarray(skill_counts, dtype=np.int64)
+    starts = np.cumsum(counts) - counts
+    # Agents that only appear in the outputs have no known skills
+    agent_skills = np.zeros((len(agent_codes), scorer.agent_skills.shape[1]), dtype=np.float32)
+    agent_skills[:len(scorer.agent_ids)] = scorer.agent_skills
+    match = _skill_match(agent_skills, agent, counts[ticket], starts[ticket],
+                         np.asarray(skill_ids, dtype=np.int64))
+    match[ticket < 0] = np.nan
+    
+    available = np.zeros(len(agent_codes), dtype=bool)
+    available[:len(agents)] = [agent.is_available() for agent in agents.values()]
+    return AssignmentHistory(
+        run_names=run_names or paths,
+        agent_ids=list(agent_codes),
+        available=available,
+        run=np.asarray(run_column, dtype=np.int64),
+        agent=agent,
+        timestamp=np.asarray(timestamps, dtype=np.int64)[ticket],
+        match=match,
+        fallback=np.asarray(fallback_column, dtype=bool)
+    )
@@ -0,0 +1,7 @@
+"""
+Names of the assignment backends (kept import-free for fast CLI startup).
+"""
+
+
+BACKENDS = ("llm", "local", "hybrid", "optimal")
+LLM_BACKENDS = ("llm", "hybrid")
@@ -2,46 +2,239 @@
 Data loading and initialization utilities.
 """
 import json
-from typing import Dict, List, Tuple
-from .models import Agent, Ticket
+import re
+from typing import Any, Dict, Iterator, List, Optional, TextIO, Tuple
+from .metrics import Metrics
+from .models import Agent, RecordFile, Ticket
+
+
+_WHITESPACE = re.compile(r"\s*")
+
+
+def _utf8_len(text: str) -> int:
+    """Length of text in bytes once encoded as UTF-8."""
+    return len(text) if text.isascii() else len(text.encode('utf-8'))
+
+
+class _JsonStreamReader:
+    """Reads JSON values one at a time from a file without loading all of it."""
+    
+    def __init__(self, file: TextIO, chunk_size: int = 1 << 16):
+        self.file = file
+        self.chunk_size = chunk_size
+        self.decoder = json.JSONDecoder()
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        # Byte offset of buffer position _mark_pos, advanced by byte_offset()
+        self._mark_pos = 0
+        self._mark_bytes = 0
+    
+    def _fill(self):
+        """Append the next chunk of the file to the unread part of the buffer."""
+        chunk = self.file.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+        self.byte_offset()
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        self._mark_pos = 0
+    
+    def byte_offset(self) -> int:
+        """Byte offset in the file of the current position (file opened with newline='')."""
+        self._mark_bytes += _utf8_len(self.buffer[self._mark_pos:self.pos])
+        self._mark_pos = self.pos
+        return self._mark_bytes
+    
+    def peek(self) -> str:
+        """Return the next non-whitespace character ('' at end of file)."""
+        while True:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or self.eof:
+                return self.buffer[self.pos:self.pos + 1]
+            self._fill()
+    
+    def expect(self, char: str):
+        """Consume the next non-whitespace character, which must be char."""
+        if self.peek() != char:
+            raise ValueError(f"Malformed JSON: expected '{char}' at offset {self.pos}")
+        self.pos += 1
+    
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number at the end of the buffer may continue in the next chunk
+                if end < len(self.buffer) or self.eof:
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            self._fill()
+
+
+def iter_json_array(path: str, key: str, with_offsets: bool = False) -> Iterator[Any]:
+    """Yield the elements of the top-level array `key` of a JSON object file one by one.
+    
+    With with_offsets, yields (element, byte offset, byte length) instead.
+    """
+    # newline='' keeps line endings untranslated so byte offsets stay exact
+    with open(path, 'r', encoding='utf-8', newline='') as file:
+        reader = _JsonStreamReader(file)
+        reader.expect('{')
+        while reader.peek() not in ('}', ''):
+            name = reader.value()
+            reader.expect(':')
+            if name != key:
+                reader.value()  # skip other sections
+            else:
+                reader.expect('[')
+                if reader.peek() == ']':
+                    return
+                while True:
+                    if with_offsets:
+                        reader.peek()
+                        start = reader.byte_offset()
+                        value = reader.value()
+                        yield value, start, reader.byte_offset() - start
+                    else:
+                        yield reader.value()
+                    separator = reader.peek()
+                    reader.pos += 1
+                    if separator == ']':
+                        return
+                    if separator != ',':
+                        raise ValueError(f"Malformed JSON array '{key}' in {path}")
+            if reader.peek() == ',':
+                reader.pos += 1
+
+
+def iter_jsonl(path: str, with_offsets: bool = False) -> Iterator[Any]:
+    """Yield one JSON value per non-empty line of a JSONL file.
+    
+    With with_offsets, yields (value, byte offset, byte length) instead.
+    """
+    if with_offsets:
+        with open(path, 'rb') as file:
+            offset = 0
+            for line in file:
+                if line.strip():
+                    yield json.loads(line), offset, len(line)
+                offset += len(line)
+        return
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.strip():
+                yield json.loads(line)
 
 
 class DataLoader:
     """Handles loading and parsing of dataset.json."""
     
-    def __init__(self, dataset_path: str):
+    def __init__(self, dataset_path: str, tickets_path: Optional[str] = None,
+                 metrics: Optional[Metrics] = None, lazy_descriptions: bool = False):
+        """Set up the loader.
+        
+        With lazy_descriptions, tickets keep only the file offset of their
+        record and read the description back on access, so large backlogs
+        don't hold every description in memory.
+        """
         self.dataset_path = dataset_path
+        # Tickets may come from a separate JSON or JSONL file when streaming
+        self.tickets_path = tickets_path or dataset_path
         self.agents: Dict[str, Agent] = {}
         self.tickets: List[Ticket] = []
+        self.metrics = metrics or Metrics()
+        self.lazy_descriptions = lazy_descriptions
     
     def load_data(self) -> Tuple[Dict[str, Agent], List[Ticket]]:
         """Load and parse the dataset.json file."""
-        with open(self.dataset_path, 'r', encoding='utf-8') as file:
-            data = json.load(file)
+        with self.metrics.timer("load_data_seconds"):
+            if self.lazy_descriptions:
+                # Stream the file so the descriptions are never all in memory
+                for agent_data in iter_json_array(self.dataset_path, 'agents'):
+                    agent = self._parse_agent(agent_data)
+                    self.agents[agent.agent_id] = agent
+                self.tickets.extend(self.iter_tickets())
+            else:
+                with open(self.dataset_path, 'r', encoding='utf-8') as file:
+                    data = json.load(file)
+                
+                # Load agents
+                for agent_data in data['agents']:
+                    agent = self._parse_agent(agent_data)
+                    self.agents[agent.agent_id] = agent
+                
+                # Load tickets (a separate ticket file is read like the lazy path does)
+                if self.tickets_path == self.dataset_path:
+                    self.tickets.extend(self._parse_ticket(ticket_data) for ticket_data in data.get('tickets', []))
+                else:
+                    self.tickets.extend(self.iter_tickets())
         
-        # Load agents
-        for agent_data in data['agents']:
-            agent = Agent(
-                agent_id=agent_data['agent_id'],
-                name=agent_data['name'],
-                skills=agent_data['skills'],
-                current_load=agent_data['current_load'],
-                availability_status=agent_data['availability_status'],
-                experience_level=agent_data['experience_level']
-            )
-            self.agents[agent.agent_id] = agent
+        self.metrics.increment("agents_loaded", len(self.agents))
+        self.metrics.increment("tickets_loaded", len(self.tickets))
+        return self.agents, self.tickets
+    
+    def load_agents(self) -> Dict[str, Agent]:
+        """Load only the agents section, streaming past everything else."""
+        self.agents = {}
+        with self.metrics.timer("load_agents_seconds"):
+            for agent_data in iter_json_array(self.dataset_path, 'agents'):
+                agent = self._parse_agent(agent_data)
+                self.agents[agent.agent_id] = agent
+        self.metrics.increment("agents_loaded", len(self.agents))
+        return self.agents
+    
+    def iter_tickets(self) -> Iterator[Ticket]:
+        """Lazily yield tickets from a JSONL file or the 'tickets' array of a JSON file.
         
-        # Load tickets
-        for ticket_data in data['tickets']:
-            ticket = Ticket(
-                ticket_id=ticket_data['ticket_id'],
-                title=ticket_data['title'],
-                description=ticket_data['description'],
-                creation_timestamp=ticket_data['creation_timestamp']
-            )
-            self.tickets.append(ticket)
+        Only one ticket is held in memory at a time, regardless of file size.
+        """
+        if self.lazy_descriptions:
+            record_file = RecordFile(self.tickets_path)
+            if self.tickets_path.endswith('.jsonl'):
+                records = iter_jsonl(self.tickets_path, with_offsets=True)
+            else:
+                records = iter_json_array(self.tickets_path, 'tickets', with_offsets=True)
+            for ticket_data, offset, length in records:
+                yield self._parse_ticket(ticket_data, (record_file, offset, length))
+            return
         
-        return self.agents, self.tickets
+        if self.tickets_path.endswith('.jsonl'):
+            records = iter_jsonl(self.tickets_path)
+        else:
+            records = iter_json_array(self.tickets_path, 'tickets')
+        for ticket_data in records:
+            yield self._parse_ticket(ticket_data)
+    
+    def count_tickets(self) -> int:
+        """Count tickets with a streaming pass (needed for the 11% cap)."""
+        with self.metrics.timer("count_tickets_seconds"):
+            return sum(1 for _ in self.iter_tickets())
+    
+    def _parse_agent(self, agent_data: Dict) -> Agent:
+        """Create an Agent from its dataset record."""
+        return Agent(
+            agent_id=agent_data['agent_id'],
+            name=agent_data['name'],
+            skills=agent_data['skills'],
+            current_load=agent_data['current_load'],
+            availability_status=agent_data['availability_status'],
+            experience_level=agent_data['experience_level']
+        )
+    
+    def _parse_ticket(self, ticket_data: Dict, record: Optional[Tuple[RecordFile, int, int]] = None) -> Ticket:
+        """Create a Ticket from its dataset record (keeping only its location if record is given)."""
+        return Ticket(
+            ticket_id=ticket_data['ticket_id'],
+            title=ticket_data['title'],
+            description=None if record is not None else ticket_data['description'],
+            creation_timestamp=ticket_data['creation_timestamp'],
+            record=record
+        )
     
     def get_agents_summary(self) -> str:
         """Get a formatted summary of all agents for LLM context."""
@@ -0,0 +1,239 @@
+"""
+Near-duplicate ticket clustering with MinHash/LSH and assignment reuse.
+"""
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .metrics import Metrics
+from .models import Agent, Ticket, Assignment
+from .skills import build_rationale, tokenize
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class MinHasher:
+    """MinHash signatures of ticket text over word unigrams and bigrams.
+    
+    The fraction of equal signature positions of two tickets estimates the
+    Jaccard similarity of their word sets.
+    """
+    
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        """Draw num_perm random hash functions (a * x + b) mod p."""
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+    
+    def shingles(self, ticket: Ticket) -> set:
+        """Word unigrams and bigrams of the ticket title and description."""
+        words = tokenize(f"{ticket.title} {ticket.description}")
+        return set(words) | {f"{first} {second}" for first, second in zip(words, words[1:])}
+    
+    def signature(self, ticket: Ticket) -> np.ndarray:
+        """MinHash signature of a ticket (num_perm values)."""
+        shingles = self.shingles(ticket)
+        if not shingles:
+            return np.full(self.num_perm, _MERSENNE_PRIME, dtype=np.uint64)
+        hashes = np.array([
+            int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+            for shingle in shingles
+        ], dtype=np.uint64)
+        # a and b span the whole field so each permutation reorders the shingles;
+        # a * x + b wraps around 64 bits, which keeps the low 32 bits well mixed
+        values = (np.outer(hashes, self._a) + self._b) % np.uint64(_MERSENNE_PRIME)
+        return (values & np.uint64(_MAX_HASH)).min(axis=0)
+
+
+class TicketCluster:
+    """A group of near-duplicate tickets sharing one assignment decision."""
+    
+    def __init__(self, representative: Ticket, signature: np.ndarray):
+        self.representative_id = representative.ticket_id
+        self.title = representative.title
+        self.signature = signature
+        self.ticket_ids: List[str] = [representative.ticket_id]
+        self.agent_id: Optional[str] = None
+        # Set once the representative's decision is known (or failed)
+        self.decided = threading.Event()
+
+
+class NearDuplicateAssigner:
+    """Reuses one assignment decision for all near-duplicates of a ticket.
+    
+    Wraps an assigner (usually the LLMAssigner). Each ticket's MinHash
+    signature is looked up in an LSH index (bands x rows of the signature);
+    a candidate cluster whose representative has an estimated Jaccard
+    similarity of at least threshold is a match. The first ticket of a
+    cluster goes to the wrapped assigner; later ones get the same agent
+    without a request, as long as that agent is available and below the cap.
+    Otherwise the ticket is sent to the wrapped assigner and its answer
+    becomes the cluster's decision from then on.
+    
+    Concurrent callers that hit a cluster whose first request is still in
+    flight wait for its answer instead of sending their own.
+    """
+    
+    def __init__(self, assigner, threshold: float = 0.8, num_perm: int = 64, bands: int = 16,
+                 metrics: Optional[Metrics] = None):
+        """Initialize with the assigner to deduplicate and the similarity threshold."""
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.assigner = assigner
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.hasher = MinHasher(num_perm)
+        self.metrics = metrics or Metrics()
+        self.clusters: List[TicketCluster] = []
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+        self._lock = threading.Lock()
+        # Tickets left unanswered by assign_tickets, retried through assign_ticket
+        self._unanswered: Dict[str, TicketCluster] = {}
+        self.reused = 0
+    
+    def _band_keys(self, signature: np.ndarray) -> List[Tuple[int, bytes]]:
+        """LSH bucket keys of a signature, one per band."""
+        return [(band, signature[band * self.rows:(band + 1) * self.rows].tobytes()) for band in range(self.bands)]
+    
+    def _find_or_add(self, ticket: Ticket) -> Tuple[TicketCluster, bool]:
+        """Return the ticket's cluster and whether the ticket founded it."""
+        signature = self.hasher.signature(ticket)
+        keys = self._band_keys(signature)
+        with self._lock:
+            best, best_similarity = None, self.threshold
+            seen = set()
+            for key in keys:
+                for index in self._buckets.get(key, ()):
+                    if index in seen:
+                        continue
+                    seen.add(index)
+                    similarity = float(np.mean(self.clusters[index].signature == signature))
+                    if similarity >= best_similarity:
+                        best, best_similarity = self.clusters[index], similarity
+            if best is not None:
+                best.ticket_ids.append(ticket.ticket_id)
+                return best, False
+            
+            # Only representatives are indexed, so memory grows with clusters, not tickets
+            cluster = TicketCluster(ticket, signature)
+            self.clusters.append(cluster)
+            for key in keys:
+                self._buckets.setdefault(key, []).append(len(self.clusters) - 1)
+        self.metrics.increment("dedup_clusters")
+        return cluster, True
+    
+    def _reuse(self, ticket: Ticket, cluster: TicketCluster, agents: Dict[str, Agent],
+               max_workload: int, extra_load: int = 0) -> Optional[Assignment]:
+        """Assign a duplicate to its cluster's agent if that agent can take it."""
+        agent = agents.get(cluster.agent_id) if cluster.agent_id is not None else None
+        if agent is None or not agent.is_available() or agent.current_load + extra_load >= max_workload:
+            return None
+        with self._lock:
+            self.reused += 1
+        self.metrics.increment("dedup_reused")
+        return Assignment(
+            ticket_id=ticket.ticket_id,
+            title=ticket.title,
+            assigned_agent_id=agent.agent_id,
+            rationale=f"{build_rationale(ticket, agent)} Near-duplicate of {cluster.representative_id}."
+        )
+    
+    def _decide(self, ticket: Ticket, cluster: TicketCluster, agents: Dict[str, Agent],
+                total_tickets: int) -> Assignment:
+        """Ask the wrapped assigner and record its answer as the cluster's decision."""
+        try:
+            assignment = self.assigner.assign_ticket(ticket, agents, total_tickets)
+            cluster.agent_id = assignment.assigned_agent_id
+        finally:
+            # Waiting duplicates decide on their own if this request failed
+            cluster.decided.set()
+        return assignment
+    
+    def assign_ticket(self, ticket: Ticket, agents: Dict[str, Agent], total_tickets: int) -> Assignment:
+        """Assign a ticket, reusing its cluster's decision when possible."""
+        with self._lock:
+            cluster = self._unanswered.pop(ticket.ticket_id, None)
+        founded = False
+        if cluster is None:
+            cluster, founded = self._find_or_add(ticket)
+        if not founded:
+            cluster.decided.wait()
+            assignment = self._reuse(ticket, cluster, agents, int(total_tickets * 0.11))
+            if assignment is not None:
+                return assignment
+        return self._decide(ticket, cluster, agents, total_tickets)
+    
+    def assign_tickets(self, tickets: List[Ticket], agents: Dict[str, Agent], total_tickets: int) -> List[Optional[Assignment]]:
+        """Assign a batch, sending only one ticket per cluster to the wrapped assigner.
+        
+        Duplicates of a cluster decided earlier are assigned directly; within
+        the batch, duplicates copy their representative's answer. Entries are
+        None where the wrapped assigner gave no answer.
+        """
+        max_workload = int(total_tickets * 0.11)  # 11% threshold
+        clusters = [self._find_or_add(ticket) for ticket in tickets]
+        results: List[Optional[Assignment]] = [None] * len(tickets)
+        batch_load: Dict[str, int] = {}
+        
+        def reuse(i: int) -> bool:
+            cluster = clusters[i][0]
+            assignment = self._reuse(tickets[i], cluster, agents, max_workload, batch_load.get(cluster.agent_id, 0))
+            if assignment is not None:
+                batch_load[cluster.agent_id] = batch_load.get(cluster.agent_id, 0) + 1
+                results[i] = assignment
+            return assignment is not None
+        
+        # Decided clusters first; one representative per undecided cluster goes out
+        ask: List[int] = []
+        asked = set()
+        for i, (cluster, founded) in enumerate(clusters):
+            if not founded and cluster.decided.is_set() and reuse(i):
+                continue
+            if id(cluster) not in asked:
+                asked.add(id(cluster))
+                ask.append(i)
+        
+        try:
+            answers = self.assigner.assign_tickets([tickets[i] for i in ask], agents, total_tickets) if ask else []
+            for i, answer in zip(ask, answers):
+                results[i] = answer
+                if answer is not None:
+                    clusters[i][0].agent_id = answer.assigned_agent_id
+                    batch_load[answer.assigned_agent_id] = batch_load.get(answer.assigned_agent_id, 0) + 1
+        finally:
+            for i in ask:
+                clusters[i][0].decided.set()
+        
+        # Remaining duplicates of this batch copy their representative's answer
+        for i in range(len(tickets)):
+            if results[i] is None and i not in ask:
+                reuse(i)
+        with self._lock:
+            for i, result in enumerate(results):
+                if result is None:
+                    self._unanswered[tickets[i].ticket_id] = clusters[i][0]
+        return results
+    
+    def summary(self, limit: int = 10) -> Dict:
+        """Cluster counts and the largest clusters, for the run summary."""
+        with self._lock:
+            groups = [cluster for cluster in self.clusters if len(cluster.ticket_ids) > 1]
+            groups.sort(key=lambda cluster: len(cluster.ticket_ids), reverse=True)
+            return {
+                "clusters": len(groups),
+                "clustered_tickets": sum(len(cluster.ticket_ids) for cluster in groups),
+                "decisions_reused": self.reused,
+                "largest": [
+                    {
+                        "representative": cluster.representative_id,
+                        "title": cluster.title,
+                        "tickets": len(cluster.ticket_ids),
+                        "agent_id": cluster.agent_id
+                    }
+                    for cluster in groups[:limit]
+                ]
+            }
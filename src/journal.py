@@ -0,0 +1,113 @@
+"""
+Append-only checkpoint journal of committed assignments.
+"""
+import hashlib
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+from .models import Agent, Assignment, Ticket
+from .output_writer import assignment_to_dict
+
+
+def run_digest(agents: Dict[str, Agent], tickets: List[Ticket]) -> str:
+    """Fingerprint of the roster and tickets a run starts from, used to refuse resuming against different data.
+    
+    Covers every agent field (id, skills, load, availability, experience)
+    and every ticket field, so a journal is not replayed over a roster or
+    tickets that changed since it was written.
+    """
+    digest = hashlib.sha256()
+    for agent in agents.values():
+        entry = [agent.agent_id, sorted(agent.skills.items()), agent.current_load, agent.availability_status,
+                 agent.experience_level]
+        digest.update(json.dumps(entry, ensure_ascii=False).encode('utf-8') + b"\n")
+    digest.update(b"\n")
+    for ticket in tickets:
+        entry = [ticket.ticket_id, ticket.title, ticket.description, ticket.creation_timestamp]
+        digest.update(json.dumps(entry, ensure_ascii=False).encode('utf-8') + b"\n")
+    return digest.hexdigest()
+
+
+class AssignmentJournal:
+    """JSONL journal with one record per committed assignment.
+    
+    The first line is a header describing the run; every following line holds
+    an assignment together with the load delta it applied to its agent and
+    the agent's availability status afterwards, so replaying the journal over
+    the freshly loaded roster rebuilds the exact agent state. Records are
+    flushed as they are written (safe against a crashed process) and fsynced
+    every fsync_every records or fsync_interval seconds (bounding what a power
+    loss can take). A torn last line is discarded on replay.
+    """
+    
+    def __init__(self, path: str, fsync_every: int = 50, fsync_interval: float = 1.0):
+        self.path = path
+        self.fsync_every = max(1, fsync_every)
+        self.fsync_interval = fsync_interval
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    def replay(self) -> Tuple[Optional[Dict], List[Dict]]:
+        """Read the existing journal: (header, records), or (None, []) if there is none."""
+        if not os.path.exists(self.path):
+            return None, []
+        
+        header = None
+        records = []
+        valid_size = 0
+        with open(self.path, 'rb') as file:
+            lines = file.readlines()
+        for i, line in enumerate(lines):
+            try:
+                record = json.loads(line)
+            except ValueError:
+                if i == len(lines) - 1:
+                    break  # torn write at the moment of the crash
+                raise ValueError(f"Corrupt journal {self.path} at line {i + 1}")
+            if not line.endswith(b"\n") and i == len(lines) - 1:
+                break
+            valid_size += len(line)
+            if i == 0:
+                header = record
+            else:
+                records.append(record)
+        
+        # Drop a torn tail so appended records start on a fresh line
+        if valid_size < os.path.getsize(self.path):
+            with open(self.path, 'r+b') as file:
+                file.truncate(valid_size)
+        return header, records
+    
+    def start(self, header: Dict, append: bool = False):
+        """Open the journal for writing; a new journal starts with header."""
+        self._file = open(self.path, 'a' if append else 'w', encoding='utf-8')
+        if not append:
+            self._file.write(json.dumps(header) + "\n")
+            self.sync()
+    
+    def record(self, assignment: Assignment, load_delta: int, availability_status: str):
+        """Append one committed assignment and the agent state change it caused."""
+        entry = assignment_to_dict(assignment)
+        entry["load_delta"] = load_delta
+        entry["availability_status"] = availability_status
+        self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._file.flush()
+        self._unsynced += 1
+        if self._unsynced >= self.fsync_every or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.sync()
+    
+    def sync(self):
+        """Force written records to disk."""
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+    
+    def close(self):
+        """Sync and close the journal."""
+        if self._file is None or self._file.closed:
+            return
+        self.sync()
+        self._file.close()
@@ -1,80 +1,165 @@
 """
 LLM-based ticket assignment using strands library.
 """
-from typing import Dict, List
-from strands import Agent as StrandsAgent
-from strands.models.openai import OpenAIModel
+import json
+import re
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from .agent_pool import AgentPool
+from .llm_cache import ResponseCache
+from .metrics import SIZE_BUCKETS, Metrics
 from .models import Agent, Ticket, Assignment
+from .scheduler import RequestScheduler
+from .shortlist import CandidateShortlist
+from .skills import build_rationale, extract_relevant_skills
+
+
+SYSTEM_INSTRUCTIONS = "You are an expert IT support manager. Your task is to assign support tickets to the most suitable agent based on their skills, current workload, and experience."
+
+WORKLOAD_RULES = """IMPORTANT WORKLOAD BALANCING RULES:
+- NEVER assign tickets to agents with availability_status "UNAVAILABLE"
+- Consider workload distribution: if a less technical agent has much lower workload than the most skilled agent, prefer the less technical one
+- Balance between skill match and workload fairness
+- Maximum workload per agent should not exceed 11% of total tickets"""
+
+SELECTION_CRITERIA = """1. Availability status (UNAVAILABLE agents are excluded)
+2. Skill match (important but not absolute)
+3. Current workload (lower is better, especially for workload balancing)
+4. Experience level"""
 
 
 class LLMAssigner:
     """Handles ticket assignment using LLM via strands library."""
     
-    def __init__(self, api_key: str):
-        """Initialize the LLM assigner with OpenAI API key."""
-        model = OpenAIModel(
-            client_args={"api_key": api_key},
-            model_id="gpt-4o",
-            params={"max_tokens": 1000, "temperature": 0.3}
-        )
-        self.agent = StrandsAgent(model=model)
+    def __init__(self, api_key: str, model_id: str = "gpt-4o", max_tokens: int = 1000,
+                 temperature: float = 0.3, cache: Optional[ResponseCache] = None,
+                 agent_factory: Optional[Callable[[], Callable[[str], Any]]] = None,
+                 metrics: Optional[Metrics] = None, shortlist_k: int = 0,
+                 scheduler: Optional[RequestScheduler] = None):
+        """Initialize the LLM assigner with OpenAI API key.
+        
+        When a ResponseCache is given, identical prompts (same ticket, same
+        agent state, same model parameters) are answered from disk without a
+        network call. agent_factory replaces the strands agent (a callable
+        taking the prompt) with a stand-in, e.g. the fake backend used by the
+        benchmarks. Prompt building, LLM calls (with prompt size and token
+        usage), validation, rationale building and fallbacks are recorded in
+        metrics.
+        
+        With shortlist_k > 0, prompts list only the shortlist_k available
+        agents whose skills best match the ticket text (see
+        CandidateShortlist) instead of the whole roster; the estimated prompt
+        characters saved are counted as shortlist_prompt_chars_saved.
+        
+        A RequestScheduler paces requests under the provider's rate limits
+        and retries transient errors; without one, every request is sent
+        once, right away.
+        """
+        self.model_params = {"model_id": model_id, "max_tokens": max_tokens, "temperature": temperature}
+        self.cache = cache
+        self.metrics = metrics or Metrics()
+        self.scheduler = scheduler
+        self.shortlist = CandidateShortlist(shortlist_k) if shortlist_k > 0 else None
+        self.model = None
+        if agent_factory is None:
+            # Imported here: the SDK is slow to import and only needed for real LLM calls
+            from strands import Agent as StrandsAgent
+            from strands.models.openai import OpenAIModel
+            self.model = OpenAIModel(
+                client_args={"api_key": api_key},
+                model_id=model_id,
+                params={"max_tokens": max_tokens, "temperature": temperature}
+            )
+            agent_factory = lambda: StrandsAgent(model=self.model)
+        self.agent_factory = agent_factory
+    
+    def _invoke(self, prompt: str, ticket_count: int = 1) -> str:
+        """Send a single prompt to the LLM and return the raw text response."""
+        self.metrics.observe("prompt_chars", len(prompt), buckets=SIZE_BUCKETS)
+        cache_key = None
+        if self.cache is not None:
+            cache_key = ResponseCache.make_key(prompt, **self.model_params)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                self.metrics.increment("llm_cache_hits")
+                return cached
+        
+        # A fresh strands agent per call keeps prompts independent (no growing
+        # conversation history) and makes concurrent calls from threads safe.
+        agent = self.agent_factory()
+        self.metrics.increment("llm_requests")
+        try:
+            with self.metrics.timer("llm_request_seconds"):
+                if self.scheduler is None:
+                    result = agent(prompt)
+                else:
+                    # Roughly 4 characters per token; max_tokens counts against the limit too
+                    estimated_tokens = len(prompt) // 4 + self.model_params["max_tokens"]
+                    result = self.scheduler.call(lambda: agent(prompt), estimated_tokens, self._token_usage)
+        except Exception:
+            self.metrics.increment("llm_errors")
+            raise
+        response = str(result)
+        
+        tokens_in, tokens_out = self._token_usage(result)
+        if tokens_in or tokens_out:
+            self.metrics.increment("llm_tokens_in", tokens_in)
+            self.metrics.increment("llm_tokens_out", tokens_out)
+            self.metrics.observe("tokens_per_ticket", (tokens_in + tokens_out) / ticket_count, buckets=SIZE_BUCKETS)
+        
+        if cache_key is not None:
+            self.cache.put(cache_key, response)
+        return response
+    
+    def _token_usage(self, result: Any) -> Tuple[int, int]:
+        """Input and output tokens reported by a strands agent result (0, 0 if unknown)."""
+        usage = getattr(getattr(result, "metrics", None), "accumulated_usage", None)
+        if not isinstance(usage, dict):
+            return 0, 0
+        return int(usage.get("inputTokens", 0)), int(usage.get("outputTokens", 0))
     
     def assign_ticket(self, ticket: Ticket, agents: Dict[str, Agent], total_tickets: int) -> Assignment:
         """Assign a ticket to the best available agent using LLM with workload balancing."""
         
         # Create context for the LLM
-        agents_context = self._create_agents_context(agents, total_tickets)
+        prompt_started = time.perf_counter()
+        agents_context = self._create_agents_context(agents, total_tickets, [ticket])
         ticket_context = self._create_ticket_context(ticket)
         
         prompt = f"""
-You are an expert IT support manager. Your task is to assign support tickets to the most suitable agent based on their skills, current workload, and experience.
+{SYSTEM_INSTRUCTIONS}
 
 {ticket_context}
 
 {agents_context}
 
-IMPORTANT WORKLOAD BALANCING RULES:
-- NEVER assign tickets to agents with availability_status "UNAVAILABLE"
-- Consider workload distribution: if a less technical agent has much lower workload than the most skilled agent, prefer the less technical one
-- Balance between skill match and workload fairness
-- Maximum workload per agent should not exceed 11% of total tickets
+{WORKLOAD_RULES}
 
 Based on the ticket requirements and agent capabilities, select the BEST agent for this ticket. Consider:
-1. Availability status (UNAVAILABLE agents are excluded)
-2. Skill match (important but not absolute)
-3. Current workload (lower is better, especially for workload balancing)
-4. Experience level
+{SELECTION_CRITERIA}
 
 Respond with ONLY the agent_id of the best agent (e.g., "agent_001"). Do not include any other text.
 """
+        self.metrics.observe("prompt_build_seconds", time.perf_counter() - prompt_started)
         
         # Get assignment from LLM
-        response = self.agent(prompt)
-        assigned_agent_id = str(response).strip()
-        
-        # Validate the response
-        if assigned_agent_id not in agents:
-            # Fallback to first available agent if LLM returns invalid ID
-            available_agents = [a for a in agents.values() if a.is_available()]
-            if available_agents:
-                assigned_agent_id = available_agents[0].agent_id
-            else:
-                raise ValueError("No available agents found")
+        assigned_agent_id = self._invoke(prompt).strip()
         
-        assigned_agent = agents[assigned_agent_id]
+        # Validate the response: the agent must exist and be available
+        with self.metrics.timer("validation_seconds"):
+            if assigned_agent_id not in agents or not agents[assigned_agent_id].is_available():
+                # Fall back to the least-loaded available agent with a matching skill
+                self.metrics.increment("fallbacks", reason="invalid llm answer")
+                fallback_agent = self._fallback_agent(ticket, agents)
+                if fallback_agent is None:
+                    raise ValueError("No available agents found")
+                assigned_agent_id = fallback_agent.agent_id
         
-        # Check if agent is available
-        if not assigned_agent.is_available():
-            # Find next best available agent
-            available_agents = [a for a in agents.values() if a.is_available()]
-            if available_agents:
-                assigned_agent_id = available_agents[0].agent_id
-                assigned_agent = agents[assigned_agent_id]
-            else:
-                raise ValueError("No available agents found")
+        assigned_agent = agents[assigned_agent_id]
         
         # Create rationale
-        rationale = self._create_rationale(ticket, assigned_agent, agents)
+        with self.metrics.timer("rationale_seconds"):
+            rationale = self._create_rationale(ticket, assigned_agent, agents)
         
         return Assignment(
             ticket_id=ticket.ticket_id,
@@ -83,9 +168,94 @@ Respond with ONLY the agent_id of the best agent (e.g., "agent_001"). Do not inc
             rationale=rationale
         )
     
-    def _create_agents_context(self, agents: Dict[str, Agent], total_tickets: int) -> str:
-        """Create context string for all available agents with workload information."""
+    def assign_tickets(self, tickets: List[Ticket], agents: Dict[str, Agent], total_tickets: int) -> List[Optional[Assignment]]:
+        """Assign several tickets with a single LLM request.
+        
+        Returns one entry per ticket, in order. Entries are None when the LLM
+        answer for that ticket is missing, names an unknown or unavailable
+        agent, or would push the agent past the 11% cap; callers should retry
+        those tickets individually.
+        """
+        prompt_started = time.perf_counter()
+        agents_context = self._create_agents_context(agents, total_tickets, tickets)
+        tickets_context = "\n".join(self._create_ticket_context(ticket) for ticket in tickets)
+        
+        prompt = f"""
+{SYSTEM_INSTRUCTIONS}
+
+{tickets_context}
+
+{agents_context}
+
+{WORKLOAD_RULES}
+- Spread the tickets of this batch across agents; each assignment counts towards the agent's workload
+
+For EACH ticket above, select the BEST agent. Consider:
+{SELECTION_CRITERIA}
+
+Respond with ONLY a JSON object mapping every Ticket ID to the agent_id of the best agent
+(e.g., {{"{tickets[0].ticket_id}": "agent_001"}}). Do not include any other text.
+"""
+        self.metrics.observe("prompt_build_seconds", time.perf_counter() - prompt_started)
+        
+        mapping = self._parse_batch_response(self._invoke(prompt, len(tickets)))
+        
+        validation_started = time.perf_counter()
         max_workload = int(total_tickets * 0.11)  # 11% threshold
+        batch_load: Dict[str, int] = {}
+        results: List[Optional[Assignment]] = []
+        for ticket in tickets:
+            assigned_agent_id = mapping.get(ticket.ticket_id)
+            assigned_agent = agents.get(assigned_agent_id) if isinstance(assigned_agent_id, str) else None
+            if assigned_agent is None or not assigned_agent.is_available():
+                results.append(None)
+                continue
+            
+            projected_load = assigned_agent.current_load + batch_load.get(assigned_agent_id, 0)
+            if projected_load >= max_workload:
+                results.append(None)
+                continue
+            
+            batch_load[assigned_agent_id] = batch_load.get(assigned_agent_id, 0) + 1
+            results.append(Assignment(
+                ticket_id=ticket.ticket_id,
+                title=ticket.title,
+                assigned_agent_id=assigned_agent_id,
+                rationale=self._create_rationale(ticket, assigned_agent, agents)
+            ))
+        
+        # Batch validation includes building the rationales of accepted answers
+        self.metrics.observe("validation_seconds", time.perf_counter() - validation_started)
+        rejected = results.count(None)
+        if rejected:
+            self.metrics.increment("batch_answers_rejected", rejected)
+        return results
+    
+    def _fallback_agent(self, ticket: Ticket, agents: Dict[str, Agent]) -> Optional[Agent]:
+        """Pick a replacement when the LLM names an unknown or unavailable agent."""
+        pool = agents if isinstance(agents, AgentPool) else AgentPool(agents)
+        return pool.least_loaded(self._extract_relevant_skills(ticket))
+    
+    def _parse_batch_response(self, response: str) -> Dict[str, str]:
+        """Extract the ticket_id -> agent_id mapping from a batch response."""
+        match = re.search(r"\{.*\}", response, re.DOTALL)
+        if not match:
+            return {}
+        try:
+            mapping = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            return {}
+        return mapping if isinstance(mapping, dict) else {}
+    
+    def _create_agents_context(self, agents: Dict[str, Agent], total_tickets: int,
+                               tickets: Optional[List[Ticket]] = None) -> str:
+        """Create context string for all available agents with workload information.
+        
+        With a shortlist, only the candidates of the given tickets are listed.
+        """
+        max_workload = int(total_tickets * 0.11)  # 11% threshold
+        if self.shortlist is not None and tickets:
+            return self._create_shortlist_context(agents, max_workload, tickets)
         
         context = f"Available Agents (Max workload per agent: {max_workload} tickets):\n"
         for agent in agents.values():
@@ -97,6 +267,30 @@ Respond with ONLY the agent_id of the best agent (e.g., "agent_001"). Do not inc
                 context += f"- {agent.name} ({agent.agent_id}): UNAVAILABLE (workload exceeded)\n"
         return context
     
+    def _create_shortlist_context(self, agents: Dict[str, Agent], max_workload: int, tickets: List[Ticket]) -> str:
+        """Create context string for the shortlisted candidates of the tickets."""
+        with self.metrics.timer("shortlist_seconds"):
+            candidates: Dict[str, Agent] = {}
+            for ticket in tickets:
+                for agent in self.shortlist.shortlist(ticket, agents, max_workload):
+                    candidates.setdefault(agent.agent_id, agent)
+        
+        context = f"Available Agents (Max workload per agent: {max_workload} tickets):\n"
+        for agent in candidates.values():
+            skills_str = ", ".join([f"{skill}: {score}" for skill, score in agent.skills.items()])
+            context += f"- {agent.name} ({agent.agent_id}): Skills: {skills_str}, Current Load: {agent.current_load}/{max_workload}, Experience: {agent.experience_level}\n"
+        
+        # The full roster would have listed every other agent too; estimate its
+        # size from the average candidate line
+        omitted = len(agents) - len(candidates)
+        self.metrics.increment("shortlist_prompts")
+        self.metrics.increment("shortlist_candidates", len(candidates))
+        if candidates and omitted > 0:
+            self.metrics.increment("shortlist_agents_omitted", omitted)
+            average_line = (len(context) - context.index("\n")) / len(candidates)
+            self.metrics.increment("shortlist_prompt_chars_saved", int(omitted * average_line))
+        return context
+    
     def _create_ticket_context(self, ticket: Ticket) -> str:
         """Create context string for a ticket."""
         return f"""
@@ -108,89 +302,8 @@ Ticket Details:
     
     def _create_rationale(self, ticket: Ticket, assigned_agent: Agent, all_agents: Dict[str, Agent]) -> str:
         """Create a rationale for the assignment."""
-        # Find relevant skills for this ticket
-        relevant_skills = self._extract_relevant_skills(ticket)
-        
-        skill_matches = []
-        for skill in relevant_skills:
-            score = assigned_agent.get_skill_score(skill)
-            if score > 0:
-                skill_matches.append(f"{skill} ({score})")
-        
-        rationale = f"Assigned to {assigned_agent.name} ({assigned_agent.agent_id})"
-        
-        if skill_matches:
-            rationale += f" based on their expertise in {', '.join(skill_matches)}"
-        
-        rationale += f", current workload of {assigned_agent.current_load}, and experience level of {assigned_agent.experience_level}."
-        
-        return rationale
+        return build_rationale(ticket, assigned_agent)
     
     def _extract_relevant_skills(self, ticket: Ticket) -> List[str]:
         """Extract relevant skill keywords from ticket title and description."""
-        text = f"{ticket.title} {ticket.description}".lower()
-        
-        # Map common IT terms to skill names
-        skill_mapping = {
-            'vpn': 'VPN_Troubleshooting',
-            'network': 'Networking',
-            'windows': 'Windows_OS',
-            'server': 'Windows_Server_2022',
-            'active directory': 'Active_Directory',
-            'email': 'Microsoft_365',
-            'outlook': 'Microsoft_365',
-            'hardware': 'Hardware_Diagnostics',
-            'laptop': 'Laptop_Repair',
-            'printer': 'Printer_Troubleshooting',
-            'security': 'Network_Security',
-            'firewall': 'Firewall_Configuration',
-            'database': 'Database_SQL',
-            'sql': 'Database_SQL',
-            'cloud': 'Cloud_AWS',
-            'azure': 'Cloud_Azure',
-            'aws': 'Cloud_AWS',
-            'linux': 'Linux_Administration',
-            'mac': 'Mac_OS',
-            'voip': 'Voice_VoIP',
-            'phone': 'Voice_VoIP',
-            'antivirus': 'Antivirus_Malware',
-            'malware': 'Antivirus_Malware',
-            'phishing': 'Phishing_Analysis',
-            'sharepoint': 'SharePoint_Online',
-            'powerbi': 'PowerBI_Tableau',
-            'tableau': 'PowerBI_Tableau',
-            'api': 'API_Troubleshooting',
-            'web': 'Web_Server_Apache_Nginx',
-            'dns': 'DNS_Configuration',
-            'ssl': 'SSL_Certificates',
-            'sso': 'Identity_Management',
-            'saml': 'Identity_Management',
-            'saas': 'SaaS_Integrations',
-            'endpoint': 'Endpoint_Management',
-            'mobile': 'Endpoint_Management',
-            'virtualization': 'Virtualization_VMware',
-            'vmware': 'Virtualization_VMware',
-            'docker': 'Kubernetes_Docker',
-            'kubernetes': 'Kubernetes_Docker',
-            'devops': 'DevOps_CI_CD',
-            'ci/cd': 'DevOps_CI_CD',
-            'python': 'Python_Scripting',
-            'powershell': 'PowerShell_Scripting',
-            'monitoring': 'Network_Monitoring',
-            'switch': 'Switch_Configuration',
-            'routing': 'Routing_Protocols',
-            'cisco': 'Cisco_IOS',
-            'audit': 'Security_Audits',
-            'siem': 'SIEM_Logging',
-            'etl': 'ETL_Processes',
-            'warehouse': 'Data_Warehousing',
-            'apache': 'Web_Server_Apache_Nginx',
-            'nginx': 'Web_Server_Apache_Nginx'
-        }
-        
-        relevant_skills = []
-        for keyword, skill in skill_mapping.items():
-            if keyword in text:
-                relevant_skills.append(skill)
-        
-        return relevant_skills
+        return extract_relevant_skills(ticket)
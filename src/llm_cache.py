@@ -0,0 +1,110 @@
+"""
+Persistent on-disk cache for LLM responses.
+"""
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class ResponseCache:
+    """SQLite-backed cache of LLM responses with TTL and size-based eviction."""
+    
+    def __init__(self, path: str, ttl_seconds: Optional[float] = 7 * 24 * 3600, max_entries: int = 100_000):
+        """Open (or create) the cache file and drop expired entries."""
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, response TEXT NOT NULL, "
+            "created_at REAL NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._connection.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses (last_access)")
+        self._connection.commit()
+        self._entries = 0
+        self.purge_expired()
+        self._entries = self._connection.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+    
+    @staticmethod
+    def make_key(prompt: str, **model_params) -> str:
+        """Hash a prompt and the model parameters into a cache key.
+        
+        Whitespace is collapsed so formatting-only changes still hit the cache.
+        """
+        normalized_prompt = re.sub(r"\s+", " ", prompt).strip()
+        payload = json.dumps({"prompt": normalized_prompt, "params": model_params}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response, or None on a miss or expired entry."""
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or self._is_expired(row[1], now):
+                if row is not None:
+                    self._connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self._connection.commit()
+                    self._entries -= 1
+                self.misses += 1
+                return None
+            self._connection.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+            self._connection.commit()
+            self.hits += 1
+            return row[0]
+    
+    def put(self, key: str, response: str):
+        """Store a response, evicting the least recently used entries over max_entries."""
+        now = time.time()
+        with self._lock:
+            existed = self._connection.execute(
+                "SELECT 1 FROM responses WHERE key = ?", (key,)
+            ).fetchone() is not None
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response, created_at, last_access) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            if not existed:
+                self._entries += 1
+            if self._entries > self.max_entries:
+                excess = self._entries - self.max_entries
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY last_access LIMIT ?)", (excess,)
+                )
+                self._entries -= excess
+            self._connection.commit()
+    
+    def purge_expired(self) -> int:
+        """Delete all entries older than the TTL; returns how many were removed."""
+        if self.ttl_seconds is None:
+            return 0
+        with self._lock:
+            cursor = self._connection.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            )
+            self._connection.commit()
+            self._entries = max(0, self._entries - cursor.rowcount)
+            return cursor.rowcount
+    
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        """Check whether an entry created at created_at is past the TTL."""
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+    
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current number of entries."""
+        return {"hits": self.hits, "misses": self.misses, "entries": self._entries}
+    
+    def close(self):
+        """Close the underlying SQLite connection."""
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,211 @@
+"""
+Deterministic, LLM-free ticket assignment using vectorized skill scoring.
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .models import Agent, Ticket, Assignment
+from .skills import build_rationale, extract_relevant_skills, known_skills
+
+
+class LocalScorer:
+    """Scores every ticket x agent pair with NumPy and assigns without an LLM.
+    
+    score = skill_weight * skill match - load_weight * load / cap
+            + experience_weight * experience
+    
+    The skill match is the agent's average skill level (0-1) over the skills
+    extracted from the ticket text.
+    """
+    
+    def __init__(self, skill_weight: float = 1.0, load_weight: float = 0.5,
+                 experience_weight: float = 0.2, confidence_margin: float = 0.1):
+        """Initialize the scorer with the weights of the scoring formula."""
+        self.skill_weight = skill_weight
+        self.load_weight = load_weight
+        self.experience_weight = experience_weight
+        self.confidence_margin = confidence_margin
+        self._roster_key: Optional[Tuple] = None
+        self.agent_ids: List[str] = []
+        self.skill_index: Dict[str, int] = {}
+        self.agent_skills = np.zeros((0, 0))
+        self.experience = np.zeros(0)
+    
+    def invalidate(self):
+        """Rebuild the index on next use (call after changing an agent's skills or experience)."""
+        self._roster_key = None
+    
+    def build_index(self, agents: Dict[str, Agent]):
+        """Build the agents x skills matrix (rebuilt when agents join or leave, or after invalidate()).
+        
+        Only the agent ids and the keyword skills are compared on each call,
+        so skill changes of an existing agent must be announced with invalidate().
+        """
+        keyword_skills = known_skills()
+        roster_key = (tuple(keyword_skills), tuple(agents))
+        if roster_key == self._roster_key:
+            return
+        
+        skill_names = sorted(set(keyword_skills).union(
+            skill for agent in agents.values() for skill in agent.skills
+        ))
+        self.skill_index = {skill: i for i, skill in enumerate(skill_names)}
+        self.agent_ids = list(agents.keys())
+        
+        self.agent_skills = np.zeros((len(self.agent_ids), len(skill_names)), dtype=np.float32)
+        for row, agent in enumerate(agents.values()):
+            for skill, score in agent.skills.items():
+                self.agent_skills[row, self.skill_index[skill]] = score / 10.0
+        
+        experience = np.array([agent.experience_level for agent in agents.values()], dtype=np.float32)
+        self.experience = experience / max(float(experience.max(initial=0)), 1.0)
+        self._roster_key = roster_key
+    
+    def ticket_skill_matrix(self, ticket_skills: List[List[str]]) -> np.ndarray:
+        """Build the tickets x skills matrix from each ticket's extracted skills."""
+        matrix = np.zeros((len(ticket_skills), len(self.skill_index)), dtype=np.float32)
+        for row, skills in enumerate(ticket_skills):
+            for skill in skills:
+                matrix[row, self.skill_index[skill]] = 1.0
+        return matrix
+    
+    def skill_match(self, ticket_skills: List[List[str]], agents: Dict[str, Agent]) -> np.ndarray:
+        """Average skill level (0-1) of every agent over each ticket's skills (tickets x agents)."""
+        self.build_index(agents)
+        skill_matrix = self.ticket_skill_matrix(ticket_skills)
+        skill_counts = np.maximum(skill_matrix.sum(axis=1, keepdims=True), 1.0)
+        return (skill_matrix @ self.agent_skills.T) / skill_counts
+    
+    def static_scores(self, ticket_skills: List[List[str]], agents: Dict[str, Agent]) -> np.ndarray:
+        """Score the load-independent part of every ticket x agent pair in one pass."""
+        skill_match = self.skill_match(ticket_skills, agents)
+        return self.skill_weight * skill_match + self.experience_weight * self.experience
+    
+    def _load_state(self, agents: Dict[str, Agent], max_workload: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Return current loads and a mask of agents that can take another ticket."""
+        loads = np.array([agents[agent_id].current_load for agent_id in self.agent_ids], dtype=np.float32)
+        available = np.array([agents[agent_id].is_available() for agent_id in self.agent_ids])
+        return loads, available & (loads < max_workload)
+    
+    def _pick(self, static_row: np.ndarray, loads: np.ndarray, open_mask: np.ndarray,
+              max_workload: int, with_margin: bool = True) -> Tuple[int, float]:
+        """Pick the best open agent for one ticket; returns (agent index, margin)."""
+        scores = static_row - self.load_weight * loads / max(max_workload, 1)
+        scores = np.where(open_mask, scores, -np.inf)
+        best = int(np.argmax(scores))
+        if not np.isfinite(scores[best]):
+            return -1, 0.0
+        if not with_margin or open_mask.sum() < 2:
+            return best, np.inf
+        runner_up = np.partition(scores, -2)[-2]
+        return best, float(scores[best] - runner_up)
+    
+    def _make_assignment(self, ticket: Ticket, agent: Agent, relevant_skills: List[str]) -> Assignment:
+        """Create an Assignment with the same rationale format as the LLM path."""
+        return Assignment(
+            ticket_id=ticket.ticket_id,
+            title=ticket.title,
+            assigned_agent_id=agent.agent_id,
+            rationale=build_rationale(ticket, agent, relevant_skills)
+        )
+    
+    def assign_with_confidence(self, tickets: List[Ticket], agents: Dict[str, Agent],
+                               total_tickets: int) -> List[Tuple[Optional[Assignment], bool]]:
+        """Assign a batch of tickets, flagging which decisions are confident.
+        
+        A decision is confident when the ticket mentions at least one known
+        skill and the best agent beats the runner-up by confidence_margin.
+        Loads picked earlier in the batch count against later tickets.
+        """
+        max_workload = int(total_tickets * 0.11)  # 11% threshold
+        ticket_skills = [extract_relevant_skills(ticket) for ticket in tickets]
+        static = self.static_scores(ticket_skills, agents)
+        loads, open_mask = self._load_state(agents, max_workload)
+        
+        results = []
+        for row, ticket in enumerate(tickets):
+            best, margin = self._pick(static[row], loads, open_mask, max_workload)
+            if best < 0:
+                results.append((None, False))
+                continue
+            loads[best] += 1
+            open_mask[best] = loads[best] < max_workload
+            agent = agents[self.agent_ids[best]]
+            confident = bool(ticket_skills[row]) and margin >= self.confidence_margin
+            results.append((self._make_assignment(ticket, agent, ticket_skills[row]), confident))
+        return results
+    
+    def assign_ticket(self, ticket: Ticket, agents: Dict[str, Agent], total_tickets: int) -> Assignment:
+        """Assign a ticket to the best available agent by local score."""
+        assignment, _ = self.assign_with_confidence([ticket], agents, total_tickets)[0]
+        if assignment is None:
+            raise ValueError("No available agents found")
+        return assignment
+    
+    def assign_tickets(self, tickets: List[Ticket], agents: Dict[str, Agent], total_tickets: int) -> List[Optional[Assignment]]:
+        """Assign several tickets at once; None where no agent has capacity."""
+        return [assignment for assignment, _ in self.assign_with_confidence(tickets, agents, total_tickets)]
+    
+    def assign_all(self, tickets: List[Ticket], agents: Dict[str, Agent], total_tickets: int) -> List[Optional[Assignment]]:
+        """Greedily assign all tickets in order, updating agent workload as it goes.
+        
+        The ticket x agent scores are computed in a single pass; each ticket
+        then only costs an O(agents) vector update, so large backlogs finish
+        in seconds. Tickets left without an open agent come back as None.
+        """
+        max_workload = int(total_tickets * 0.11)  # 11% threshold
+        ticket_skills = [extract_relevant_skills(ticket) for ticket in tickets]
+        static = self.static_scores(ticket_skills, agents)
+        loads, open_mask = self._load_state(agents, max_workload)
+        
+        assignments = []
+        for row, ticket in enumerate(tickets):
+            best, _ = self._pick(static[row], loads, open_mask, max_workload, with_margin=False)
+            if best < 0:
+                assignments.append(None)
+                continue
+            
+            agent = agents[self.agent_ids[best]]
+            assignments.append(self._make_assignment(ticket, agent, ticket_skills[row]))
+            loads[best] += 1
+            agent.current_load += 1
+            if agent.current_load >= max_workload:
+                agent.availability_status = "UNAVAILABLE"
+                open_mask[best] = False
+        return assignments
+
+
+class HybridAssigner:
+    """Uses local scoring as a pre-filter and sends only unsure tickets to the LLM."""
+    
+    def __init__(self, scorer: LocalScorer, llm_assigner):
+        """Initialize with a local scorer and an LLMAssigner for unsure tickets."""
+        self.scorer = scorer
+        self.llm_assigner = llm_assigner
+        self.local_decisions = 0
+        self.llm_decisions = 0
+    
+    def assign_ticket(self, ticket: Ticket, agents: Dict[str, Agent], total_tickets: int) -> Assignment:
+        """Assign locally when confident, otherwise ask the LLM."""
+        assignment, confident = self.scorer.assign_with_confidence([ticket], agents, total_tickets)[0]
+        if assignment is not None and confident:
+            self.local_decisions += 1
+            return assignment
+        self.llm_decisions += 1
+        return self.llm_assigner.assign_ticket(ticket, agents, total_tickets)
+    
+    def assign_tickets(self, tickets: List[Ticket], agents: Dict[str, Agent], total_tickets: int) -> List[Optional[Assignment]]:
+        """Assign a batch locally and forward the low-confidence or tied tickets to the LLM."""
+        local_results = self.scorer.assign_with_confidence(tickets, agents, total_tickets)
+        results: List[Optional[Assignment]] = [
+            assignment if confident else None for assignment, confident in local_results
+        ]
+        unsure = [ticket for ticket, result in zip(tickets, results) if result is None]
+        self.local_decisions += len(tickets) - len(unsure)
+        
+        if len(unsure) > 1:
+            llm_results = self.llm_assigner.assign_tickets(unsure, agents, total_tickets)
+            self.llm_decisions += sum(result is not None for result in llm_results)
+            remaining = iter(llm_results)
+            results = [result if result is not None else next(remaining) for result in results]
+        # A single unsure ticket (or any None left) is retried per ticket by the caller
+        return results
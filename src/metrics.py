@@ -0,0 +1,215 @@
+"""
+Run instrumentation: counters, latency histograms and report export.
+"""
+import bisect
+import json
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+# Histogram bucket upper bounds
+SECONDS_BUCKETS = (0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000)
+
+# Hook signature: hook(kind, name, value, labels) with kind "counter" or "histogram"
+MetricsHook = Callable[[str, str, float, Dict[str, str]], None]
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+class Histogram:
+    """Fixed-bucket histogram with count, sum, min and max."""
+    
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    def observe(self, value: float):
+        """Record one value."""
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    def merge(self, other: "Histogram"):
+        """Add the values recorded by another histogram with the same buckets."""
+        self.bucket_counts = [mine + theirs for mine, theirs in zip(self.bucket_counts, other.bucket_counts)]
+        self.count += other.count
+        self.total += other.total
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+    
+    def quantile(self, fraction: float) -> Optional[float]:
+        """Estimate a quantile as the upper bound of the bucket that contains it."""
+        if not self.count:
+            return None
+        rank = fraction * self.count
+        seen = 0
+        for bound, bucket_count in zip(self.buckets, self.bucket_counts):
+            seen += bucket_count
+            if seen >= rank:
+                return min(bound, self.max)
+        return self.max
+    
+    def to_dict(self) -> Dict:
+        """Summary and cumulative bucket counts as a JSON-friendly dict."""
+        cumulative = 0
+        buckets = {}
+        for bound, bucket_count in zip(self.buckets, self.bucket_counts):
+            cumulative += bucket_count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.min,
+            "max": self.max,
+            "mean": self.total / self.count if self.count else None,
+            "p50": self.quantile(0.50),
+            "p95": self.quantile(0.95),
+            "p99": self.quantile(0.99),
+            "buckets": buckets
+        }
+
+
+class Metrics:
+    """Thread-safe collection of named counters and histograms.
+    
+    Components record into a shared instance (pass the same Metrics to the
+    DataLoader, LLMAssigner and TicketProcessor); the run report is then
+    exported with to_dict / to_prometheus / write_report. Hooks added with
+    add_hook see every recorded value, e.g. to forward them to another
+    monitoring system.
+    """
+    
+    def __init__(self):
+        self.counters: Dict[_Key, float] = {}
+        self.histograms: Dict[_Key, Histogram] = {}
+        self.hooks: List[MetricsHook] = []
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+    
+    def add_hook(self, hook: MetricsHook):
+        """Call hook(kind, name, value, labels) for every recorded value."""
+        self.hooks.append(hook)
+    
+    def increment(self, name: str, amount: float = 1, **labels: str):
+        """Add amount to a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+        for hook in self.hooks:
+            hook("counter", name, amount, labels)
+    
+    def observe(self, name: str, value: float, buckets: Sequence[float] = SECONDS_BUCKETS, **labels: str):
+        """Record a value in a histogram (created with buckets on first use)."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+        for hook in self.hooks:
+            hook("histogram", name, value, labels)
+    
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        """Time the enclosed block into the histogram name (in seconds)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+    
+    def counter(self, name: str, **labels: str) -> float:
+        """Current value of a counter (0 if never incremented)."""
+        return self.counters.get((name, tuple(sorted(labels.items()))), 0)
+    
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        """Histogram recorded under name (None if nothing was observed)."""
+        return self.histograms.get((name, tuple(sorted(labels.items()))))
+    
+    def take(self) -> Tuple[Dict[_Key, float], Dict[_Key, Histogram]]:
+        """Hand over everything recorded so far and start empty (e.g. to ship a worker's metrics to the parent)."""
+        with self._lock:
+            taken = (self.counters, self.histograms)
+            self.counters, self.histograms = {}, {}
+        return taken
+    
+    def merge(self, counters: Dict[_Key, float], histograms: Dict[_Key, Histogram]):
+        """Add counters and histograms recorded elsewhere (see take); hooks are not called again."""
+        with self._lock:
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+            for key, histogram in histograms.items():
+                if key in self.histograms:
+                    self.histograms[key].merge(histogram)
+                else:
+                    self.histograms[key] = histogram
+    
+    def to_dict(self) -> Dict:
+        """Run report as a JSON-friendly dict."""
+        with self._lock:
+            return {
+                "started_at": self.started_at,
+                "elapsed_seconds": time.time() - self.started_at,
+                "counters": {_format_key(key): value for key, value in sorted(self.counters.items())},
+                "histograms": {_format_key(key): histogram.to_dict() for key, histogram in sorted(self.histograms.items())}
+            }
+    
+    def to_prometheus(self, prefix: str = "ticket_assignment") -> str:
+        """Run report in the Prometheus text exposition format."""
+        lines = []
+        with self._lock:
+            typed = set()
+            for (name, labels), value in sorted(self.counters.items()):
+                metric = f"{prefix}_{name}_total"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} counter")
+                lines.append(f"{metric}{_format_labels(labels)} {value}")
+            for (name, labels), histogram in sorted(self.histograms.items()):
+                metric = f"{prefix}_{name}"
+                if metric not in typed:
+                    typed.add(metric)
+                    lines.append(f"# TYPE {metric} histogram")
+                cumulative = 0
+                for bound, bucket_count in zip(histogram.buckets, histogram.bucket_counts):
+                    cumulative += bucket_count
+                    lines.append(f"{metric}_bucket{_format_labels(labels + (('le', str(bound)),))} {cumulative}")
+                lines.append(f"{metric}_bucket{_format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.total}")
+                lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+    
+    def write_report(self, path: str):
+        """Write the run report: Prometheus text for .prom/.txt paths, JSON otherwise."""
+        with open(path, 'w', encoding='utf-8') as file:
+            if path.endswith(('.prom', '.txt')):
+                file.write(self.to_prometheus())
+            else:
+                json.dump(self.to_dict(), file, indent=2)
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    """Render labels as {name="value",...} (empty string without labels)."""
+    if not labels:
+        return ""
+    rendered = []
+    for name, value in labels:
+        escaped = str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        rendered.append(f'{name}="{escaped}"')
+    return "{" + ",".join(rendered) + "}"
+
+
+def _format_key(key: _Key) -> str:
+    """Report key for a metric: the name, followed by its labels if any."""
+    name, labels = key
+    return name + _format_labels(labels)
@@ -1,14 +1,50 @@
 """
 Data models for agents and tickets.
 """
+import json
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Optional, Tuple
 from datetime import datetime
 
 
+class SkillVocabulary:
+    """Interns skill names so that all agents share one string per skill."""
+    
+    def __init__(self):
+        self.names: Dict[str, str] = {}
+    
+    def intern(self, name: str) -> str:
+        """Return the shared copy of a skill name, adding it to the vocabulary if needed."""
+        return self.names.setdefault(name, name)
+
+
+SKILL_VOCABULARY = SkillVocabulary()
+
+
+class SkillLevels(dict):
+    """Skill name -> level mapping whose names are interned in SKILL_VOCABULARY.
+    
+    Agents loaded one record at a time would otherwise each hold their own
+    copy of every skill name. It stays a plain dict underneath, so
+    get_skill_score is a single hash lookup.
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self, skills: Optional[Dict[str, int]] = None):
+        super().__init__((SKILL_VOCABULARY.intern(name), level) for name, level in (skills or {}).items())
+    
+    def __reduce__(self):
+        # Re-intern the names in the process that unpickles it
+        return (SkillLevels, (dict(self),))
+
+
 @dataclass
 class Agent:
     """Represents a support agent with their skills and availability."""
+    __slots__ = ("agent_id", "name", "skills", "current_load", "availability_status", "experience_level")
     agent_id: str
     name: str
     skills: Dict[str, int]
@@ -16,6 +52,11 @@ class Agent:
     availability_status: str
     experience_level: int
     
+    def __post_init__(self):
+        """Store skills compactly (see SkillLevels)."""
+        if not isinstance(self.skills, SkillLevels):
+            self.skills = SkillLevels(self.skills)
+    
     def get_skill_score(self, skill_name: str) -> int:
         """Get skill score for a specific skill, returns 0 if skill doesn't exist."""
         return self.skills.get(skill_name, 0)
@@ -25,22 +66,105 @@ class Agent:
         return self.availability_status == "Available"
 
 
-@dataclass
+class RecordFile:
+    """Random access to JSON records of a dataset file by byte offset.
+    
+    Lazily loaded tickets keep (offset, length) of their record here instead
+    of the description text. A ticket's description is read several times
+    in a row (skill extraction, shortlist, prompt), so the last cache_size
+    decoded records are kept; memory stays bounded by that many records
+    whatever the file size. Reads are thread-safe; pickling (e.g. for
+    worker processes) reopens the file by path.
+    """
+    
+    def __init__(self, path: str, cache_size: int = 256):
+        self.path = path
+        self.cache_size = cache_size
+        self._file = None
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[int, Dict]" = OrderedDict()
+    
+    def read(self, offset: int, length: int) -> Dict:
+        """Decode the JSON record stored at offset (the returned dict is shared; don't modify it)."""
+        with self._lock:
+            record = self._cache.get(offset)
+            if record is not None:
+                self._cache.move_to_end(offset)
+                return record
+            if self._file is None:
+                self._file = open(self.path, 'rb')
+            self._file.seek(offset)
+            data = self._file.read(length)
+        record = json.loads(data)
+        if self.cache_size > 0:
+            with self._lock:
+                self._cache[offset] = record
+                if len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+        return record
+    
+    def close(self):
+        """Close the underlying file (reopened on the next read)."""
+        with self._lock:
+            self._cache.clear()
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+    
+    def __reduce__(self):
+        return (RecordFile, (self.path, self.cache_size))
+
+
 class Ticket:
-    """Represents a support ticket."""
-    ticket_id: str
-    title: str
-    description: str
-    creation_timestamp: int
+    """Represents a support ticket.
+    
+    The description is either held in memory or, for tickets loaded with
+    lazy descriptions, read back from the dataset file on access.
+    """
+    
+    __slots__ = ("ticket_id", "title", "creation_timestamp", "_description", "_record")
+    
+    def __init__(self, ticket_id: str, title: str, description: Optional[str], creation_timestamp: int,
+                 record: Optional[Tuple[RecordFile, int, int]] = None):
+        """Create a ticket; record is (file, offset, length) of a lazily loaded description."""
+        self.ticket_id = ticket_id
+        self.title = title
+        self.creation_timestamp = creation_timestamp
+        self._description = description
+        self._record = record
+    
+    @property
+    def description(self) -> str:
+        """Ticket description (read from the dataset file if loaded lazily)."""
+        if self._description is not None or self._record is None:
+            return self._description
+        record_file, offset, length = self._record
+        return record_file.read(offset, length)['description']
+    
+    @description.setter
+    def description(self, value: str):
+        self._description = value
+        self._record = None
     
     def get_creation_datetime(self) -> datetime:
         """Convert timestamp to datetime object."""
         return datetime.fromtimestamp(self.creation_timestamp)
+    
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Ticket):
+            return NotImplemented
+        return (self.ticket_id, self.title, self.description, self.creation_timestamp) == \
+            (other.ticket_id, other.title, other.description, other.creation_timestamp)
+    
+    def __repr__(self) -> str:
+        return (f"Ticket(ticket_id={self.ticket_id!r}, title={self.title!r}, "
+                f"description={self.description!r}, creation_timestamp={self.creation_timestamp!r})")
 
 
 @dataclass
 class Assignment:
     """Represents a ticket assignment to an agent."""
+    __slots__ = ("ticket_id", "title", "assigned_agent_id", "rationale")
     ticket_id: str
     title: str
     assigned_agent_id: str
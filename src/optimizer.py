@@ -0,0 +1,193 @@
+"""
+Global capacity-constrained assignment planning.
+"""
+from typing import Dict, List, Optional
+import numpy as np
+from .local_scorer import LocalScorer
+from .models import Agent, Ticket
+from .skills import extract_relevant_skills
+
+
+def solve_transportation(profit: np.ndarray, capacity: np.ndarray, final_epsilon: float = 1e-4,
+                         scaling_factor: float = 5.0) -> np.ndarray:
+    """Assign each row to a column maximizing total profit under column capacities.
+    
+    This is the transportation problem (min-cost flow from tickets with supply
+    1 to agents with capacity c_j). It is solved with a vectorized auction
+    algorithm with epsilon scaling: in every round all unassigned tickets bid
+    for their best agent at once, each agent keeps its c_j highest bids, and
+    an agent's price is the lowest bid it holds once it is full. When there
+    is more capacity than tickets, reverse rounds at the end of each phase
+    bring every agent left with spare capacity down to the lowest price. The
+    result is within len(profit) * final_epsilon of the optimal total profit.
+    
+    Returns the column index per row, or -1 for rows left over when the total
+    capacity is smaller than the number of rows.
+    """
+    num_rows = profit.shape[0]
+    capacity = np.asarray(capacity, dtype=np.int64)
+    # Columns without capacity never take a row (and would never get a finite price)
+    open_columns = np.flatnonzero(capacity > 0)
+    if num_rows == 0 or open_columns.size == 0:
+        return np.full(num_rows, -1, dtype=np.int64)
+    profit = np.asarray(profit, dtype=np.float64)[:, open_columns]
+    capacity = capacity[open_columns]
+    
+    # A dummy column with the lowest profit absorbs rows that cannot be served
+    deficit = num_rows - int(capacity.sum())
+    if deficit > 0:
+        value_range = float(profit.max() - profit.min())
+        dummy = np.full((num_rows, 1), profit.min() - value_range - 1.0)
+        profit = np.hstack([profit, dummy])
+        capacity = np.append(capacity, deficit)
+    
+    prices = np.zeros(profit.shape[1])
+    epsilon = max(float(profit.max() - profit.min()) / scaling_factor, final_epsilon)
+    while True:
+        assigned = _auction_phase(profit, capacity, prices, epsilon)
+        if epsilon <= final_epsilon:
+            break
+        epsilon = max(epsilon / scaling_factor, final_epsilon)
+    
+    served = assigned < open_columns.size
+    return np.where(served, open_columns[np.minimum(assigned, open_columns.size - 1)], -1)
+
+
+def _auction_phase(profit: np.ndarray, capacity: np.ndarray, prices: np.ndarray,
+                   epsilon: float) -> np.ndarray:
+    """Run one auction phase at a fixed epsilon; updates prices in place."""
+    num_rows, num_cols = profit.shape
+    assigned = np.full(num_rows, -1, dtype=np.int64)
+    _forward_rounds(profit, capacity, prices, epsilon, assigned)
+    _reverse_rounds(profit, capacity, prices, epsilon, assigned)
+    return assigned
+
+
+def _forward_rounds(profit: np.ndarray, capacity: np.ndarray, prices: np.ndarray, epsilon: float,
+                    assigned: np.ndarray):
+    """Let all unassigned rows bid at once, round after round, until every row is held."""
+    num_rows, num_cols = profit.shape
+    bids = np.zeros(num_rows)
+    rows = np.arange(num_rows)
+    
+    unassigned = rows
+    while unassigned.size:
+        values = profit[unassigned] - prices
+        best = np.argmax(values, axis=1)
+        best_value = values[np.arange(unassigned.size), best]
+        if num_cols > 1:
+            second_value = np.partition(values, -2, axis=1)[:, -2]
+        else:
+            second_value = best_value
+        assigned[unassigned] = best
+        bids[unassigned] = prices[best] + (best_value - second_value) + epsilon
+        
+        # Every agent keeps its highest bids up to capacity
+        holders = rows[assigned >= 0]
+        order = np.lexsort((-bids[holders], assigned[holders]))
+        holders = holders[order]
+        columns = assigned[holders]
+        starts = np.searchsorted(columns, np.arange(num_cols))
+        rank = np.arange(holders.size) - starts[columns]
+        rejected = holders[rank >= capacity[columns]]
+        assigned[rejected] = -1
+        
+        # A full agent's price is the lowest bid it still holds
+        kept = holders[rank < capacity[columns]]
+        counts = np.bincount(assigned[kept], minlength=num_cols)
+        lowest = np.full(num_cols, np.inf)
+        np.minimum.at(lowest, assigned[kept], bids[kept])
+        full = counts >= capacity
+        prices[full] = lowest[full]
+        
+        unassigned = rejected
+
+
+def _reverse_rounds(profit: np.ndarray, capacity: np.ndarray, prices: np.ndarray, epsilon: float,
+                    assigned: np.ndarray):
+    """Lower the prices of agents left with spare capacity until they are all at the lowest price.
+    
+    Forward bidding only raises prices, so an agent that was full earlier
+    (in this phase or the previous one) can end with spare capacity and a
+    price that keeps tickets away from it; the plan is then not optimal. In
+    a reverse round such an agent lowers its price just enough to win the
+    tickets that gain most from moving to it (up to its spare capacity),
+    without leaving any other ticket more than epsilon better off at the
+    new price. The agents those tickets leave may then have spare capacity
+    in turn.
+    """
+    num_rows, num_cols = profit.shape
+    rows = np.arange(num_rows)
+    floor = float(prices.min())
+    counts = np.bincount(assigned, minlength=num_cols)
+    while True:
+        active = np.flatnonzero((counts < capacity) & (prices > floor))
+        if not active.size:
+            return
+        for column in active:
+            free = int(capacity[column] - counts[column])
+            surplus = profit[rows, assigned] - prices[assigned]
+            gain = profit[:, column] - surplus
+            gain[assigned == column] = -np.inf
+            take = min(free, int(np.count_nonzero(gain > floor + epsilon)))
+            if take == 0:
+                prices[column] = floor
+                continue
+            order = np.argsort(-gain, kind="stable")
+            runner_up = gain[order[take]] if take < num_rows else -np.inf
+            movers = order[:take]
+            np.subtract.at(counts, assigned[movers], 1)
+            assigned[movers] = column
+            counts[column] += take
+            prices[column] = max(floor, runner_up - epsilon)
+
+
+class CapacityPlanner:
+    """Plans all tickets at once instead of greedily in arrival order."""
+    
+    def __init__(self, scorer: Optional[LocalScorer] = None, final_epsilon: float = 1e-4):
+        """Initialize the planner with the scorer that provides ticket x agent profits."""
+        self.scorer = scorer or LocalScorer()
+        self.final_epsilon = final_epsilon
+    
+    def plan(self, tickets: List[Ticket], agents: Dict[str, Agent], total_tickets: int) -> List[Optional[str]]:
+        """Return the planned agent_id per ticket (None if no capacity is left).
+        
+        Each available agent can take up to the 11% cap minus its current load.
+        The profit of a pair is the local score at the agent's current load,
+        so the plan is optimal for the whole ticket set, not the arrival order.
+        """
+        max_workload = int(total_tickets * 0.11)  # 11% threshold
+        capacity = {agent_id: max(0, max_workload - agent.current_load) for agent_id, agent in agents.items()}
+        return self._solve(tickets, agents, max_workload, capacity)
+    
+    def plan_overflow(self, tickets: List[Ticket], agents: Dict[str, Agent], total_tickets: int,
+                      planned_counts: Dict[str, int]) -> List[Optional[str]]:
+        """Place the tickets plan() left over, once every agent's load is at the cap.
+        
+        These tickets push their agents over the cap whatever happens; each
+        available agent still takes at most the cap in tickets from this run
+        (the cap minus planned_counts), so the overflow is spread by score
+        instead of piling up on one agent. None if even that is exhausted.
+        """
+        max_workload = int(total_tickets * 0.11)  # 11% threshold
+        capacity = {agent_id: max(0, max_workload - planned_counts.get(agent_id, 0)) for agent_id in agents}
+        return self._solve(tickets, agents, max_workload, capacity)
+    
+    def _solve(self, tickets: List[Ticket], agents: Dict[str, Agent], max_workload: int,
+               capacity: Dict[str, int]) -> List[Optional[str]]:
+        """Solve one transportation problem over the available agents with the given capacities."""
+        ticket_skills = [extract_relevant_skills(ticket) for ticket in tickets]
+        static = self.scorer.static_scores(ticket_skills, agents)
+        
+        agent_list = [agents[agent_id] for agent_id in self.scorer.agent_ids]
+        loads = np.array([agent.current_load for agent in agent_list], dtype=np.float64)
+        capacity = np.array([capacity[agent.agent_id] if agent.is_available() else 0 for agent in agent_list])
+        profit = static - self.scorer.load_weight * loads / max(max_workload, 1)
+        
+        open_columns = np.flatnonzero(capacity > 0)
+        columns = solve_transportation(profit[:, open_columns], capacity[open_columns], self.final_epsilon)
+        return [
+            self.scorer.agent_ids[open_columns[column]] if column >= 0 else None
+            for column in columns
+        ]
@@ -0,0 +1,77 @@
+"""
+Incremental writers for assignment output.
+"""
+import json
+import sys
+from typing import Dict, Iterator, Optional, TextIO
+from .models import Assignment
+
+
+def assignment_to_dict(assignment: Assignment) -> Dict[str, str]:
+    """Convert an assignment to its output record."""
+    return {
+        "ticket_id": assignment.ticket_id,
+        "title": assignment.title,
+        "assigned_agent_id": assignment.assigned_agent_id,
+        "rationale": assignment.rationale
+    }
+
+
+def read_assignments(path: str) -> Iterator[Assignment]:
+    """Read back the assignments written by AssignmentWriter (JSON envelope or JSONL)."""
+    with open(path, 'r', encoding='utf-8') as file:
+        if path.endswith('.jsonl'):
+            records = (json.loads(line) for line in file if line.strip())
+        else:
+            records = iter(json.load(file)["sample_output"])
+        for record in records:
+            yield Assignment(**record)
+
+
+class AssignmentWriter:
+    """Writes assignments to disk as they are produced.
+    
+    Paths ending in .jsonl get one JSON record per line. Any other path gets
+    the {"sample_output": [...]} envelope of output_result.json, written item
+    by item; the file is byte-for-byte what json.dump(indent=2) would produce
+    once the writer is closed. The path "-" writes JSONL to stdout (or to
+    stream, when given).
+    """
+    
+    def __init__(self, output_path: str, stream: Optional[TextIO] = None):
+        """Open the output file and write the envelope header if needed."""
+        self.output_path = output_path
+        self.jsonl = output_path.endswith('.jsonl') or output_path == "-"
+        self.count = 0
+        self._stdout = output_path == "-"
+        self._file = (stream or sys.stdout) if self._stdout else open(output_path, 'w', encoding='utf-8')
+        if not self.jsonl:
+            self._file.write('{\n  "sample_output": [')
+    
+    def write(self, assignment: Assignment):
+        """Append one assignment and flush it to disk."""
+        record = assignment_to_dict(assignment)
+        if self.jsonl:
+            self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        else:
+            item = json.dumps(record, indent=2, ensure_ascii=False).replace("\n", "\n    ")
+            self._file.write(("," if self.count else "") + "\n    " + item)
+        self._file.flush()
+        self.count += 1
+    
+    def close(self):
+        """Finish the envelope (if any) and close the file."""
+        if self._file.closed:
+            return
+        if self._stdout:
+            self._file.flush()
+            return
+        if not self.jsonl:
+            self._file.write("\n  ]\n}" if self.count else "]\n}")
+        self._file.close()
+    
+    def __enter__(self) -> "AssignmentWriter":
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
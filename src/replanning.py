@@ -0,0 +1,66 @@
+"""
+Index of current assignments for incremental re-planning after agent updates.
+"""
+from typing import Dict, Iterable, List, Optional, Set
+from .models import Ticket, Assignment
+from .skills import extract_relevant_skills
+
+
+class AssignmentIndex:
+    """Maps agents to the positions of the tickets they hold, and skills to tickets.
+    
+    Wraps the assignment list of a run (assignments[i] belongs to
+    tickets[i]) and keeps both in sync when an assignment is replaced, so
+    re-planning after an agent update touches only the affected tickets.
+    The agent index is built in one pass over the assignments; the skill
+    index (needed to find tickets a new agent might take over) is built on
+    first use.
+    """
+    
+    def __init__(self, tickets: List[Ticket], assignments: List[Assignment]):
+        """Index the assignments of a finished run."""
+        if len(tickets) != len(assignments):
+            raise ValueError("Every ticket needs exactly one assignment to be re-planned")
+        self.tickets = tickets
+        self.assignments = assignments
+        self._held: Dict[str, Set[int]] = {}
+        for position, assignment in enumerate(assignments):
+            self._held.setdefault(assignment.assigned_agent_id, set()).add(position)
+        self._ticket_skills: Optional[List[List[str]]] = None
+        self._by_skill: Dict[str, List[int]] = {}
+    
+    def held_by(self, agent_id: str) -> List[int]:
+        """Positions of the tickets an agent holds, in ticket order."""
+        return sorted(self._held.get(agent_id, ()))
+    
+    def agent_at(self, position: int) -> str:
+        """Agent currently holding the ticket at position."""
+        return self.assignments[position].assigned_agent_id
+    
+    def replace(self, position: int, assignment: Assignment):
+        """Swap in a new assignment for the ticket at position."""
+        self._held.get(self.agent_at(position), set()).discard(position)
+        self._held.setdefault(assignment.assigned_agent_id, set()).add(position)
+        self.assignments[position] = assignment
+    
+    def ticket_skills(self, position: int) -> List[str]:
+        """Skills extracted from the ticket at position."""
+        self._index_skills()
+        return self._ticket_skills[position]
+    
+    def matching(self, skills: Iterable[str]) -> List[int]:
+        """Positions of tickets that mention any of the skills, in ticket order."""
+        self._index_skills()
+        positions = set()
+        for skill in skills:
+            positions.update(self._by_skill.get(skill, ()))
+        return sorted(positions)
+    
+    def _index_skills(self):
+        """Extract every ticket's skills once and index tickets by skill."""
+        if self._ticket_skills is not None:
+            return
+        self._ticket_skills = [extract_relevant_skills(ticket) for ticket in self.tickets]
+        for position, skills in enumerate(self._ticket_skills):
+            for skill in skills:
+                self._by_skill.setdefault(skill, []).append(position)
@@ -0,0 +1,189 @@
+"""
+Rate-limit-aware scheduling of LLM requests: pacing, retries and a circuit breaker.
+"""
+import random
+import threading
+import time
+from typing import Any, Callable, Optional, Tuple
+from .metrics import Metrics
+
+
+# Status codes and exception names of errors that may succeed on retry; anything else is permanent
+TRANSIENT_STATUS_CODES = (408, 409, 429)
+TRANSIENT_ERRORS = ("RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError",
+                    "ModelThrottledException")
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of sending a request while the API is considered degraded."""
+
+
+def is_transient(error: BaseException) -> bool:
+    """Check whether a request error may succeed on retry (rate limits, timeouts, 5xx, lost connections).
+    
+    Looks through the exception chain, since the strands model wraps the
+    OpenAI client errors. Errors without a known transient signal, such as
+    bugs in our own response handling, are permanent.
+    """
+    while error is not None:
+        status = getattr(error, "status_code", None)
+        if isinstance(status, int):
+            return status in TRANSIENT_STATUS_CODES or status >= 500
+        if isinstance(error, (TimeoutError, ConnectionError)) or type(error).__name__ in TRANSIENT_ERRORS:
+            return True
+        error = error.__cause__
+    return False
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled at rate_per_minute, holding up to one minute's worth."""
+    
+    def __init__(self, rate_per_minute: float):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = float(rate_per_minute)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def reserve(self, amount: float) -> float:
+        """Take amount tokens and return how long to wait until they are covered.
+        
+        The balance may go negative, so concurrent callers queue up behind
+        each other instead of racing for the same refill.
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            self.tokens -= min(amount, self.capacity)
+            return max(0.0, -self.tokens / self.rate)
+    
+    def refund(self, amount: float):
+        """Give back tokens that were reserved but not used."""
+        with self._lock:
+            self.tokens = min(self.capacity, self.tokens + amount)
+
+
+class RequestScheduler:
+    """Paces LLM requests under provider limits, retries transient errors and trips a breaker.
+    
+    Requests wait on token buckets for requests/min and tokens/min (0
+    disables a limit). The token cost of a request is estimated up front
+    as its prompt tokens plus max_tokens, as providers count it against
+    the limit, and corrected once the real usage is known. Transient errors
+    are retried up to max_retries times per request with exponential
+    backoff and full jitter.
+    
+    After failure_threshold consecutive failed attempts the circuit opens:
+    requests raise CircuitOpenError right away (callers switch to local
+    scoring) until cooldown_seconds have passed, then one trial request is
+    let through and closes the circuit again if it succeeds.
+    """
+    
+    def __init__(self, requests_per_minute: float = 0, tokens_per_minute: float = 0,
+                 max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 30.0,
+                 failure_threshold: int = 5, cooldown_seconds: float = 30.0,
+                 metrics: Optional[Metrics] = None, sleep: Callable[[float], None] = time.sleep):
+        """Configure limits, retries and the circuit breaker (sleep is replaceable for benchmarks)."""
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.metrics = metrics or Metrics()
+        self.sleep = sleep
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self._rng = random.Random()
+    
+    def _before_request(self):
+        """Raise CircuitOpenError unless the circuit lets this request through."""
+        with self._lock:
+            if self.state == CLOSED:
+                return
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self.state = HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+        self.metrics.increment("circuit_rejections")
+        raise CircuitOpenError("LLM API circuit is open after repeated failures")
+    
+    def _record(self, success: bool):
+        """Update the circuit breaker with the outcome of one attempt."""
+        with self._lock:
+            if success:
+                self._failures = 0
+                if self.state != CLOSED:
+                    self.metrics.increment("circuit_closed")
+                self.state = CLOSED
+                return
+            self._failures += 1
+            if self.state == HALF_OPEN or (self.state == CLOSED and self._failures >= self.failure_threshold):
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self.metrics.increment("circuit_opened")
+    
+    def _pace(self, estimated_tokens: int):
+        """Wait until both buckets cover one more request of estimated_tokens."""
+        wait = 0.0
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(estimated_tokens))
+        if wait > 0:
+            self.metrics.observe("rate_limit_wait_seconds", wait)
+            self.sleep(wait)
+    
+    def backoff(self, attempt: int) -> float:
+        """Delay before retry number attempt (1-based): full jitter over an exponential cap."""
+        return self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+    
+    def call(self, request: Callable[[], Any], estimated_tokens: int = 0,
+             usage: Optional[Callable[[Any], Tuple[int, int]]] = None) -> Any:
+        """Run request under the limits, retrying transient errors.
+        
+        usage maps the result to (input, output) tokens, used to refund the
+        part of the token estimate that was not spent. Raises the last error
+        once the retry budget is used up, and CircuitOpenError while the
+        circuit is open.
+        """
+        attempt = 0
+        while True:
+            self._before_request()
+            self._pace(estimated_tokens)
+            try:
+                result = request()
+            except Exception as e:
+                transient = is_transient(e)
+                # A permanent error still means the API answered
+                self._record(not transient)
+                attempt += 1
+                if not transient:
+                    raise
+                if attempt > self.max_retries:
+                    self.metrics.increment("llm_retries_exhausted")
+                    raise
+                self.metrics.increment("llm_retries")
+                self.sleep(self.backoff(attempt))
+                continue
+            
+            self._record(True)
+            if usage is not None and self.tokens is not None:
+                spent = sum(usage(result))
+                if 0 < spent < estimated_tokens:
+                    self.tokens.refund(estimated_tokens - spent)
+            return result
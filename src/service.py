@@ -0,0 +1,352 @@
+"""
+Ticket sources, micro-batching and open-ticket tracking for the long-running assignment service.
+"""
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
+from .agent_pool import AgentPool
+from .metrics import Metrics
+from .models import Agent, Assignment, Ticket
+from .output_writer import AssignmentWriter
+from .validation import check_ticket
+
+
+# Values of a record's "event" field that close an open ticket
+CLOSE_EVENTS = ("close", "closed", "resolved")
+
+
+def is_close_event(record: Dict) -> bool:
+    """Check whether a queue record closes a ticket instead of opening one."""
+    return str(record.get("event", "")).lower() in CLOSE_EVENTS
+
+
+class TicketQueue:
+    """Thread-safe queue of incoming records, stamped with their arrival time.
+    
+    Sources (a followed JSONL file, stdin, the HTTP endpoint) run in their
+    own threads and put records here; the service takes them out in
+    micro-batches. Lines that are not valid JSON objects are counted as
+    service_rejected and skipped.
+    """
+    
+    def __init__(self, metrics: Optional[Metrics] = None):
+        self.metrics = metrics or Metrics()
+        self.stop = threading.Event()
+        self._queue: "queue.Queue[Tuple[Dict, float]]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._running_sources = 0
+        # Set while a listener (the HTTP endpoint) may still queue records
+        self.listening = False
+    
+    def put(self, item: Union[str, Dict]) -> bool:
+        """Queue a record (or a JSON line); returns False if it was rejected."""
+        record = item
+        if isinstance(item, str):
+            if not item.strip():
+                return False
+            try:
+                record = json.loads(item)
+            except ValueError:
+                record = None
+        if not isinstance(record, dict):
+            self.metrics.increment("service_rejected", reason="not a JSON object")
+            print(f"Skipping queue entry that is not a JSON object: {str(item).strip()[:80]}")
+            return False
+        self._queue.put((record, time.monotonic()))
+        return True
+    
+    def feed(self, items: Iterable[Union[str, Dict]]) -> threading.Thread:
+        """Read a source in a background thread until it ends or the queue is stopped.
+        
+        The queue counts as exhausted once every source has ended and nothing
+        is left in it; a followed file never ends, so it keeps the service
+        running, as does the HTTP endpoint.
+        """
+        with self._lock:
+            self._running_sources += 1
+        
+        def run():
+            try:
+                for item in items:
+                    if self.stop.is_set():
+                        break
+                    self.put(item)
+            finally:
+                with self._lock:
+                    self._running_sources -= 1
+        
+        thread = threading.Thread(target=run, name="ticket-source", daemon=True)
+        thread.start()
+        return thread
+    
+    def exhausted(self) -> bool:
+        """Check whether all sources have ended and every record was taken."""
+        with self._lock:
+            return not self.listening and self._running_sources == 0 and self._queue.empty()
+    
+    def next_batch(self, batch_size: int, batch_wait: float, timeout: float) -> List[Tuple[Dict, float]]:
+        """Wait up to timeout for a record, then collect up to batch_size within batch_wait seconds."""
+        try:
+            batch = [self._queue.get(timeout=timeout)]
+        except queue.Empty:
+            return []
+        deadline = time.monotonic() + batch_wait
+        while len(batch) < batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+
+class OpenTickets:
+    """Tickets assigned by the service and not closed yet, oldest first.
+    
+    Each ticket remembers whether it added to its agent's load (fallbacks
+    may not), so that closing it only gives back load it actually took.
+    Tickets are released when a close event arrives or, with a
+    time-to-live, when they have been open that long.
+    """
+    
+    def __init__(self):
+        self._open: "OrderedDict[str, Tuple[str, bool, float]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._open)
+    
+    def open(self, ticket_id: str, agent_id: str, now: float, counted: bool = True):
+        """Record a ticket as held by agent_id from now on (counted: it added to the agent's load)."""
+        self._open.pop(ticket_id, None)
+        self._open[ticket_id] = (agent_id, counted, now)
+    
+    def close(self, ticket_id: str) -> Optional[Tuple[str, bool]]:
+        """Forget a closed ticket; returns (agent_id, counted), or None if unknown."""
+        entry = self._open.pop(ticket_id, None)
+        return entry[:2] if entry is not None else None
+    
+    def expire(self, now: float, ttl: float) -> List[Tuple[str, bool]]:
+        """Drop tickets open for ttl seconds or longer; returns their (agent_id, counted)."""
+        expired = []
+        while self._open:
+            ticket_id, (agent_id, counted, opened) = next(iter(self._open.items()))
+            if now - opened < ttl:
+                break
+            del self._open[ticket_id]
+            expired.append((agent_id, counted))
+        return expired
+
+
+# assign_batch(tickets, total_tickets, cap) -> [(assignment, added to the agent's load), ...]
+AssignBatch = Callable[[List[Ticket], int, int], List[Tuple[Assignment, bool]]]
+
+
+class ServiceState:
+    """Pending micro-batch, open tickets and the moving 11% cap of the assignment service.
+    
+    receive() buffers ticket records and applies close events; flush()
+    updates agent availability for the current cap and assigns the buffered
+    tickets with assign_batch, writing each assignment as it is returned.
+    The cap applies to the open tickets, counted over at least window of
+    them so that a quiet queue does not shrink it to nothing. Closing or
+    expiring a ticket gives back the load it added, never taking an agent
+    below the load it was loaded with. Agents that were not Available when
+    loaded stay closed.
+    """
+    
+    def __init__(self, agents: Dict[str, Agent], pool: AgentPool, assign_batch: AssignBatch,
+                 writer: AssignmentWriter, window: int = 100, metrics: Optional[Metrics] = None,
+                 verbose: bool = False):
+        self.agents = agents
+        self.pool = pool
+        self.assign_batch = assign_batch
+        self.writer = writer
+        self.window = window
+        self.metrics = metrics or Metrics()
+        self.verbose = verbose
+        self.open_tickets = OpenTickets()
+        # Assignments per agent since the service started
+        self.counts: Dict[str, int] = {}
+        self.cap: Optional[int] = None
+        self._closed_agents = {agent_id for agent_id, agent in agents.items() if not agent.is_available()}
+        self._baseline = {agent_id: agent.current_load for agent_id, agent in agents.items()}
+        self._pending: List[Ticket] = []
+        self._arrivals: List[float] = []
+        # Agents whose load dropped since the last micro-batch
+        self._released: Set[str] = set()
+    
+    def receive(self, record: Dict, arrived: float):
+        """Buffer a ticket record for the next micro-batch, or apply a close event."""
+        if not is_close_event(record):
+            problems = check_ticket(record)
+            if problems:
+                self.metrics.increment("service_rejected", reason="invalid ticket")
+                print(f"Skipping invalid ticket: {'; '.join(problems)}")
+                return
+            self._pending.append(Ticket(record['ticket_id'], record['title'], record['description'],
+                                        record['creation_timestamp']))
+            self._arrivals.append(arrived)
+            return
+        
+        ticket_id = str(record.get("ticket_id"))
+        if any(ticket.ticket_id == ticket_id for ticket in self._pending):
+            # Closed before its micro-batch was assigned: assign what came first
+            self.flush()
+        entry = self.open_tickets.close(ticket_id)
+        if entry is None:
+            self.metrics.increment("service_unknown_closes")
+            return
+        self._release(*entry)
+        self.metrics.increment("service_closed")
+    
+    def expire(self, now: float, ttl: float):
+        """Release the tickets that have been open for ttl seconds or longer."""
+        expired = self.open_tickets.expire(now, ttl)
+        for agent_id, counted in expired:
+            self._release(agent_id, counted)
+        self.metrics.increment("service_expired", len(expired))
+    
+    def flush(self):
+        """Apply the cap for the current open tickets and assign the buffered tickets."""
+        total_tickets = max(self.window, len(self.open_tickets) + len(self._pending))
+        cap = int(total_tickets * 0.11)  # 11% threshold
+        for agent_id in (self.agents.keys() if cap != self.cap else self._released):
+            if agent_id in self._closed_agents:
+                continue
+            agent = self.agents[agent_id]
+            status = "Available" if agent.current_load < cap else "UNAVAILABLE"
+            if status != agent.availability_status or agent_id in self._released:
+                agent.availability_status = status
+                self.pool.update(agent_id)
+        self.cap = cap
+        self._released.clear()
+        if not self._pending:
+            return
+        
+        results = self.assign_batch(self._pending, total_tickets, cap)
+        for ticket, (assignment, counted), arrived in zip(self._pending, results, self._arrivals):
+            self.writer.write(assignment)
+            agent_id = assignment.assigned_agent_id
+            self.open_tickets.open(ticket.ticket_id, agent_id, time.monotonic(), counted)
+            self.counts[agent_id] = self.counts.get(agent_id, 0) + 1
+            latency = time.monotonic() - arrived
+            self.metrics.observe("ticket_latency_seconds", latency)
+            if self.verbose:
+                print(f"Assigned {ticket.ticket_id} to {agent_id} in {latency * 1000:.0f} ms")
+        self._pending.clear()
+        self._arrivals.clear()
+    
+    def status(self) -> Dict:
+        """Live counters for the status endpoint."""
+        return {
+            "assigned": self.writer.count,
+            "open_tickets": len(self.open_tickets),
+            "max_workload_per_agent": self.cap
+        }
+    
+    def _release(self, agent_id: str, counted: bool):
+        """Give back the load a closed ticket added to its agent."""
+        agent = self.agents.get(agent_id)
+        if not counted or agent is None:
+            return
+        agent.current_load = max(self._baseline[agent_id], agent.current_load - 1)
+        self._released.add(agent_id)
+
+
+def follow_jsonl(path: str, stop: threading.Event, poll_seconds: float = 0.2,
+                 from_start: bool = True) -> Iterator[str]:
+    """Yield the lines of a JSONL file as they are appended, like tail -f.
+    
+    Waits for the file to appear, keeps partial lines until their newline
+    arrives and starts over when the file is truncated or replaced (log
+    rotation). With from_start=False, lines already in the file are skipped.
+    """
+    while not os.path.exists(path):
+        if stop.wait(poll_seconds):
+            return
+    file = open(path, "r", encoding="utf-8")
+    try:
+        if not from_start:
+            file.seek(0, os.SEEK_END)
+        partial = ""
+        while not stop.is_set():
+            line = file.readline()
+            if line:
+                partial += line
+                if partial.endswith("\n"):
+                    yield partial
+                    partial = ""
+                continue
+            # At the end: reopen if the file was truncated or replaced
+            try:
+                rotated = os.stat(path).st_ino != os.fstat(file.fileno()).st_ino
+                truncated = os.path.getsize(path) < file.tell()
+            except FileNotFoundError:
+                rotated, truncated = False, False
+            if rotated or truncated:
+                file.close()
+                file = open(path, "r", encoding="utf-8")
+                partial = ""
+                continue
+            stop.wait(poll_seconds)
+    finally:
+        file.close()
+
+
+def read_stdin() -> Iterator[str]:
+    """Lines from standard input until it is closed."""
+    return iter(sys.stdin.readline, "")
+
+
+def serve_http(ticket_queue: TicketQueue, port: int, status: Callable[[], Dict],
+               host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Accept tickets over HTTP on a background thread.
+    
+    POST /tickets takes a JSON object, a JSON array or JSONL and answers 202
+    with the number of queued records; GET /status returns status() as JSON.
+    Only binds to localhost by default. Call shutdown() on the returned
+    server to stop it.
+    """
+    
+    class Handler(BaseHTTPRequestHandler):
+        def _reply(self, code: int, body: Dict):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(code)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def do_GET(self):
+            if self.path != "/status":
+                self._reply(404, {"error": "not found"})
+                return
+            self._reply(200, status())
+        
+        def do_POST(self):
+            if self.path != "/tickets":
+                self._reply(404, {"error": "not found"})
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length") or 0)).decode("utf-8")
+            try:
+                records = json.loads(body)
+                records = records if isinstance(records, list) else [records]
+            except ValueError:
+                records = [line for line in body.splitlines() if line.strip()]
+            queued = sum(ticket_queue.put(record) for record in records)
+            self._reply(202 if queued == len(records) else 400, {"queued": queued, "rejected": len(records) - queued})
+        
+        def log_message(self, format, *args):
+            pass
+    
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    ticket_queue.listening = True
+    threading.Thread(target=server.serve_forever, name="ticket-http", daemon=True).start()
+    return server
@@ -0,0 +1,240 @@
+"""
+Multi-process sharded assignment with a shared agent load ledger.
+"""
+import multiprocessing
+from typing import Any, Dict, List, Optional, Tuple
+from .agent_pool import AgentPool
+from .llm_assigner import LLMAssigner
+from .llm_cache import ResponseCache
+from .local_scorer import HybridAssigner, LocalScorer
+from .metrics import Metrics
+from .models import Agent, Ticket, Assignment
+from .scheduler import CircuitOpenError, RequestScheduler
+from .skills import configure_skill_mapping, extra_skill_mapping, extract_relevant_skills
+
+
+# Ledger agent states
+CLOSED = 0  # not available (availability status)
+OPEN = 1
+FULL = 2  # reached the cap
+
+
+class LoadLedger:
+    """Agent loads and availability in shared memory, with atomic reserve/release.
+    
+    Every worker process commits through reserve(), which takes one ticket
+    slot from an agent only while it is available and below the cap, so the
+    11% cap holds across all processes. An agent that reaches the cap is
+    marked unavailable, mirroring TicketProcessor._update_agent_workload.
+    """
+    
+    def __init__(self, agents: Dict[str, Agent], max_workload: int, context=None):
+        """Allocate the shared arrays from the agents' current state."""
+        context = context or multiprocessing.get_context()
+        self.agent_ids = list(agents)
+        self.max_workload = max_workload
+        self.lock = context.Lock()
+        self.loads = context.RawArray('i', [agent.current_load for agent in agents.values()])
+        self.states = context.RawArray('b', [OPEN if agent.is_available() else CLOSED for agent in agents.values()])
+    
+    def reserve(self, index: int) -> bool:
+        """Count one ticket against agent index if it is available and below the cap."""
+        with self.lock:
+            if self.states[index] != OPEN or self.loads[index] >= self.max_workload:
+                return False
+            self.loads[index] += 1
+            if self.loads[index] >= self.max_workload:
+                self.states[index] = FULL
+            return True
+    
+    def release(self, index: int):
+        """Give back one ticket slot of agent index (e.g. when an assignment is undone)."""
+        with self.lock:
+            self.loads[index] -= 1
+            if self.states[index] == FULL and self.loads[index] < self.max_workload:
+                self.states[index] = OPEN
+    
+    def snapshot(self) -> Tuple[List[int], List[int]]:
+        """Consistent copy of (loads, states)."""
+        with self.lock:
+            return self.loads[:], self.states[:]
+
+
+class AssignerFactory:
+    """Picklable recipe for building an assigner inside each worker process.
+    
+    LLM clients and SQLite connections cannot cross process boundaries, so
+    workers get the parameters and build their own (the response cache file
+    is shared between them).
+    """
+    
+    def __init__(self, backend: str, local_scorer: LocalScorer, llm_params: Optional[Dict[str, Any]] = None,
+                 cache_params: Optional[Dict[str, Any]] = None, scheduler_params: Optional[Dict[str, Any]] = None):
+        """scheduler_params are per worker, so rate limits should be divided by the worker count."""
+        self.backend = backend
+        self.local_scorer = local_scorer
+        self.llm_params = llm_params or {}
+        self.cache_params = cache_params
+        self.scheduler_params = scheduler_params
+    
+    def __call__(self, metrics: Optional[Metrics] = None):
+        if self.backend == "local":
+            return self.local_scorer
+        cache = ResponseCache(**self.cache_params) if self.cache_params else None
+        scheduler = RequestScheduler(metrics=metrics, **self.scheduler_params) if self.scheduler_params else None
+        llm_assigner = LLMAssigner(cache=cache, scheduler=scheduler, metrics=metrics, **self.llm_params)
+        if self.backend == "hybrid":
+            return HybridAssigner(self.local_scorer, llm_assigner)
+        return llm_assigner
+
+
+class _WorkerState:
+    """Per-process state set up by _init_worker."""
+    agents: Dict[str, Agent] = {}
+    pool: Optional[AgentPool] = None
+    ledger: Optional[LoadLedger] = None
+    assigner: Any = None
+    local_scorer: Optional[LocalScorer] = None
+    total_tickets = 0
+    index: Dict[str, int] = {}
+    metrics: Optional[Metrics] = None
+    messages: List[Tuple[bool, str]] = []  # (verbose only, message) to print in the parent
+
+
+def _init_worker(agents: Dict[str, Agent], ledger: LoadLedger, factory: AssignerFactory, total_tickets: int,
+                 skill_mapping: Dict[str, str]):
+    """Give the worker its own roster copy, the shared ledger, an assigner and the parent's skill keywords."""
+    configure_skill_mapping(skill_mapping)
+    _WorkerState.agents = agents
+    _WorkerState.pool = AgentPool(agents)
+    _WorkerState.ledger = ledger
+    _WorkerState.metrics = Metrics()
+    _WorkerState.assigner = factory(_WorkerState.metrics)
+    _WorkerState.local_scorer = factory.local_scorer
+    _WorkerState.total_tickets = total_tickets
+    _WorkerState.index = {agent_id: i for i, agent_id in enumerate(ledger.agent_ids)}
+
+
+def _sync_agents():
+    """Copy loads and availability from the ledger into the worker's roster."""
+    loads, states = _WorkerState.ledger.snapshot()
+    for agent_id, load, state in zip(_WorkerState.ledger.agent_ids, loads, states):
+        agent = _WorkerState.agents[agent_id]
+        is_open = state == OPEN
+        if agent.current_load == load and agent.is_available() == is_open:
+            continue
+        agent.current_load = load
+        if state == FULL and agent.is_available():
+            agent.availability_status = "UNAVAILABLE"
+        elif is_open and not agent.is_available():
+            agent.availability_status = "Available"
+        _WorkerState.pool.update(agent_id)
+
+
+def _assign_one(ticket: Ticket) -> Assignment:
+    """Assign one ticket with the worker's assigner and reserve its slot."""
+    _sync_agents()
+    assignment = None
+    if _WorkerState.pool.has_available():
+        try:
+            assignment = _WorkerState.assigner.assign_ticket(ticket, _WorkerState.pool, _WorkerState.total_tickets)
+        except CircuitOpenError:
+            # The LLM API is degraded: score locally instead
+            _WorkerState.metrics.increment("circuit_local_decisions")
+            proposals = _WorkerState.local_scorer.assign_tickets([ticket], _WorkerState.pool, _WorkerState.total_tickets)
+            assignment = proposals[0]
+        except Exception as e:
+            _WorkerState.messages.append((False, f"Error processing ticket {ticket.ticket_id}: {e}"))
+    return _reserve(ticket, assignment)
+
+
+def _reserve(ticket: Ticket, assignment: Optional[Assignment]) -> Assignment:
+    """Reserve the proposed agent's slot in the ledger, falling back on conflicts."""
+    reason = "processing error" if assignment is None else "agent capacity reached"
+    is_fallback = assignment is None
+    while True:
+        if assignment is not None and _WorkerState.ledger.reserve(_WorkerState.index[assignment.assigned_agent_id]):
+            if is_fallback:
+                _WorkerState.metrics.increment("fallbacks", reason=reason)
+            return assignment
+        # Another worker took the last slot meanwhile: refresh and fall back
+        _sync_agents()
+        agent = _WorkerState.pool.least_loaded(extract_relevant_skills(ticket))
+        if agent is None:
+            break
+        is_fallback = True
+        assignment = Assignment(
+            ticket_id=ticket.ticket_id,
+            title=ticket.title,
+            assigned_agent_id=agent.agent_id,
+            rationale=f"Fallback assignment to {agent.name} due to {reason}"
+        )
+    
+    # No capacity left anywhere: emergency fallback to the first agent, as in TicketProcessor
+    _WorkerState.messages.append((True, f"Warning: No available agents for ticket {ticket.ticket_id}"))
+    _WorkerState.metrics.increment("fallbacks", reason="processing error")
+    agent = next(iter(_WorkerState.agents.values()))
+    return Assignment(
+        ticket_id=ticket.ticket_id,
+        title=ticket.title,
+        assigned_agent_id=agent.agent_id,
+        rationale=f"Fallback assignment to {agent.name} due to processing error"
+    )
+
+
+def _assign_chunk(tickets: List[Ticket]) -> Tuple[List[Assignment], Tuple[Dict, Dict], List[Tuple[bool, str]]]:
+    """Worker entry point: assign a chunk of tickets in order.
+    
+    Returns the assignments along with the counters and histograms the
+    worker recorded meanwhile and the messages it has for the parent.
+    """
+    assignments = _assign_tickets(tickets)
+    messages, _WorkerState.messages = _WorkerState.messages, []
+    return assignments, _WorkerState.metrics.take(), messages
+
+
+def _assign_tickets(tickets: List[Ticket]) -> List[Assignment]:
+    """Assign tickets in order with the worker's assigner."""
+    if isinstance(_WorkerState.assigner, LocalScorer):
+        # Score the whole chunk in one vectorized pass; the loads it projects
+        # are local to this worker, so every pick is still confirmed by reserve()
+        _sync_agents()
+        proposals: List[Optional[Assignment]] = [None] * len(tickets)
+        if _WorkerState.pool.has_available():
+            proposals = _WorkerState.assigner.assign_tickets(tickets, _WorkerState.pool, _WorkerState.total_tickets)
+        return [_reserve(ticket, assignment) for ticket, assignment in zip(tickets, proposals)]
+    return [_assign_one(ticket) for ticket in tickets]
+
+
+def assign_sharded(tickets: List[Ticket], agents: Dict[str, Agent], total_tickets: int,
+                   factory: AssignerFactory, workers: int, chunk_size: int = 64,
+                   context=None, metrics: Optional[Metrics] = None,
+                   verbose: bool = False) -> Tuple[List[Assignment], List[int], List[int]]:
+    """Assign tickets with a pool of worker processes sharing one load ledger.
+    
+    Tickets are cut into chunks handed out in ticket order, so the workers
+    progress through the backlog roughly as the sequential loop would.
+    Returns the assignments in ticket order and the final (loads, states)
+    from the ledger, indexed like agents. What the workers record (fallbacks,
+    LLM requests, cache hits, token usage) is merged into metrics; their
+    errors are printed here, and their warnings too when verbose.
+    """
+    context = context or multiprocessing.get_context()
+    max_workload = int(total_tickets * 0.11)  # 11% threshold
+    ledger = LoadLedger(agents, max_workload, context)
+    chunk_size = max(1, chunk_size)
+    chunks = [tickets[start:start + chunk_size] for start in range(0, len(tickets), chunk_size)]
+    
+    assignments: List[Assignment] = []
+    initargs = (agents, ledger, factory, total_tickets, extra_skill_mapping())
+    with context.Pool(workers, initializer=_init_worker, initargs=initargs) as pool:
+        for chunk_assignments, (counters, histograms), messages in pool.imap(_assign_chunk, chunks):
+            assignments.extend(chunk_assignments)
+            if metrics is not None:
+                metrics.merge(counters, histograms)
+            for verbose_only, message in messages:
+                if verbose or not verbose_only:
+                    print(message)
+    
+    loads, states = ledger.snapshot()
+    return assignments, loads, states
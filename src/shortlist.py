@@ -0,0 +1,92 @@
+"""
+Top-k candidate shortlisting of agents for LLM prompts.
+"""
+import math
+import threading
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .models import Agent, Ticket
+from .skills import extract_relevant_skills, tokenize
+
+
+class CandidateShortlist:
+    """TF-IDF index over agent skills, queried with the ticket text.
+    
+    Each agent is a document made of the words of its skill names (e.g.
+    'VPN_Troubleshooting' -> 'vpn', 'troubleshooting') weighted by skill
+    level; words shared by many agents get a low IDF weight. A ticket query
+    is the words of its title and description plus those of the skills the
+    keyword matcher extracts (so 'outlook' also matches 'Microsoft_365').
+    
+    shortlist() returns the k best-matching agents that can still take a
+    ticket (available and below the cap); ties, including tickets that
+    match no skill at all, go to the less loaded agent.
+    """
+    
+    def __init__(self, k: int):
+        """Initialize an empty index returning up to k candidates."""
+        self.k = k
+        self._lock = threading.Lock()
+        self._roster_key: Optional[Tuple] = None
+        self._index: Tuple[List[str], Dict[str, int], np.ndarray] = ([], {}, np.zeros((0, 0)))
+    
+    def invalidate(self):
+        """Rebuild the index on next use (call after changing an agent's skills)."""
+        with self._lock:
+            self._roster_key = None
+    
+    def build_index(self, agents: Dict[str, Agent]):
+        """Build the agents x terms matrix (rebuilt when agents join or leave, or after invalidate())."""
+        roster_key = tuple(agents)
+        with self._lock:
+            if roster_key == self._roster_key:
+                return
+            
+            agent_terms = []
+            for agent in agents.values():
+                terms: Dict[str, float] = {}
+                for skill, level in agent.skills.items():
+                    for term in tokenize(skill.replace("_", " ")):
+                        terms[term] = terms.get(term, 0.0) + level / 10.0
+                agent_terms.append(terms)
+            
+            vocabulary = {term: i for i, term in enumerate(sorted({term for terms in agent_terms for term in terms}))}
+            matrix = np.zeros((len(agent_terms), len(vocabulary)), dtype=np.float32)
+            for row, terms in enumerate(agent_terms):
+                for term, weight in terms.items():
+                    matrix[row, vocabulary[term]] = weight
+            
+            # Smoothed IDF, then unit-length rows so long skill lists don't dominate
+            document_frequency = (matrix > 0).sum(axis=0)
+            matrix *= np.log((1 + len(agent_terms)) / (1 + document_frequency)) + 1
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix /= np.maximum(norms, 1e-9)
+            
+            self._index = (list(agents.keys()), vocabulary, matrix)
+            self._roster_key = roster_key
+    
+    def scores(self, ticket: Ticket, agents: Dict[str, Agent]) -> Dict[str, float]:
+        """Cosine similarity between the ticket text and every agent's skills."""
+        self.build_index(agents)
+        agent_ids, vocabulary, matrix = self._index
+        words = tokenize(f"{ticket.title} {ticket.description}")
+        for skill in extract_relevant_skills(ticket):
+            words.extend(tokenize(skill.replace("_", " ")))
+        
+        query = np.zeros(len(vocabulary), dtype=np.float32)
+        for word in words:
+            column = vocabulary.get(word)
+            if column is not None:
+                query[column] = 1.0
+        similarity = matrix @ query / max(math.sqrt(float(query.sum())), 1.0)
+        return dict(zip(agent_ids, similarity.tolist()))
+    
+    def shortlist(self, ticket: Ticket, agents: Dict[str, Agent], max_workload: int) -> List[Agent]:
+        """Return up to k open agents, best skill match first."""
+        scores = self.scores(ticket, agents)
+        candidates = [
+            agent for agent in agents.values()
+            if agent.is_available() and agent.current_load < max_workload
+        ]
+        candidates.sort(key=lambda agent: (-round(scores.get(agent.agent_id, 0.0), 6), agent.current_load))
+        return candidates[:self.k]
@@ -0,0 +1,189 @@
+"""
+Discrete-event simulation of ticket arrivals, agent queues and the assignment policy.
+"""
+import heapq
+import itertools
+import multiprocessing
+from dataclasses import asdict, dataclass
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from .local_scorer import LocalScorer
+from .models import Agent, Ticket
+from .skills import configure_skill_mapping, extra_skill_mapping, extract_relevant_skills
+
+
+@dataclass(frozen=True)
+class SimulationParams:
+    """Policy and workload parameters of one simulation run.
+    
+    cap_fraction and the weights are the assignment policy (see LocalScorer);
+    the cap applies to the open tickets, counted over at least window of
+    them. A ticket takes handling_minutes, shortened by skill_speedup times
+    the agent's skill match (0-1) and scaled by lognormal noise with
+    handling_sigma (mean 1, drawn from seed).
+    """
+    cap_fraction: float = 0.11
+    skill_weight: float = 1.0
+    load_weight: float = 0.5
+    experience_weight: float = 0.2
+    window: int = 100
+    handling_minutes: float = 30.0
+    skill_speedup: float = 0.5
+    handling_sigma: float = 0.5
+    seed: int = 1
+
+
+class SimulationInput:
+    """Tickets in arrival order and the agent roster, prepared once for many runs.
+    
+    Ticket skills are extracted here, so a run (or a sweep worker) only does
+    the event loop and the skill matrix products.
+    """
+    
+    def __init__(self, agents: Dict[str, Agent], tickets: List[Ticket]):
+        """Order tickets by creation_timestamp (ties keep file order) and extract their skills."""
+        ordered = sorted(tickets, key=lambda ticket: ticket.creation_timestamp)
+        self.agents = agents
+        self.ticket_ids = [ticket.ticket_id for ticket in ordered]
+        self.arrivals = np.array([ticket.creation_timestamp for ticket in ordered], dtype=np.float64)
+        self.ticket_skills = [extract_relevant_skills(ticket) for ticket in ordered]
+
+
+def parameter_grid(base: Optional[SimulationParams] = None, **values: Sequence) -> List[SimulationParams]:
+    """Every combination of the given parameter values, e.g. parameter_grid(cap_fraction=[0.1, 0.2])."""
+    base_values = asdict(base or SimulationParams())
+    names = list(values)
+    return [
+        SimulationParams(**{**base_values, **dict(zip(names, combination))})
+        for combination in itertools.product(*(values[name] for name in names))
+    ]
+
+
+def _summary(values: np.ndarray) -> Dict[str, float]:
+    """Mean, percentiles and max of a sample (0 when empty)."""
+    if not len(values):
+        return {"mean": 0.0, "p50": 0.0, "p90": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0}
+    p50, p90, p95, p99 = np.percentile(values, [50, 90, 95, 99])
+    return {"mean": float(values.mean()), "p50": float(p50), "p90": float(p90), "p95": float(p95),
+            "p99": float(p99), "max": float(values.max())}
+
+
+def simulate(inputs: SimulationInput, params: SimulationParams, chunk_size: int = 1024) -> Dict:
+    """Replay the tickets in timestamp order and report queue waits and agent utilization.
+    
+    Each available agent works its queue first-in first-out, one ticket at a
+    time; its current_load from the dataset is queued work at the start. At
+    every arrival, completed tickets leave their agents' queues and the
+    ticket goes to the open agent with the best local score (skill match,
+    experience, open tickets / cap). When every agent is at the cap, it goes
+    to the one with the fewest open tickets and counts as over_cap_arrivals.
+    Scores are computed in chunks of chunk_size tickets, so memory does not
+    grow with the ticket count.
+    """
+    agents = inputs.agents
+    arrivals = inputs.arrivals
+    num_tickets, num_agents = len(arrivals), len(agents)
+    available = np.array([agent.is_available() for agent in agents.values()])
+    if num_tickets and not available.any():
+        raise ValueError("No available agents to simulate")
+    
+    scorer = LocalScorer(params.skill_weight, params.load_weight, params.experience_weight)
+    rng = np.random.default_rng(params.seed)
+    noise = rng.lognormal(-params.handling_sigma ** 2 / 2, params.handling_sigma, num_tickets)
+    base_seconds = params.handling_minutes * 60
+    start = float(arrivals[0]) if num_tickets else 0.0
+    
+    loads = np.zeros(num_agents)
+    free_at = np.full(num_agents, start)
+    busy = np.zeros(num_agents)
+    completions = []
+    for index, agent in enumerate(agents.values()):
+        for position in range(agent.current_load):
+            heapq.heappush(completions, (start + (position + 1) * base_seconds, index))
+        loads[index] = agent.current_load
+        free_at[index] = start + agent.current_load * base_seconds
+        busy[index] = agent.current_load * base_seconds
+    open_total = int(loads.sum())
+    handled = np.zeros(num_agents, dtype=np.int64)
+    peak_open = loads.copy()
+    waits = np.zeros(num_tickets)
+    over_cap = 0
+    
+    for chunk_start in range(0, num_tickets, chunk_size):
+        match = scorer.skill_match(inputs.ticket_skills[chunk_start:chunk_start + chunk_size], agents)
+        static = params.skill_weight * match + params.experience_weight * scorer.experience
+        for row in range(len(match)):
+            ticket = chunk_start + row
+            now = arrivals[ticket]
+            while completions and completions[0][0] <= now:
+                _, index = heapq.heappop(completions)
+                loads[index] -= 1
+                open_total -= 1
+            
+            cap = max(1, int(params.cap_fraction * max(params.window, open_total + 1)))
+            open_mask = available & (loads < cap)
+            if open_mask.any():
+                index = int(np.argmax(np.where(open_mask, static[row] - params.load_weight * loads / cap, -np.inf)))
+            else:
+                index = int(np.argmin(np.where(available, loads, np.inf)))
+                over_cap += 1
+            
+            handling = base_seconds * (1 - params.skill_speedup * match[row, index]) * noise[ticket]
+            begin = max(now, free_at[index])
+            free_at[index] = begin + handling
+            heapq.heappush(completions, (begin + handling, index))
+            loads[index] += 1
+            open_total += 1
+            peak_open[index] = max(peak_open[index], loads[index])
+            waits[ticket] = begin - now
+            busy[index] += handling
+            handled[index] += 1
+    
+    end = max(float(free_at.max(initial=start)), float(arrivals[-1]) if num_tickets else start)
+    horizon = max(end - start, 1.0)
+    utilization = busy / horizon
+    return {
+        "params": asdict(params),
+        "tickets": num_tickets,
+        "wait_minutes": {name: round(value / 60, 2) for name, value in _summary(waits).items()},
+        "over_cap_arrivals": over_cap,
+        "makespan_hours": round(horizon / 3600, 2),
+        "utilization": {name: round(value, 3) for name, value in _summary(utilization[available]).items()},
+        "agents": {
+            agent_id: {
+                "tickets": int(handled[index]),
+                "utilization": round(float(utilization[index]), 3),
+                "peak_open": int(peak_open[index])
+            }
+            for index, agent_id in enumerate(agents)
+        }
+    }
+
+
+class _SweepState:
+    """Per-process state of a sweep worker."""
+    inputs: Optional[SimulationInput] = None
+
+
+def _init_worker(inputs: SimulationInput, skill_mapping: Dict[str, str]):
+    """Receive the prepared input and the parent's skill keywords once per worker process."""
+    configure_skill_mapping(skill_mapping)
+    _SweepState.inputs = inputs
+
+
+def _simulate_one(params: SimulationParams) -> Dict:
+    """Run one point of the sweep in a worker process."""
+    return simulate(_SweepState.inputs, params)
+
+
+def run_sweep(inputs: SimulationInput, grid: List[SimulationParams], workers: int = 1, context=None) -> List[Dict]:
+    """Simulate every parameter set of grid, in parallel worker processes when workers > 1.
+    
+    The input is sent to each worker once; results come back in grid order.
+    """
+    if workers <= 1 or len(grid) <= 1:
+        return [simulate(inputs, params) for params in grid]
+    context = context or multiprocessing.get_context()
+    with context.Pool(min(workers, len(grid)), initializer=_init_worker,
+                      initargs=(inputs, extra_skill_mapping())) as pool:
+        return pool.map(_simulate_one, grid, chunksize=1)
@@ -0,0 +1,187 @@
+"""
+Skill keyword extraction and assignment rationale shared by all assigners.
+"""
+import json
+import re
+from typing import Dict, List, Optional
+from .models import Agent, Ticket
+
+
+# Map common IT terms to skill names
+SKILL_MAPPING = {
+    'vpn': 'VPN_Troubleshooting',
+    'network': 'Networking',
+    'windows': 'Windows_OS',
+    'server': 'Windows_Server_2022',
+    'active directory': 'Active_Directory',
+    'email': 'Microsoft_365',
+    'outlook': 'Microsoft_365',
+    'hardware': 'Hardware_Diagnostics',
+    'laptop': 'Laptop_Repair',
+    'printer': 'Printer_Troubleshooting',
+    'security': 'Network_Security',
+    'firewall': 'Firewall_Configuration',
+    'database': 'Database_SQL',
+    'sql': 'Database_SQL',
+    'cloud': 'Cloud_AWS',
+    'azure': 'Cloud_Azure',
+    'aws': 'Cloud_AWS',
+    'linux': 'Linux_Administration',
+    'mac': 'Mac_OS',
+    'macos': 'Mac_OS',
+    'macbook': 'Mac_OS',
+    'voip': 'Voice_VoIP',
+    'phone': 'Voice_VoIP',
+    'antivirus': 'Antivirus_Malware',
+    'malware': 'Antivirus_Malware',
+    'phishing': 'Phishing_Analysis',
+    'sharepoint': 'SharePoint_Online',
+    'powerbi': 'PowerBI_Tableau',
+    'tableau': 'PowerBI_Tableau',
+    'api': 'API_Troubleshooting',
+    'web': 'Web_Server_Apache_Nginx',
+    'website': 'Web_Server_Apache_Nginx',
+    'dns': 'DNS_Configuration',
+    'ssl': 'SSL_Certificates',
+    'sso': 'Identity_Management',
+    'saml': 'Identity_Management',
+    'saas': 'SaaS_Integrations',
+    'endpoint': 'Endpoint_Management',
+    'mobile': 'Endpoint_Management',
+    'virtualization': 'Virtualization_VMware',
+    'vmware': 'Virtualization_VMware',
+    'docker': 'Kubernetes_Docker',
+    'kubernetes': 'Kubernetes_Docker',
+    'devops': 'DevOps_CI_CD',
+    'ci/cd': 'DevOps_CI_CD',
+    'python': 'Python_Scripting',
+    'powershell': 'PowerShell_Scripting',
+    'monitoring': 'Network_Monitoring',
+    'switch': 'Switch_Configuration',
+    'routing': 'Routing_Protocols',
+    'cisco': 'Cisco_IOS',
+    'audit': 'Security_Audits',
+    'siem': 'SIEM_Logging',
+    'etl': 'ETL_Processes',
+    'warehouse': 'Data_Warehousing',
+    'apache': 'Web_Server_Apache_Nginx',
+    'nginx': 'Web_Server_Apache_Nginx'
+}
+
+
+# Alphanumeric words, keeping slash-joined terms such as "ci/cd" together
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+(?:/[A-Za-z0-9]+)*")
+_INFLECTIONS = ("", "s", "es", "ing", "ed")
+
+
+class SkillMatcher:
+    """Finds all skill keywords in a text in a single tokenization pass.
+    
+    The text is split into words once and each distinct word is looked up in
+    a table of keyword forms (plural, -ing, -ed), so the cost does not grow
+    with the number of keywords. Keywords only match whole words: 'api' does
+    not fire inside 'rapid' nor 'mac' inside 'machine', so compound words
+    such as 'macos' or 'website' need keywords of their own. Multi-word
+    keywords such as 'active directory' are matched on consecutive words.
+    Each skill is reported once, in mapping order.
+    """
+    
+    def __init__(self, mapping: Dict[str, str]):
+        """Build the word and phrase lookup tables for a keyword -> skill mapping."""
+        self.mapping = {keyword.lower(): skill for keyword, skill in mapping.items()}
+        self.skills = list(dict.fromkeys(self.mapping.values()))
+        self._skill_rank = {skill: rank for rank, skill in enumerate(self.skills)}
+        self._words: Dict[str, str] = {}
+        self._phrases: Dict[str, List] = {}
+        for keyword, skill in self.mapping.items():
+            words = _TOKEN_PATTERN.findall(keyword)
+            if len(words) == 1:
+                for suffix in _INFLECTIONS:
+                    self._words.setdefault(words[0] + suffix, skill)
+            elif words:
+                for suffix in _INFLECTIONS:
+                    rest = tuple(words[1:-1]) + (words[-1] + suffix,)
+                    self._phrases.setdefault(words[0], []).append((rest, skill))
+        self._keywords = frozenset(self._words)
+    
+    def match(self, text: str) -> List[str]:
+        """Return the deduplicated skills whose keywords occur in text."""
+        tokens = _TOKEN_PATTERN.findall(text.lower())
+        words = tokens
+        if "/" in text:
+            words = tokens + [part for token in tokens if "/" in token for part in token.split("/")]
+        
+        found = {self._words[word] for word in self._keywords.intersection(words)}
+        if not self._phrases.keys().isdisjoint(tokens):
+            for i, word in enumerate(tokens):
+                for rest, skill in self._phrases.get(word, ()):
+                    if tuple(tokens[i + 1:i + 1 + len(rest)]) == rest:
+                        found.add(skill)
+        return sorted(found, key=self._skill_rank.__getitem__)
+
+
+_matcher = SkillMatcher(SKILL_MAPPING)
+_extra_mapping: Dict[str, str] = {}
+
+
+def load_skill_mapping(path: str) -> Dict[str, str]:
+    """Load additional keyword -> skill entries from a JSON file."""
+    with open(path, 'r', encoding='utf-8') as file:
+        mapping = json.load(file)
+    if not isinstance(mapping, dict):
+        raise ValueError(f"Skill mapping in '{path}' must be a JSON object of keyword -> skill")
+    return mapping
+
+
+def configure_skill_mapping(extra_mapping: Optional[Dict[str, str]] = None):
+    """Rebuild the module matcher from the default mapping plus extra entries."""
+    global _matcher, _extra_mapping
+    _extra_mapping = dict(extra_mapping or {})
+    _matcher = SkillMatcher({**SKILL_MAPPING, **_extra_mapping})
+
+
+def extra_skill_mapping() -> Dict[str, str]:
+    """Return the entries configured on top of the default mapping (to hand to worker processes)."""
+    return dict(_extra_mapping)
+
+
+def known_skills() -> List[str]:
+    """Return every skill the current keyword mapping can produce."""
+    return list(_matcher.skills)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase words (slash-joined terms are also split into their parts)."""
+    words = []
+    for token in _TOKEN_PATTERN.findall(text.lower()):
+        words.append(token)
+        if "/" in token:
+            words.extend(token.split("/"))
+    return words
+
+
+def extract_relevant_skills(ticket: Ticket) -> List[str]:
+    """Extract relevant skill keywords from ticket title and description."""
+    return _matcher.match(f"{ticket.title} {ticket.description}")
+
+
+def build_rationale(ticket: Ticket, assigned_agent: Agent, relevant_skills: Optional[List[str]] = None) -> str:
+    """Create a rationale for assigning a ticket to an agent."""
+    # Find relevant skills for this ticket
+    if relevant_skills is None:
+        relevant_skills = extract_relevant_skills(ticket)
+    
+    skill_matches = []
+    for skill in relevant_skills:
+        score = assigned_agent.get_skill_score(skill)
+        if score > 0:
+            skill_matches.append(f"{skill} ({score})")
+    
+    rationale = f"Assigned to {assigned_agent.name} ({assigned_agent.agent_id})"
+    
+    if skill_matches:
+        rationale += f" based on their expertise in {', '.join(skill_matches)}"
+    
+    rationale += f", current workload of {assigned_agent.current_load}, and experience level of {assigned_agent.experience_level}."
+    
+    return rationale
@@ -0,0 +1,37 @@
+"""
+Workload summaries of assignment results.
+"""
+from typing import Dict, Iterable
+from .models import Assignment
+
+
+def count_assignments(assignments: Iterable[Assignment]) -> Dict[str, int]:
+    """Number of assignments per agent, in order of first appearance."""
+    counts: Dict[str, int] = {}
+    for assignment in assignments:
+        counts[assignment.assigned_agent_id] = counts.get(assignment.assigned_agent_id, 0) + 1
+    return counts
+
+
+def workload_summary(assignments_per_agent: Dict[str, int], total_tickets: int) -> Dict:
+    """Summarize per-agent workload against the 11% cap."""
+    max_workload = int(total_tickets * 0.11)
+    
+    # Calculate workload distribution
+    workload_distribution = {}
+    for agent_id, current_load in assignments_per_agent.items():
+        workload_percentage = (current_load / total_tickets) * 100
+        workload_distribution[agent_id] = {
+            "tickets": current_load,
+            "percentage": round(workload_percentage, 2),
+            "status": "OVER_LIMIT" if current_load > max_workload else "WITHIN_LIMIT"
+        }
+    
+    return {
+        "total_tickets": total_tickets,
+        "total_assignments": sum(assignments_per_agent.values()),
+        "agents_used": len(assignments_per_agent),
+        "max_workload_per_agent": max_workload,
+        "workload_distribution": workload_distribution,
+        "assignments_per_agent": dict(assignments_per_agent)
+    }
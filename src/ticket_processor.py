@@ -1,134 +1,834 @@
 """
 Main ticket processing and assignment orchestrator.
 """
-import json
-from typing import List, Dict
+import asyncio
+import time
+from collections import Counter
+from itertools import islice
+from typing import List, Dict, Optional, TextIO, Tuple
+from .agent_pool import AgentPool
+from .backends import BACKENDS, LLM_BACKENDS
 from .data_loader import DataLoader
+from .dedup import NearDuplicateAssigner
+from .journal import AssignmentJournal, run_digest
 from .llm_assigner import LLMAssigner
-from .models import Agent, Ticket, Assignment
+from .local_scorer import HybridAssigner, LocalScorer
+from .metrics import Metrics
+from .models import Agent, Ticket, Assignment, SkillLevels
+from .optimizer import CapacityPlanner
+from .output_writer import AssignmentWriter
+from .replanning import AssignmentIndex
+from .scheduler import CircuitOpenError
+from .service import ServiceState, TicketQueue
+from .sharding import FULL, AssignerFactory, assign_sharded
+from .skills import build_rationale, extract_relevant_skills
+from .summary import count_assignments, workload_summary
+
+
+# Verbosity levels: errors only, run-level messages, per-ticket messages
+QUIET = 0
+NORMAL = 1
+VERBOSE = 2
 
 
 class TicketProcessor:
     """Main class for processing tickets and generating assignments."""
     
-    def __init__(self, dataset_path: str, api_key: str):
-        """Initialize the ticket processor."""
-        self.data_loader = DataLoader(dataset_path)
-        self.llm_assigner = LLMAssigner(api_key)
+    def __init__(self, dataset_path: str, api_key: Optional[str] = None, backend: str = "llm",
+                 local_scorer: Optional[LocalScorer] = None, llm_assigner: Optional[LLMAssigner] = None,
+                 tickets_path: Optional[str] = None, metrics: Optional[Metrics] = None,
+                 verbosity: int = VERBOSE, journal: Optional[AssignmentJournal] = None,
+                 resume: bool = False, lazy_descriptions: bool = False, dedup_threshold: float = 0.0):
+        """Initialize the ticket processor.
+        
+        backend selects how tickets are assigned: "llm" asks the LLM for every
+        ticket, "local" uses the deterministic LocalScorer only (no network),
+        "hybrid" scores locally and sends only low-confidence or tied tickets
+        to the LLM, and "optimal" plans the whole ticket set at once with the
+        capacity-constrained solver (no network). A preconfigured
+        llm_assigner (model parameters, response cache) can be passed in for
+        the LLM backends; otherwise one is created from api_key. tickets_path
+        optionally points to a separate JSON or JSONL ticket file; with
+        lazy_descriptions, ticket descriptions stay on disk and are read back
+        when needed.
+        
+        Stage timings and counters go to metrics (shared with the data loader
+        and, if created here, the LLM assigner). verbosity controls printing:
+        QUIET prints errors only, NORMAL adds run-level messages and VERBOSE
+        adds per-ticket progress.
+        
+        With a journal (LLM backends only), process_all_tickets records every
+        committed assignment as it happens; with resume=True it first replays
+        the journal of an interrupted run and only assigns the tickets that
+        are not in it.
+        
+        With dedup_threshold > 0 (LLM backends), tickets whose text is at
+        least that similar (estimated Jaccard) to an earlier ticket reuse its
+        LLM decision instead of sending a new request (see
+        NearDuplicateAssigner); the clusters are listed in the summary.
+        """
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend '{backend}', expected one of {', '.join(BACKENDS)}")
+        if (journal is not None or resume) and backend not in LLM_BACKENDS:
+            raise ValueError(f"Journaling and resume are only supported by the {' and '.join(LLM_BACKENDS)} backends")
+        if resume and journal is None:
+            raise ValueError("Resuming requires a journal")
+        
+        self.backend = backend
+        self.metrics = metrics or Metrics()
+        self.verbosity = verbosity
+        self.data_loader = DataLoader(dataset_path, tickets_path, self.metrics, lazy_descriptions)
+        self.local_scorer = local_scorer or LocalScorer()
+        self.llm_assigner = None
+        self.dedup = None
+        if backend in LLM_BACKENDS:
+            self.llm_assigner = llm_assigner or LLMAssigner(api_key, metrics=self.metrics)
+            if dedup_threshold > 0:
+                self.dedup = NearDuplicateAssigner(self.llm_assigner, dedup_threshold, metrics=self.metrics)
+        llm_side = self.dedup or self.llm_assigner
+        if backend == "hybrid":
+            self.assigner = HybridAssigner(self.local_scorer, llm_side)
+        elif backend == "llm":
+            self.assigner = llm_side
+        else:
+            self.assigner = self.local_scorer
         self.agents: Dict[str, Agent] = {}
+        self.pool = AgentPool(self.agents)
         self.tickets: List[Ticket] = []
         self.assignments: List[Assignment] = []
+        # Per-agent counts kept instead of assignments when streaming
+        self.streamed_counts: Optional[Dict[str, int]] = None
+        self.streamed_total = 0
+        self.journal = journal
+        self.resume = resume
+        # Journal being written by the current run (None when not journaling)
+        self._active_journal: Optional[AssignmentJournal] = None
+        # Live counters of a running service (see serve)
+        self.service_status: Dict = {}
+        # Load added by each committed assignment, in order, while a service batch is assigned
+        self._load_deltas: Optional[List[int]] = None
+        # Agent and skill index of self.assignments, built on the first re-plan
+        self._replan_index: Optional[AssignmentIndex] = None
     
     def initialize(self):
         """Load and initialize agents and tickets from dataset."""
         self.agents, self.tickets = self.data_loader.load_data()
-        print(f"Initialized {len(self.agents)} agents and {len(self.tickets)} tickets")
+        if self.verbosity >= NORMAL:
+            print(f"Initialized {len(self.agents)} agents and {len(self.tickets)} tickets")
     
-    def process_all_tickets(self) -> List[Assignment]:
-        """Process all tickets and generate assignments with workload balancing."""
+    def process_all_tickets(self, max_in_flight: int = 1, batch_size: int = 1) -> List[Assignment]:
+        """Process all tickets and generate assignments with workload balancing.
+        
+        With batch_size > 1 several tickets share one LLM prompt. With
+        max_in_flight > 1 the LLM calls are dispatched concurrently; the output
+        order is the same as in the sequential path.
+        """
+        if self.backend == "local":
+            return self._process_locally()
+        if self.backend == "optimal":
+            return self.plan_all_tickets()
+        if max_in_flight > 1:
+            return asyncio.run(self.process_all_tickets_async(max_in_flight, batch_size))
+        
+        finished = self._start_journal()
+        pending = [ticket for ticket in self.tickets if ticket.ticket_id not in finished]
+        self.pool = AgentPool(self.agents)
+        total_tickets = len(self.tickets)
+        max_workload_per_agent = int(total_tickets * 0.11)  # 11% threshold
+        assignments = []
+        
+        if self.verbosity >= NORMAL:
+            print(f"Processing {total_tickets} tickets with max {max_workload_per_agent} tickets per agent")
+        
+        try:
+            for start, batch in self._iter_batches(batch_size, pending):
+                self._print_progress(len(finished) + start, batch, total_tickets)
+                assignments.extend(self._assign_batch(batch, total_tickets, max_workload_per_agent))
+        finally:
+            self._close_journal()
+        
+        self.assignments = self._merge_finished(finished, assignments)
+        self.metrics.increment("assignments", len(self.assignments))
+        return self.assignments
+    
+    def process_stream(self, output_path: str, batch_size: int = 1) -> int:
+        """Assign tickets as they are read and write each assignment immediately.
+        
+        Tickets are read lazily from the dataset (or tickets_path, JSON or
+        JSONL) and assignments go straight to output_path, so memory stays flat
+        regardless of ticket count and a crash keeps everything written so
+        far. Only per-agent counts are kept for the summary. Returns the
+        number of assignments written.
+        """
+        if self.backend == "optimal":
+            raise ValueError("The optimal backend plans the whole ticket set at once and cannot stream")
+        
+        self.agents = self.data_loader.load_agents()
+        self.pool = AgentPool(self.agents)
+        total_tickets = self.data_loader.count_tickets()
+        max_workload_per_agent = int(total_tickets * 0.11)  # 11% threshold
+        self.tickets = []
         self.assignments = []
+        self.streamed_counts = {}
+        self.streamed_total = total_tickets
+        
+        if self.verbosity >= NORMAL:
+            print(f"Streaming {total_tickets} tickets with max {max_workload_per_agent} tickets per agent")
+        
+        tickets = self.data_loader.iter_tickets()
+        start = 0
+        with AssignmentWriter(output_path) as writer:
+            while True:
+                batch = list(islice(tickets, max(1, batch_size)))
+                if not batch:
+                    break
+                self._print_progress(start, batch, total_tickets)
+                for assignment in self._assign_batch(batch, total_tickets, max_workload_per_agent):
+                    writer.write(assignment)
+                    agent_id = assignment.assigned_agent_id
+                    self.streamed_counts[agent_id] = self.streamed_counts.get(agent_id, 0) + 1
+                start += len(batch)
+        
+        self.metrics.increment("assignments", writer.count)
+        if self.verbosity >= NORMAL:
+            print(f"Assignments saved to {output_path}")
+        return writer.count
+    
+    def serve(self, ticket_queue: TicketQueue, output_path: str, batch_size: int = 16,
+              batch_wait: float = 0.05, window: int = 100, ticket_ttl: float = 0.0,
+              max_idle_seconds: Optional[float] = None, stdout: Optional[TextIO] = None) -> int:
+        """Run as a service: assign tickets from ticket_queue as they arrive.
+        
+        Agents are loaded once and kept in memory. Records are taken from the
+        queue in micro-batches of up to batch_size, waiting at most batch_wait
+        seconds for a batch to fill, and each assignment is written to
+        output_path (JSONL, or "-" for stdout, or the stream passed as stdout)
+        as soon as it is committed, with its latency since arrival recorded as
+        ticket_latency_seconds.
+        
+        A record with "event": "close" releases the load its ticket put on its
+        agent; with ticket_ttl > 0, tickets open that many seconds are released
+        too. Instead of a fixed ticket count, the 11% cap applies to the open
+        tickets, counted over at least window tickets so that a quiet queue
+        does not shrink the cap to nothing. Agents that were not Available
+        when loaded stay closed.
+        
+        Runs until the queue's sources are exhausted, nothing arrives for
+        max_idle_seconds, or the queue is stopped. Returns the number of
+        assignments written.
+        """
+        if self.backend == "optimal":
+            raise ValueError("The optimal backend plans the whole ticket set at once and cannot serve a queue")
+        
+        self.agents = self.data_loader.load_agents()
+        self.pool = AgentPool(self.agents)
+        self.tickets = []
+        self.assignments = []
+        
+        if self.verbosity >= NORMAL:
+            print(f"Serving {len(self.agents)} agents; the 11% cap applies to open tickets (window of at least {window})")
+        
+        last_activity = time.monotonic()
+        with AssignmentWriter(output_path, stdout) as writer:
+            state = ServiceState(self.agents, self.pool, self._assign_service_batch, writer, window,
+                                 self.metrics, verbose=self.verbosity >= VERBOSE)
+            self.streamed_counts = state.counts
+            while not ticket_queue.stop.is_set():
+                records = ticket_queue.next_batch(batch_size, batch_wait, timeout=0.2)
+                now = time.monotonic()
+                if ticket_ttl > 0:
+                    state.expire(now, ticket_ttl)
+                for record, arrived in records:
+                    state.receive(record, arrived)
+                state.flush()
+                self.streamed_total = writer.count
+                self.service_status = state.status()
+                if records:
+                    last_activity = now
+                
+                if ticket_queue.exhausted():
+                    break
+                if max_idle_seconds is not None and now - last_activity >= max_idle_seconds:
+                    break
+        
+        self.metrics.increment("assignments", writer.count)
+        if self.verbosity >= NORMAL:
+            print(f"Service stopped after {writer.count} assignments ({len(state.open_tickets)} tickets still open)")
+        return writer.count
+    
+    def _assign_service_batch(self, batch: List[Ticket], total_tickets: int,
+                              max_workload: int) -> List[Tuple[Assignment, bool]]:
+        """Assign a service micro-batch; each assignment comes with whether it added to its agent's load."""
+        self._load_deltas = []
+        try:
+            assignments = self._assign_batch(batch, total_tickets, max_workload)
+            return [(assignment, load_delta > 0) for assignment, load_delta in zip(assignments, self._load_deltas)]
+        finally:
+            self._load_deltas = None
+    
+    def _assign_batch(self, batch: List[Ticket], total_tickets: int, max_workload: int) -> List[Assignment]:
+        """Assign one batch of tickets and update agent workload."""
+        # Check if any agents are available
+        if not self.pool.has_available():
+            assignments = []
+            for ticket in batch:
+                if self.verbosity >= VERBOSE:
+                    print(f"Warning: No available agents for ticket {ticket.ticket_id}")
+                # Create a fallback assignment to the first agent
+                assignments.append(self._journal_assignment(self._create_fallback_assignment(ticket)))
+            return assignments
+        
+        results = self._request_assignments(batch, total_tickets)
+        return [
+            self._commit_assignment(ticket, assignment, max_workload)
+            for ticket, assignment in zip(batch, results)
+        ]
+    
+    async def process_all_tickets_async(self, max_in_flight: int, batch_size: int = 1) -> List[Assignment]:
+        """Process all tickets with up to max_in_flight concurrent LLM calls.
+        
+        Every in-flight ticket holds one slot of the remaining agent capacity,
+        so a request is only dispatched while free capacity covers the tickets
+        already in flight. Results are committed one at a time on the event
+        loop and re-routed if the chosen agent filled up meanwhile, which keeps
+        every agent within the 11% cap.
+        """
+        finished = self._start_journal()
+        pending = [ticket for ticket in self.tickets if ticket.ticket_id not in finished]
+        self.pool = AgentPool(self.agents)
         total_tickets = len(self.tickets)
         max_workload_per_agent = int(total_tickets * 0.11)  # 11% threshold
+        results: List[Optional[Assignment]] = [None] * len(pending)
+        capacity_changed = asyncio.Condition()
+        in_flight_requests = 0
+        reserved = 0
         
-        print(f"Processing {total_tickets} tickets with max {max_workload_per_agent} tickets per agent")
+        if self.verbosity >= NORMAL:
+            print(f"Processing {total_tickets} tickets with max {max_workload_per_agent} tickets per agent "
+                  f"({max_in_flight} concurrent requests)")
         
-        for i, ticket in enumerate(self.tickets, 1):
-            print(f"Processing ticket {i}/{len(self.tickets)}: {ticket.ticket_id}")
+        def can_dispatch(size: int) -> bool:
+            if in_flight_requests >= max_in_flight:
+                return False
+            return reserved == 0 or self._free_capacity(max_workload_per_agent) - reserved >= size
+        
+        async def assign(start: int, batch: List[Ticket]):
+            nonlocal in_flight_requests, reserved
+            batch_results = await asyncio.to_thread(self._request_assignments, batch, total_tickets)
+            
+            async with capacity_changed:
+                try:
+                    for offset, (ticket, assignment) in enumerate(zip(batch, batch_results)):
+                        results[start + offset] = self._commit_assignment(ticket, assignment, max_workload_per_agent)
+                finally:
+                    # Release the slots even if a commit fails, so the dispatcher never waits forever
+                    in_flight_requests -= 1
+                    reserved -= len(batch)
+                    capacity_changed.notify_all()
+        
+        tasks = []
+        try:
+            for start, batch in self._iter_batches(batch_size, pending):
+                async with capacity_changed:
+                    await capacity_changed.wait_for(lambda: can_dispatch(len(batch)))
+                    if self._free_capacity(max_workload_per_agent) == 0:
+                        for offset, ticket in enumerate(batch):
+                            if self.verbosity >= VERBOSE:
+                                print(f"Warning: No available agents for ticket {ticket.ticket_id}")
+                            results[start + offset] = self._journal_assignment(self._create_fallback_assignment(ticket))
+                        continue
+                    in_flight_requests += 1
+                    reserved += len(batch)
+                self._print_progress(len(finished) + start, batch, total_tickets)
+                tasks.append(asyncio.create_task(assign(start, batch)))
             
+            await asyncio.gather(*tasks)
+        finally:
+            self._close_journal()
+        self.assignments = self._merge_finished(finished, [assignment for assignment in results if assignment is not None])
+        self.metrics.increment("assignments", len(self.assignments))
+        return self.assignments
+    
+    def process_sharded(self, workers: int, assigner_factory: Optional[AssignerFactory] = None,
+                        chunk_size: int = 64) -> List[Assignment]:
+        """Assign tickets with a pool of worker processes.
+        
+        The ticket list is cut into chunks that worker processes assign in
+        parallel, so prompt building, skill extraction, rationales and local
+        scoring are no longer bound to one core. Agent loads live in a
+        shared-memory ledger that every commit goes through, keeping the 11%
+        cap global. Assignments come back in ticket order; the final loads are
+        written back to self.agents. The LLM backends need an
+        assigner_factory, since LLM clients cannot be sent to other processes.
+        """
+        if self.backend == "optimal":
+            raise ValueError("The optimal backend plans the whole ticket set at once and cannot be sharded")
+        if assigner_factory is None:
+            if self.backend != "local":
+                raise ValueError(f"Sharding the {self.backend} backend requires an assigner_factory")
+            assigner_factory = AssignerFactory("local", self.local_scorer)
+        
+        total_tickets = len(self.tickets)
+        max_workload_per_agent = int(total_tickets * 0.11)  # 11% threshold
+        
+        if self.verbosity >= NORMAL:
+            print(f"Processing {total_tickets} tickets with max {max_workload_per_agent} tickets per agent "
+                  f"({workers} worker processes)")
+        
+        with self.metrics.timer("sharded_seconds"):
+            self.assignments, loads, states = assign_sharded(
+                self.tickets, self.agents, total_tickets, assigner_factory, workers, chunk_size,
+                metrics=self.metrics, verbose=self.verbosity >= VERBOSE
+            )
+        
+        for agent, load, state in zip(self.agents.values(), loads, states):
+            agent.current_load = load
+            if state == FULL:
+                agent.availability_status = "UNAVAILABLE"
+        self.pool = AgentPool(self.agents)
+        self.metrics.increment("assignments", len(self.assignments))
+        return self.assignments
+    
+    def _process_locally(self) -> List[Assignment]:
+        """Assign all tickets with the local scorer in a single vectorized pass."""
+        total_tickets = len(self.tickets)
+        max_workload_per_agent = int(total_tickets * 0.11)  # 11% threshold
+        
+        if self.verbosity >= NORMAL:
+            print(f"Scoring {total_tickets} tickets locally with max {max_workload_per_agent} tickets per agent")
+        
+        self.pool = AgentPool(self.agents)
+        with self.metrics.timer("local_scoring_seconds"):
+            results = self.local_scorer.assign_all(self.tickets, self.agents, total_tickets)
+        # assign_all updates agent loads in bulk; re-index them once
+        for agent_id in self.agents:
+            self.pool.update(agent_id)
+        self.assignments = [
+            assignment if assignment is not None else self._create_fallback_assignment(ticket, reason="no available agents")
+            for ticket, assignment in zip(self.tickets, results)
+        ]
+        self.metrics.increment("assignments", len(self.assignments))
+        return self.assignments
+    
+    def plan_all_tickets(self) -> List[Assignment]:
+        """Assign all tickets with a global capacity-constrained plan.
+        
+        Instead of letting early tickets grab the best agents, the whole ticket
+        set is solved as one transportation problem with per-agent capacity
+        equal to the 11% cap, then written out in ticket order. Tickets beyond
+        the total capacity are fallbacks, placed by a second plan only after
+        the whole first plan is committed, so they never take capacity it
+        relies on (see CapacityPlanner.plan_overflow).
+        """
+        total_tickets = len(self.tickets)
+        max_workload_per_agent = int(total_tickets * 0.11)  # 11% threshold
+        
+        if self.verbosity >= NORMAL:
+            print(f"Planning {total_tickets} tickets with max {max_workload_per_agent} tickets per agent")
+        
+        self.pool = AgentPool(self.agents)
+        planner = CapacityPlanner(self.local_scorer)
+        with self.metrics.timer("planning_seconds"):
+            planned_agent_ids = planner.plan(self.tickets, self.agents, total_tickets)
+            leftover = [ticket for ticket, agent_id in zip(self.tickets, planned_agent_ids) if agent_id is None]
+            planned_counts = Counter(agent_id for agent_id in planned_agent_ids if agent_id is not None)
+            overflow_agent_ids = iter(planner.plan_overflow(leftover, self.agents, total_tickets, planned_counts)
+                                      if leftover else [])
+        
+        self.assignments = []
+        for ticket, agent_id in zip(self.tickets, planned_agent_ids):
+            if agent_id is None:
+                self.assignments.append(None)
+                continue
+            self.assignments.append(Assignment(
+                ticket_id=ticket.ticket_id,
+                title=ticket.title,
+                assigned_agent_id=agent_id,
+                rationale=build_rationale(ticket, self.agents[agent_id])
+            ))
+            self._update_agent_workload(agent_id, max_workload_per_agent)
+        for position, ticket in enumerate(self.tickets):
+            if self.assignments[position] is None:
+                agent_id = next(overflow_agent_ids)
+                self.assignments[position] = self._create_fallback_assignment(
+                    ticket, reason="no available agents", agent=self.agents[agent_id] if agent_id else None)
+        self.metrics.increment("assignments", len(self.assignments))
+        return self.assignments
+    
+    def update_agent(self, agent_id: str, availability_status: Optional[str] = None,
+                     current_load: Optional[int] = None, skills: Optional[Dict[str, int]] = None,
+                     rebalance: bool = False, batch_size: int = 1) -> List[Assignment]:
+        """Apply a mid-shift change of one agent and re-assign only the tickets it affects.
+        
+        Tickets held by the agent are re-assigned with the run's assigner when
+        it goes offline (availability_status other than "Available") or its
+        skills change; a current_load above the 11% cap releases its most
+        recent tickets until it is back at the cap. A current_load below the
+        cap reopens an agent that was closed by the cap. With rebalance, the
+        agent also takes over tickets mentioning its skills where its local
+        score beats the current agent's by the scorer's confidence_margin,
+        while it has capacity. All other assignments and their rationales are
+        left as they are.
+        
+        Returns the new assignments (already swapped into self.assignments).
+        """
+        if agent_id not in self.agents:
+            raise ValueError(f"Unknown agent '{agent_id}'")
+        index = self._assignment_index()
+        max_workload_per_agent = int(len(self.tickets) * 0.11)  # 11% threshold
+        agent = self.agents[agent_id]
+        was_capped = not agent.is_available() and agent.current_load >= max_workload_per_agent
+        released = set()
+        
+        if skills is not None:
+            agent.skills = SkillLevels(skills)
+            self._invalidate_skill_indexes()
+            released.update(index.held_by(agent_id))
+        if availability_status is not None:
+            agent.availability_status = availability_status
+            if not agent.is_available():
+                released.update(index.held_by(agent_id))
+        if current_load is not None:
+            agent.current_load = current_load
+            kept = [position for position in index.held_by(agent_id) if position not in released]
+            excess = min(len(kept), current_load - max_workload_per_agent)
+            if excess > 0:
+                released.update(kept[-excess:])
+            if availability_status is None:
+                if current_load >= max_workload_per_agent:
+                    agent.availability_status = "UNAVAILABLE"
+                elif was_capped:
+                    agent.availability_status = "Available"
+        self.pool.update(agent_id)
+        
+        keep_closed = agent_id if availability_status is not None else None
+        return self._replan(index, agent_id, sorted(released), rebalance, batch_size, keep_closed)
+    
+    def add_agent(self, agent: Agent, rebalance: bool = True) -> List[Assignment]:
+        """Add an agent mid-shift; with rebalance, move tickets it is clearly better suited for.
+        
+        See update_agent for how tickets are picked. Returns the assignments
+        that moved to the new agent.
+        """
+        if agent.agent_id in self.agents:
+            raise ValueError(f"Agent '{agent.agent_id}' already exists")
+        index = self._assignment_index()
+        self.agents[agent.agent_id] = agent
+        self.pool.add(agent.agent_id)
+        self._invalidate_skill_indexes()
+        return self._replan(index, agent.agent_id, [], rebalance, 1, None)
+    
+    def _invalidate_skill_indexes(self):
+        """Make the local scorer and the LLM shortlist re-read agent skills on next use."""
+        self.local_scorer.invalidate()
+        if self.llm_assigner is not None and self.llm_assigner.shortlist is not None:
+            self.llm_assigner.shortlist.invalidate()
+    
+    def _assignment_index(self) -> AssignmentIndex:
+        """Index of the current assignments, rebuilt only after a new run."""
+        if self.streamed_counts is not None:
+            raise ValueError("Streamed runs keep no assignments to re-plan")
+        if not self.assignments:
+            raise ValueError("Process the tickets before re-planning")
+        if self._replan_index is None or self._replan_index.assignments is not self.assignments:
+            self._replan_index = AssignmentIndex(self.tickets, self.assignments)
+        if self.pool.agents is not self.agents:
+            self.pool = AgentPool(self.agents)
+        return self._replan_index
+    
+    def _replan(self, index: AssignmentIndex, agent_id: str, released: List[int], rebalance: bool,
+                batch_size: int, keep_closed: Optional[str]) -> List[Assignment]:
+        """Re-assign the released tickets, then optionally rebalance towards agent_id."""
+        total_tickets = len(self.tickets)
+        max_workload_per_agent = int(total_tickets * 0.11)  # 11% threshold
+        changed = []
+        
+        with self.metrics.timer("replan_seconds"):
+            for position in released:
+                self._release_ticket(index, position, max_workload_per_agent, keep_closed)
+            tickets = [index.tickets[position] for position in released]
+            if self.backend not in LLM_BACKENDS:
+                # The local scorer counts loads within a batch, so one batch is enough
+                batch_size = len(tickets)
+            for start, batch in self._iter_batches(batch_size, tickets):
+                for offset, assignment in enumerate(self._assign_batch(batch, total_tickets, max_workload_per_agent)):
+                    index.replace(released[start + offset], assignment)
+                    changed.append(assignment)
+            if rebalance:
+                changed.extend(self._rebalance_to(index, agent_id, max_workload_per_agent))
+        
+        self.metrics.increment("replanned_tickets", len(changed))
+        if self.verbosity >= NORMAL:
+            print(f"Re-planned {len(changed)} tickets after update of agent {agent_id}")
+        return changed
+    
+    def _release_ticket(self, index: AssignmentIndex, position: int, max_workload: int,
+                        keep_closed: Optional[str] = None):
+        """Take a ticket off its agent's load, reopening the agent if the cap had closed it."""
+        agent_id = index.agent_at(position)
+        agent = self.agents.get(agent_id)
+        if agent is None:
+            return
+        capped = not agent.is_available() and agent.current_load >= max_workload
+        agent.current_load = max(0, agent.current_load - 1)
+        if capped and agent.current_load < max_workload and agent_id != keep_closed:
+            agent.availability_status = "Available"
+        self.pool.update(agent_id)
+    
+    def _rebalance_to(self, index: AssignmentIndex, agent_id: str, max_workload: int) -> List[Assignment]:
+        """Move tickets mentioning the agent's skills to it where it scores clearly better.
+        
+        Only tickets sharing a skill with the agent are scored, so the work
+        grows with the agent's share of the backlog, not with the backlog.
+        Largest gains move first.
+        """
+        agent = self.agents[agent_id]
+        if not self._has_capacity(agent_id, max_workload):
+            return []
+        candidates = [position for position in index.matching(agent.skills) if index.agent_at(position) != agent_id]
+        if not candidates:
+            return []
+        
+        static = self.local_scorer.static_scores([index.ticket_skills(position) for position in candidates], self.agents)
+        columns = {candidate_id: column for column, candidate_id in enumerate(self.local_scorer.agent_ids)}
+        target = columns[agent_id]
+        gains = []
+        for row, position in enumerate(candidates):
+            current = columns.get(index.agent_at(position))
+            gain = static[row, target] - (static[row, current] if current is not None else 0.0)
+            if gain > self.local_scorer.confidence_margin:
+                gains.append((float(gain), position))
+        gains.sort(key=lambda item: -item[0])
+        
+        moved = []
+        for _, position in gains:
+            if not self._has_capacity(agent_id, max_workload):
+                break
+            self._release_ticket(index, position, max_workload)
+            ticket = index.tickets[position]
+            assignment = Assignment(
+                ticket_id=ticket.ticket_id,
+                title=ticket.title,
+                assigned_agent_id=agent_id,
+                rationale=build_rationale(ticket, agent, index.ticket_skills(position))
+            )
+            self._update_agent_workload(agent_id, max_workload)
+            index.replace(position, assignment)
+            moved.append(assignment)
+        self.metrics.increment("rebalanced_tickets", len(moved))
+        return moved
+    
+    def _iter_batches(self, batch_size: int, tickets: Optional[List[Ticket]] = None):
+        """Yield (start index, tickets) chunks of at most batch_size tickets (default: all tickets)."""
+        tickets = self.tickets if tickets is None else tickets
+        batch_size = max(1, batch_size)
+        for start in range(0, len(tickets), batch_size):
+            yield start, tickets[start:start + batch_size]
+    
+    def _print_progress(self, start: int, batch: List[Ticket], total_tickets: int):
+        """Print which ticket(s) are being sent to the LLM (verbose mode only)."""
+        if self.verbosity < VERBOSE:
+            return
+        if len(batch) == 1:
+            print(f"Processing ticket {start + 1}/{total_tickets}: {batch[0].ticket_id}")
+        else:
+            print(f"Processing tickets {start + 1}-{start + len(batch)}/{total_tickets}")
+    
+    def _request_assignments(self, batch: List[Ticket], total_tickets: int) -> List[Optional[Assignment]]:
+        """Ask the assigner for assignments; None marks a ticket that needs a fallback.
+        
+        Multi-ticket batches go out as one prompt. Tickets whose batch answer
+        fails validation are retried with a single-ticket prompt. While the
+        LLM request scheduler's circuit is open, the batch (or what is left of
+        it) is scored locally in one pass instead of falling back to the
+        least-loaded agent, without further single-ticket retries.
+        """
+        started = time.perf_counter()
+        scored_locally = False
+        if len(batch) > 1:
             try:
-                # Check if any agents are available
-                available_agents = [a for a in self.agents.values() if a.is_available()]
-                if not available_agents:
-                    print(f"Warning: No available agents for ticket {ticket.ticket_id}")
-                    # Create a fallback assignment to the first agent
-                    fallback_assignment = self._create_fallback_assignment(ticket)
-                    self.assignments.append(fallback_assignment)
-                    continue
-                
-                assignment = self.llm_assigner.assign_ticket(ticket, self.agents, total_tickets)
-                self.assignments.append(assignment)
-                
-                # Update agent workload
-                if assignment.assigned_agent_id in self.agents:
-                    self.agents[assignment.assigned_agent_id].current_load += 1
-                    
-                    # Check if agent has reached the 11% threshold
-                    if self.agents[assignment.assigned_agent_id].current_load >= max_workload_per_agent:
-                        self.agents[assignment.assigned_agent_id].availability_status = "UNAVAILABLE"
-                        print(f"Agent {assignment.assigned_agent_id} marked as UNAVAILABLE (workload: {self.agents[assignment.assigned_agent_id].current_load})")
-                
+                results = self.assigner.assign_tickets(batch, self.pool, total_tickets)
+            except CircuitOpenError:
+                # Each single-ticket retry would hit the open circuit too
+                results = self._assign_locally(batch, total_tickets)
+                scored_locally = True
+            except Exception as e:
+                print(f"Error processing batch starting at {batch[0].ticket_id}: {e}")
+                results = [None] * len(batch)
+        else:
+            results = [None]
+        
+        for i, ticket in enumerate(batch):
+            if results[i] is not None or scored_locally:
+                continue
+            if len(batch) > 1:
+                self.metrics.increment("single_ticket_retries")
+            try:
+                results[i] = self.assigner.assign_ticket(ticket, self.pool, total_tickets)
+            except CircuitOpenError:
+                # Score the rest of the batch together, so the loads it adds are counted
+                pending = [j for j in range(i, len(batch)) if results[j] is None]
+                for j, assignment in zip(pending, self._assign_locally([batch[j] for j in pending], total_tickets)):
+                    results[j] = assignment
+                break
             except Exception as e:
                 print(f"Error processing ticket {ticket.ticket_id}: {e}")
-                # Create a fallback assignment
-                fallback_assignment = self._create_fallback_assignment(ticket)
-                self.assignments.append(fallback_assignment)
         
-        return self.assignments
+        per_ticket = (time.perf_counter() - started) / len(batch)
+        for _ in batch:
+            self.metrics.observe("ticket_seconds", per_ticket)
+        return results
+    
+    def _assign_locally(self, tickets: List[Ticket], total_tickets: int) -> List[Optional[Assignment]]:
+        """Score tickets with the local scorer while the LLM API is unavailable (None where no agent is open)."""
+        self.metrics.increment("circuit_local_decisions", len(tickets))
+        return self.local_scorer.assign_tickets(tickets, self.pool, total_tickets)
+    
+    def _commit_assignment(self, ticket: Ticket, assignment: Optional[Assignment], max_workload: int) -> Assignment:
+        """Record an assignment against agent workload, or fall back."""
+        if assignment is None:
+            # Create a fallback assignment
+            return self._journal_assignment(self._create_fallback_assignment(ticket))
+        
+        if not self._has_capacity(assignment.assigned_agent_id, max_workload):
+            if self._free_capacity(max_workload) == 0:
+                if self.verbosity >= VERBOSE:
+                    print(f"Warning: No available agents for ticket {ticket.ticket_id}")
+                return self._journal_assignment(self._create_fallback_assignment(ticket))
+            # Another assignment took the last slot of this agent meanwhile
+            assignment = self._create_fallback_assignment(ticket, reason="agent capacity reached")
+        
+        # Update agent workload
+        self._update_agent_workload(assignment.assigned_agent_id, max_workload)
+        return self._journal_assignment(assignment, load_delta=1)
+    
+    def _start_journal(self) -> Dict[str, Assignment]:
+        """Open the journal for this run; returns the assignments replayed on resume.
+        
+        Replaying applies each recorded load delta and availability status to
+        the freshly loaded agents, so the roster ends up exactly as it was
+        when the interrupted run wrote its last record.
+        """
+        if self.journal is None:
+            return {}
+        
+        # Digest of the roster as loaded, before replay changes it
+        header = {"backend": self.backend, "total_tickets": len(self.tickets),
+                  "data": run_digest(self.agents, self.tickets)}
+        finished: Dict[str, Assignment] = {}
+        previous, records = self.journal.replay() if self.resume else (None, [])
+        if previous is not None:
+            if previous.get("data") != header["data"]:
+                raise ValueError(f"Journal {self.journal.path} was written for different agents or tickets")
+            for record in records:
+                agent = self.agents.get(record["assigned_agent_id"])
+                if agent is not None:
+                    agent.current_load += record["load_delta"]
+                    agent.availability_status = record["availability_status"]
+                finished[record["ticket_id"]] = Assignment(
+                    ticket_id=record["ticket_id"],
+                    title=record["title"],
+                    assigned_agent_id=record["assigned_agent_id"],
+                    rationale=record["rationale"]
+                )
+            self.metrics.increment("resumed_assignments", len(finished))
+            if self.verbosity >= NORMAL:
+                print(f"Resumed {len(finished)} assignments from {self.journal.path}")
+        
+        self.journal.start(header, append=previous is not None)
+        self._active_journal = self.journal
+        return finished
+    
+    def _journal_assignment(self, assignment: Assignment, load_delta: int = 0) -> Assignment:
+        """Append a committed assignment to the journal of the current run (if any)."""
+        if self._load_deltas is not None:
+            self._load_deltas.append(load_delta)
+        if self._active_journal is not None:
+            agent = self.agents.get(assignment.assigned_agent_id)
+            status = agent.availability_status if agent is not None else ""
+            self._active_journal.record(assignment, load_delta, status)
+        return assignment
+    
+    def _close_journal(self):
+        """Sync and close the journal of the current run."""
+        if self._active_journal is not None:
+            self._active_journal.close()
+            self._active_journal = None
     
-    def _create_fallback_assignment(self, ticket: Ticket) -> Assignment:
-        """Create a fallback assignment when LLM fails."""
-        # Find the agent with the lowest current load among available agents
-        available_agents = [a for a in self.agents.values() if a.is_available()]
-        if not available_agents:
+    def _merge_finished(self, finished: Dict[str, Assignment], assignments: List[Assignment]) -> List[Assignment]:
+        """Combine replayed and new assignments in ticket order."""
+        if not finished:
+            return assignments
+        new_assignments = iter(assignments)
+        return [
+            finished[ticket.ticket_id] if ticket.ticket_id in finished else next(new_assignments)
+            for ticket in self.tickets
+        ]
+    
+    def _has_capacity(self, agent_id: str, max_workload: int) -> bool:
+        """Check if an agent can take one more ticket without exceeding the cap."""
+        agent = self.agents.get(agent_id)
+        return agent is not None and agent.is_available() and agent.current_load < max_workload
+    
+    def _free_capacity(self, max_workload: int) -> int:
+        """Total number of tickets the available agents can still take."""
+        return self.pool.free_capacity(max_workload)
+    
+    def _update_agent_workload(self, agent_id: str, max_workload: int):
+        """Count a new ticket against an agent and mark it UNAVAILABLE at the cap."""
+        if agent_id not in self.agents:
+            return
+        agent = self.agents[agent_id]
+        agent.current_load += 1
+        
+        # Check if agent has reached the 11% threshold
+        if agent.current_load >= max_workload:
+            agent.availability_status = "UNAVAILABLE"
+            if self.verbosity >= NORMAL:
+                print(f"Agent {agent_id} marked as UNAVAILABLE (workload: {agent.current_load})")
+        self.pool.update(agent_id)
+    
+    def _create_fallback_assignment(self, ticket: Ticket, reason: str = "processing error",
+                                    agent: Optional[Agent] = None) -> Assignment:
+        """Create a fallback assignment when LLM fails (to agent, if the caller already chose one)."""
+        self.metrics.increment("fallbacks", reason=reason)
+        # Find the least-loaded available agent, preferring ones with a matching skill
+        assigned_agent = agent or self.pool.least_loaded(extract_relevant_skills(ticket))
+        if assigned_agent is None:
             # If no available agents, use the first one (emergency fallback)
-            assigned_agent = list(self.agents.values())[0]
-        else:
-            assigned_agent = min(available_agents, key=lambda a: a.current_load)
+            assigned_agent = next(iter(self.agents.values()))
         
         return Assignment(
             ticket_id=ticket.ticket_id,
             title=ticket.title,
             assigned_agent_id=assigned_agent.agent_id,
-            rationale=f"Fallback assignment to {assigned_agent.name} due to processing error"
+            rationale=f"Fallback assignment to {assigned_agent.name} due to {reason}"
         )
     
     def save_assignments(self, output_path: str):
-        """Save assignments to JSON file in the required format."""
-        output_data = {
-            "sample_output": [
-                {
-                    "ticket_id": assignment.ticket_id,
-                    "title": assignment.title,
-                    "assigned_agent_id": assignment.assigned_agent_id,
-                    "rationale": assignment.rationale
-                }
-                for assignment in self.assignments
-            ]
-        }
-        
-        with open(output_path, 'w', encoding='utf-8') as file:
-            json.dump(output_data, file, indent=2, ensure_ascii=False)
-        
-        print(f"Assignments saved to {output_path}")
+        """Save assignments to JSON file in the required format (JSONL for .jsonl paths)."""
+        with self.metrics.timer("save_seconds"):
+            with AssignmentWriter(output_path) as writer:
+                for assignment in self.assignments:
+                    writer.write(assignment)
+        
+        if self.verbosity >= NORMAL:
+            print(f"Assignments saved to {output_path}")
     
     def get_assignment_summary(self) -> Dict:
         """Get a summary of assignments for analysis."""
-        agent_assignments = {}
-        for assignment in self.assignments:
-            agent_id = assignment.assigned_agent_id
-            if agent_id not in agent_assignments:
-                agent_assignments[agent_id] = []
-            agent_assignments[agent_id].append(assignment.ticket_id)
-        
-        total_tickets = len(self.tickets)
-        max_workload = int(total_tickets * 0.11)
-        
-        # Calculate workload distribution
-        workload_distribution = {}
-        for agent_id, tickets in agent_assignments.items():
-            current_load = len(tickets)
-            workload_percentage = (current_load / total_tickets) * 100
-            workload_distribution[agent_id] = {
-                "tickets": current_load,
-                "percentage": round(workload_percentage, 2),
-                "status": "OVER_LIMIT" if current_load > max_workload else "WITHIN_LIMIT"
+        if self.streamed_counts is not None:
+            summary = workload_summary(self.streamed_counts, self.streamed_total)
+        else:
+            summary = workload_summary(count_assignments(self.assignments), len(self.tickets))
+        summary = {"backend": self.backend, **summary}
+        if self.llm_assigner is not None and self.llm_assigner.cache is not None:
+            summary["llm_cache"] = self.llm_assigner.cache.stats()
+        if self.dedup is not None:
+            summary["duplicate_clusters"] = self.dedup.summary()
+        if isinstance(self.assigner, HybridAssigner):
+            summary["decisions"] = {
+                "local": self.assigner.local_decisions,
+                "llm": self.assigner.llm_decisions
             }
-        
-        return {
-            "total_tickets": total_tickets,
-            "total_assignments": len(self.assignments),
-            "agents_used": len(agent_assignments),
-            "max_workload_per_agent": max_workload,
-            "workload_distribution": workload_distribution,
-            "assignments_per_agent": {agent_id: len(tickets) for agent_id, tickets in agent_assignments.items()}
-        }
+        return summary
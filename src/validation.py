@@ -0,0 +1,95 @@
+"""
+Schema validation of datasets and ticket files without loading them into memory.
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+from .data_loader import iter_json_array, iter_jsonl
+
+
+AGENT_FIELDS = {
+    "agent_id": str,
+    "name": str,
+    "skills": dict,
+    "current_load": int,
+    "availability_status": str,
+    "experience_level": int
+}
+TICKET_FIELDS = {
+    "ticket_id": str,
+    "title": str,
+    "description": str,
+    "creation_timestamp": int
+}
+
+
+def _check_fields(record, fields: Dict[str, type], label: str) -> List[str]:
+    """Problems with the required fields of one record."""
+    if not isinstance(record, dict):
+        return [f"{label}: expected an object, got {type(record).__name__}"]
+    problems = []
+    for field, expected in fields.items():
+        if field not in record:
+            problems.append(f"{label}: missing '{field}'")
+        elif not isinstance(record[field], expected) or isinstance(record[field], bool):
+            problems.append(f"{label}: '{field}' should be {expected.__name__}, got {type(record[field]).__name__}")
+    return problems
+
+
+def check_ticket(record) -> List[str]:
+    """Problems with one incoming ticket record (empty when valid)."""
+    label = f"ticket {record.get('ticket_id')}" if isinstance(record, dict) else "ticket"
+    return _check_fields(record, TICKET_FIELDS, label)
+
+
+def _check_records(records: Iterable, fields: Dict[str, type], kind: str, id_field: str) -> Tuple[int, List[str]]:
+    """Count records and collect problems, including duplicate ids."""
+    seen = set()
+    problems = []
+    count = 0
+    for count, record in enumerate(records, 1):
+        label = f"{kind} #{count}"
+        if isinstance(record, dict) and isinstance(record.get(id_field), str):
+            label = f"{kind} {record[id_field]}"
+            if record[id_field] in seen:
+                problems.append(f"{label}: duplicate {id_field}")
+            seen.add(record[id_field])
+        problems.extend(_check_fields(record, fields, label))
+        if kind == "agent" and isinstance(record, dict):
+            problems.extend(_check_agent(record, label))
+    return count, problems
+
+
+def _check_agent(record: Dict, label: str) -> List[str]:
+    """Problems specific to agent records (skill levels, load)."""
+    problems = []
+    skills = record.get("skills")
+    if isinstance(skills, dict):
+        for skill, level in skills.items():
+            if not isinstance(level, (int, float)) or isinstance(level, bool) or level < 0:
+                problems.append(f"{label}: skill '{skill}' should have a non-negative level, got {level!r}")
+    load = record.get("current_load")
+    if isinstance(load, int) and load < 0:
+        problems.append(f"{label}: negative current_load")
+    return problems
+
+
+def validate_dataset(dataset_path: str, tickets_path: Optional[str] = None) -> Tuple[Dict[str, int], List[str]]:
+    """Check a dataset (and optional separate ticket file) against the expected schema.
+    
+    Returns the record counts and a list of problems (empty when valid).
+    Files are streamed, so this works on backlogs of any size. Malformed
+    JSON raises ValueError.
+    """
+    tickets_path = tickets_path or dataset_path
+    agent_count, problems = _check_records(iter_json_array(dataset_path, 'agents'), AGENT_FIELDS, "agent", "agent_id")
+    if tickets_path.endswith('.jsonl'):
+        tickets = iter_jsonl(tickets_path)
+    else:
+        tickets = iter_json_array(tickets_path, 'tickets')
+    ticket_count, ticket_problems = _check_records(tickets, TICKET_FIELDS, "ticket", "ticket_id")
+    problems.extend(ticket_problems)
+    
+    if agent_count == 0:
+        problems.append("no agents found")
+    if ticket_count == 0:
+        problems.append("no tickets found")
+    return {"agents": agent_count, "tickets": ticket_count}, problems
@@ -0,0 +1,88 @@
+"""
+Shared fixtures: small agent rosters and datasets written to a temporary directory.
+"""
+import json
+import os
+import sys
+import pytest
+
+# Tests import the package as src, the way main.py does
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_llm import FakeLLM
+from src.llm_assigner import LLMAssigner
+from src.models import Agent, Ticket
+
+
+def agent_record(agent_id: str, skills=None, current_load: int = 0, availability_status: str = "Available",
+                 experience_level: int = 5) -> dict:
+    """An agent in the dataset's JSON format."""
+    return {
+        "agent_id": agent_id,
+        "name": agent_id.replace("_", " ").title(),
+        "skills": skills or {},
+        "current_load": current_load,
+        "availability_status": availability_status,
+        "experience_level": experience_level
+    }
+
+
+def ticket_record(ticket_id: str, title: str, description: str = "", creation_timestamp: int = 1757827200) -> dict:
+    """A ticket in the dataset's JSON format."""
+    return {"ticket_id": ticket_id, "title": title, "description": description,
+            "creation_timestamp": creation_timestamp}
+
+
+@pytest.fixture
+def make_agent():
+    """Build an Agent from keyword arguments (see agent_record)."""
+    def make(agent_id: str, **fields) -> Agent:
+        return Agent(**agent_record(agent_id, **fields))
+    return make
+
+
+@pytest.fixture
+def make_ticket():
+    """Build a Ticket from its title (and optional description and timestamp)."""
+    def make(ticket_id: str, title: str, description: str = "", creation_timestamp: int = 1757827200) -> Ticket:
+        return Ticket(ticket_id, title, description, creation_timestamp)
+    return make
+
+
+@pytest.fixture
+def write_dataset(tmp_path):
+    """Write a dataset of agent and ticket records; returns its path."""
+    def write(agents, tickets, name: str = "dataset.json") -> str:
+        path = tmp_path / name
+        path.write_text(json.dumps({"agents": agents, "tickets": tickets}), encoding="utf-8")
+        return str(path)
+    return write
+
+
+@pytest.fixture
+def support_dataset(write_dataset):
+    """Four agents with distinct skills and twenty tickets that mention them."""
+    agents = [
+        agent_record("agent_net", {"Networking": 9, "VPN_Troubleshooting": 8}, current_load=1, experience_level=8),
+        agent_record("agent_win", {"Windows_Server_2022": 8, "Active_Directory": 9}, experience_level=6),
+        agent_record("agent_db", {"Database_SQL": 9, "Cloud_AWS": 6}, current_load=2, experience_level=7),
+        agent_record("agent_hw", {"Hardware_Diagnostics": 9, "Laptop_Repair": 8}, experience_level=4),
+    ]
+    titles = [
+        "VPN tunnel keeps dropping", "Active Directory account locked", "SQL database query timeout",
+        "Laptop screen flickering", "Network switch port down"
+    ]
+    tickets = [
+        ticket_record(f"TKT-{index:03d}", titles[index % len(titles)], "Please help.", 1757827200 + 60 * index)
+        for index in range(20)
+    ]
+    return write_dataset(agents, tickets)
+
+
+@pytest.fixture
+def fake_llm():
+    """Build an LLMAssigner answered by the benchmarks' FakeLLM (no network); returns (assigner, fake)."""
+    def make(fake=None, **assigner_options):
+        fake = fake or FakeLLM()
+        return LLMAssigner("fake-key", agent_factory=lambda: fake, **assigner_options), fake
+    return make
@@ -0,0 +1,92 @@
+"""
+Tests for the load- and skill-indexed agent pool.
+"""
+import random
+import pytest
+from src.agent_pool import AgentPool
+
+
+@pytest.fixture
+def agents(make_agent):
+    roster = [
+        make_agent("a1", skills={"Networking": 8}, current_load=2),
+        make_agent("a2", skills={"Database_SQL": 7}, current_load=1),
+        make_agent("a3", skills={"Networking": 5}, current_load=1),
+        make_agent("a4", current_load=0, availability_status="Offline"),
+    ]
+    return {agent.agent_id: agent for agent in roster}
+
+
+def test_behaves_like_the_agents_dict(agents):
+    pool = AgentPool(agents)
+    assert dict(pool) == agents
+    assert len(pool) == 4
+    assert pool["a2"] is agents["a2"]
+
+
+def test_least_loaded_prefers_skilled_agents(agents):
+    pool = AgentPool(agents)
+    assert pool.least_loaded().agent_id == "a2"  # a3 has the same load but comes later
+    assert pool.least_loaded(["Networking"]).agent_id == "a3"
+    assert pool.least_loaded(["Networking", "Database_SQL"]).agent_id == "a2"
+    assert pool.least_loaded(["Cloud_AWS"]).agent_id == "a2"
+
+
+def test_updates_follow_load_and_availability(agents):
+    pool = AgentPool(agents)
+    agents["a3"].current_load = 4
+    pool.update("a3")
+    assert pool.least_loaded(["Networking"]).agent_id == "a1"
+    
+    agents["a1"].availability_status = "UNAVAILABLE"
+    pool.update("a1")
+    assert pool.least_loaded(["Networking"]).agent_id == "a3"
+    
+    agents["a4"].availability_status = "Available"
+    pool.update("a4")
+    assert pool.least_loaded().agent_id == "a4"
+
+
+def test_counters_track_capacity(agents):
+    pool = AgentPool(agents)
+    assert pool.has_available()
+    assert pool.free_capacity(5) == 3 * 5 - 4
+    
+    for agent in agents.values():
+        agent.availability_status = "Offline"
+        pool.update(agent.agent_id)
+    assert not pool.has_available()
+    assert pool.free_capacity(5) == 0
+    assert pool.least_loaded(["Networking"]) is None
+
+
+def test_added_and_reskilled_agents_are_indexed(agents, make_agent):
+    pool = AgentPool(agents)
+    agents["a5"] = make_agent("a5", skills={"Cloud_AWS": 6})
+    pool.add("a5")
+    assert pool.least_loaded(["Cloud_AWS"]).agent_id == "a5"
+    
+    agents["a2"].skills["Cloud_AWS"] = 9
+    agents["a2"].current_load = 0
+    pool.update("a2")
+    assert pool.least_loaded(["Cloud_AWS"]).agent_id == "a2"
+
+
+def test_matches_a_scan_under_random_updates(make_agent):
+    rng = random.Random(7)
+    skills = ["Networking", "Database_SQL", "Cloud_AWS"]
+    agents = {f"a{index}": make_agent(f"a{index}", skills={rng.choice(skills): 5}, current_load=rng.randrange(5))
+              for index in range(20)}
+    pool = AgentPool(agents)
+    
+    for _ in range(2000):
+        agent = agents[f"a{rng.randrange(20)}"]
+        agent.current_load = rng.randrange(5)
+        agent.availability_status = rng.choice(["Available", "Available", "Offline"])
+        pool.update(agent.agent_id)
+        
+        wanted = rng.choice(skills)
+        available = [agent for agent in agents.values() if agent.is_available()]
+        skilled = [agent for agent in available if wanted in agent.skills] or available
+        expected = min(skilled, key=lambda agent: agent.current_load, default=None)
+        assert pool.least_loaded([wanted]) is expected
@@ -0,0 +1,92 @@
+"""
+Tests for the columnar workload analytics over past assignment outputs.
+"""
+import json
+import numpy as np
+import pytest
+from conftest import agent_record, ticket_record
+import main
+from src.analytics import FALLBACK_PREFIX, load_history
+
+START = 1757827200
+
+
+def gini(loads):
+    """Gini coefficient from its definition: mean absolute difference over twice the mean."""
+    loads = np.asarray(loads, dtype=float)
+    return np.abs(loads[:, None] - loads[None, :]).sum() / (2 * len(loads) ** 2 * loads.mean())
+
+
+def write_run(path, rows):
+    """Write (ticket_id, agent_id, rationale) rows as a JSONL output file."""
+    path.write_text("".join(json.dumps({"ticket_id": ticket_id, "title": "", "assigned_agent_id": agent_id,
+                                        "rationale": rationale}) + "\n"
+                            for ticket_id, agent_id, rationale in rows), encoding="utf-8")
+    return str(path)
+
+
+@pytest.fixture
+def runs(write_dataset, tmp_path):
+    """A balanced, skill-matched run and a lopsided one with a fallback and an unknown ticket."""
+    agents = [agent_record("a1", {"Networking": 8}), agent_record("a2", {"Database_SQL": 6}),
+              agent_record("a3", availability_status="Offline")]
+    tickets = [ticket_record(f"T{index}", "SQL query timeout" if index % 2 else "Network outage", "",
+                             START + 60 * index) for index in range(10)]
+    dataset = write_dataset(agents, tickets)
+    good = write_run(tmp_path / "good.jsonl", [(f"T{index}", "a2" if index % 2 else "a1", "Assigned")
+                                               for index in range(10)])
+    bad_rows = [(f"T{index}", "a1", "Assigned") for index in range(9)]
+    bad_rows += [("T9", "a1", f"{FALLBACK_PREFIX} to A1 due to processing error"), ("T99", "a9", "Assigned")]
+    bad = write_run(tmp_path / "bad.jsonl", bad_rows)
+    return dataset, good, bad
+
+
+def test_report_per_run(runs):
+    dataset, good, bad = runs
+    report = load_history([good, bad], dataset, run_names=["good", "bad"]).report()
+    
+    assert (report["runs"], report["assignments"], report["agents_counted"]) == (2, 21, 3)
+    assert report["time_range"] == [START, START + 540]
+    
+    good_run, bad_run = report["per_run"]["good"], report["per_run"]["bad"]
+    assert good_run["tickets"] == 10
+    assert (good_run["mean_skill_match"], good_run["unmatched_rate"], good_run["fallback_rate"]) == (0.7, 0.0, 0.0)
+    assert good_run["load_gini"] == pytest.approx(gini([5, 5, 0]), abs=1e-4)
+    assert (bad_run["mean_skill_match"], bad_run["unmatched_rate"]) == (0.4, 0.5)
+    assert bad_run["fallback_rate"] == round(1 / 11, 4)
+    assert bad_run["load_gini"] == pytest.approx(gini([10, 0, 1]), abs=1e-4)
+    
+    # The cap is 11% of each run's tickets: one ticket here
+    assert (good_run["max_workload_per_agent"], good_run["agents_over_cap"], good_run["tickets_over_cap"]) == (1, 2, 8)
+    assert (bad_run["agents_over_cap"], bad_run["tickets_over_cap"]) == (1, 9)
+
+
+def test_report_per_agent(runs):
+    dataset, good, bad = runs
+    agents = load_history([good, bad], dataset).report()["per_agent"]
+    
+    assert set(agents) == {"a1", "a2", "a9"}
+    assert agents["a1"] == {"tickets": 15, "share": round(15 / 21, 4), "mean_skill_match": 0.5333,
+                            "fallbacks": 1, "runs_over_cap": 2}
+    assert agents["a9"]["mean_skill_match"] == 0.0
+
+
+def test_window_keeps_tickets_in_range(runs):
+    dataset, good, bad = runs
+    history = load_history([good, bad], dataset, run_names=["good", "bad"]).window(START, START + 300)
+    
+    assert len(history) == 10
+    assert history.loads().tolist() == [[3, 2, 0, 0], [5, 0, 0, 0]]
+    assert len(load_history([bad], dataset).window()) == 10
+
+
+def test_analyze_command(runs, tmp_path, capsys):
+    dataset, good, bad = runs
+    report = tmp_path / "report.json"
+    with pytest.raises(SystemExit) as exit_info:
+        main.main(["analyze", good, bad, "--dataset", dataset, "--since", "2025-09-14T05:22:00",
+                   "--report", str(report)])
+    
+    assert exit_info.value.code == 0
+    assert "Runs: 2, assignments: 16" in capsys.readouterr().out
+    assert list(json.loads(report.read_text(encoding="utf-8"))["per_run"]) == [good, bad]
@@ -0,0 +1,88 @@
+"""
+Tests for the benchmark harness and the synthetic dataset generator.
+"""
+import json
+import multiprocessing
+import os
+import time
+import pytest
+from benchmarks.generate_dataset import generate_dataset
+from benchmarks.run import _wait_for_result
+from src.data_loader import DataLoader
+from src.skills import extract_relevant_skills
+
+
+def send_result(queue):
+    queue.put({"scenario": "ok", "tickets": 1})
+
+
+def crash(queue):
+    os._exit(3)
+
+
+def hang(queue):
+    time.sleep(60)
+
+
+@pytest.fixture
+def start():
+    context = multiprocessing.get_context("fork")
+    processes = []
+    
+    def start(target):
+        queue = context.Queue()
+        process = context.Process(target=target, args=(queue,))
+        process.start()
+        processes.append(process)
+        return process, queue
+    
+    yield start
+    for process in processes:
+        process.kill()
+        process.join()
+
+
+def test_result_is_returned(start):
+    process, queue = start(send_result)
+    assert _wait_for_result("ok", process, queue, timeout=30) == {"scenario": "ok", "tickets": 1}
+
+
+def test_crashed_scenario_is_reported(start):
+    process, queue = start(crash)
+    result = _wait_for_result("crash", process, queue, timeout=30)
+    assert result == {"scenario": "crash", "error": "process exited with code 3 without a result"}
+
+
+def test_hung_scenario_times_out(start):
+    process, queue = start(hang)
+    began = time.monotonic()
+    result = _wait_for_result("hang", process, queue, timeout=1.5)
+    assert result["scenario"] == "hang"
+    assert "no result after 1.5 s" in result["error"]
+    assert time.monotonic() - began < 10
+    process.join(5)
+    assert not process.is_alive()
+
+
+def test_generated_dataset_loads(tmp_path):
+    path = str(tmp_path / "synthetic.json")
+    generate_dataset(5, 30, path, seed=3)
+    agents, tickets = DataLoader(path).load_data()
+    
+    assert len(agents) == 5 and len(tickets) == 30
+    assert all(extract_relevant_skills(ticket) for ticket in tickets)
+    assert [ticket.creation_timestamp for ticket in tickets] == sorted(ticket.creation_timestamp for ticket in tickets)
+    
+    again = str(tmp_path / "again.json")
+    generate_dataset(5, 30, again, seed=3)
+    with open(path, encoding="utf-8") as first, open(again, encoding="utf-8") as second:
+        assert json.load(first) == json.load(second)
+
+
+def test_jsonl_output_writes_agents_separately(tmp_path):
+    tickets_path, agents_path = str(tmp_path / "tickets.jsonl"), str(tmp_path / "agents.json")
+    generate_dataset(4, 25, tickets_path, agents_output_path=agents_path)
+    agents, tickets = DataLoader(agents_path, tickets_path=tickets_path).load_data()
+    
+    assert len(agents) == 4
+    assert [ticket.ticket_id for ticket in tickets] == [f"TKT-SYN-{index:07d}" for index in range(1, 26)]
@@ -0,0 +1,83 @@
+"""
+Tests for the command line: subcommands, argument checks and offline startup.
+"""
+import os
+import pytest
+from conftest import agent_record, ticket_record
+from benchmarks.bench_startup import heavy_imports
+import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run(argv):
+    """Run main.main; returns the exit status."""
+    with pytest.raises(SystemExit) as exit_info:
+        main.main(argv)
+    return exit_info.value.code
+
+
+def test_assign_is_the_default_command():
+    assert main.parse_args([]).command == "assign"
+    assert main.parse_args(["--backend", "local"]).backend == "local"
+    assert main.parse_args(["plan"]).backend == "optimal"
+
+
+@pytest.mark.parametrize("argv", [
+    ["--resume", "--stream"],
+    ["--workers", "2", "--stream"],
+    ["--workers", "2", "--dedup-threshold", "0.8"],
+])
+def test_conflicting_options_are_rejected(argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main.parse_args(argv)
+    assert exit_info.value.code == 2
+    assert "cannot be combined" in capsys.readouterr().err
+
+
+def test_validate_reports_problems(write_dataset, capsys):
+    valid = write_dataset([agent_record("a1")], [ticket_record("T1", "VPN down")])
+    assert run(["validate", "--dataset", valid]) == 0
+    assert "Dataset is valid" in capsys.readouterr().out
+    
+    broken_agent = agent_record("a1", {"Networking": -1}, current_load=-2)
+    del broken_agent["name"]
+    invalid = write_dataset([broken_agent, agent_record("a1")],
+                            [ticket_record("T1", "VPN down"), {"ticket_id": "T2", "title": 5}],
+                            name="invalid.json")
+    assert run(["validate", "--dataset", invalid]) == 1
+    out = capsys.readouterr().out
+    assert "Checked 2 agents and 2 tickets" in out
+    for problem in ["agent a1: missing 'name'", "agent a1: duplicate agent_id", "agent a1: negative current_load",
+                    "skill 'Networking' should have a non-negative level", "ticket T2: 'title' should be str, got int",
+                    "ticket T2: missing 'description'"]:
+        assert problem in out
+
+
+@pytest.mark.parametrize("name", ["output.json", "output.jsonl"])
+def test_summarize_reads_an_assign_output(support_dataset, tmp_path, capsys, name):
+    output = str(tmp_path / name)
+    assert run(["assign", "--backend", "local", "--dataset", support_dataset, "--output", output,
+                "--verbosity", "0"]) == 0
+    capsys.readouterr()
+    
+    assert run(["summarize", "--output", output]) == 0
+    out = capsys.readouterr().out
+    assert "Total assignments created: 20" in out
+    assert "Max workload per agent: 2 tickets" in out
+
+
+def test_summarize_empty_output(tmp_path, capsys):
+    output = tmp_path / "empty.jsonl"
+    output.write_text("", encoding="utf-8")
+    assert run(["summarize", "--output", str(output)]) == 1
+    assert "No assignments" in capsys.readouterr().out
+
+
+def test_offline_commands_skip_the_llm_stack(support_dataset, tmp_path, monkeypatch):
+    monkeypatch.chdir(ROOT)
+    output = str(tmp_path / "output.json")
+    assert heavy_imports(["validate", "--dataset", support_dataset]) == []
+    assert heavy_imports(["assign", "--backend", "local", "--dataset", support_dataset, "--output", output,
+                          "--verbosity", "0"]) == ["numpy"]
+    assert heavy_imports(["summarize", "--output", output]) == []
@@ -0,0 +1,59 @@
+"""
+Tests for loading agents and tickets from a dataset and a separate ticket file.
+"""
+import json
+import pytest
+from conftest import agent_record, ticket_record
+from src.data_loader import DataLoader, iter_json_array
+
+
+TICKETS = [
+    ticket_record("T1", "VPN tunnel keeps dropping", "Since this morning.", 1757827200),
+    ticket_record("T2", "Printer offline", "Ünïcode déscription\nover two lines.", 1757827260),
+    ticket_record("T3", "SQL query timeout", "", 1757827320),
+]
+
+
+@pytest.fixture
+def agents_only(tmp_path):
+    """A dataset with agents but no tickets section."""
+    path = tmp_path / "agents.json"
+    path.write_text(json.dumps({"agents": [agent_record("a1"), agent_record("a2")]}), encoding="utf-8")
+    return str(path)
+
+
+def write_tickets(tmp_path, name):
+    path = tmp_path / name
+    if name.endswith(".jsonl"):
+        path.write_text("".join(json.dumps(ticket) + "\n" for ticket in TICKETS), encoding="utf-8")
+    else:
+        path.write_text(json.dumps({"tickets": TICKETS}, indent=2, ensure_ascii=False), encoding="utf-8")
+    return str(path)
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+@pytest.mark.parametrize("name", ["tickets.json", "tickets.jsonl"])
+def test_separate_ticket_file_is_used_by_load_data(agents_only, tmp_path, name, lazy):
+    loader = DataLoader(agents_only, write_tickets(tmp_path, name), lazy_descriptions=lazy)
+    agents, tickets = loader.load_data()
+    
+    assert list(agents) == ["a1", "a2"]
+    assert [(ticket.ticket_id, ticket.title, ticket.description, ticket.creation_timestamp) for ticket in tickets] == [
+        (record["ticket_id"], record["title"], record["description"], record["creation_timestamp"])
+        for record in TICKETS
+    ]
+
+
+@pytest.mark.parametrize("lazy", [False, True])
+def test_agents_only_dataset_has_no_tickets(agents_only, lazy):
+    agents, tickets = DataLoader(agents_only, lazy_descriptions=lazy).load_data()
+    assert len(agents) == 2
+    assert tickets == []
+
+
+def test_iter_json_array_offsets_point_at_each_record(tmp_path):
+    path = write_tickets(tmp_path, "tickets.json")
+    with open(path, "rb") as file:
+        data = file.read()
+    for record, offset, length in iter_json_array(path, "tickets", with_offsets=True):
+        assert json.loads(data[offset:offset + length].decode("utf-8")) == record
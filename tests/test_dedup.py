@@ -0,0 +1,87 @@
+"""
+Tests for near-duplicate ticket clustering and assignment reuse.
+"""
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from benchmarks.fake_llm import FakeLLM
+from src.dedup import MinHasher, NearDuplicateAssigner
+
+
+@pytest.fixture
+def agents(make_agent):
+    roster = [make_agent("a1", skills={"Networking": 8}), make_agent("a2", current_load=1)]
+    return {agent.agent_id: agent for agent in roster}
+
+
+def outage(make_ticket, index, site="the London office"):
+    return make_ticket(f"T{index}", "VPN outage", f"Nobody at {site} can connect to the VPN since 9am.")
+
+
+def test_signature_estimates_jaccard_similarity(make_ticket):
+    hasher = MinHasher(num_perm=256)
+    first = make_ticket("T1", "VPN outage", "Nobody at the London office can connect to the VPN since 9am.")
+    second = make_ticket("T2", "VPN outage", "Nobody at the Paris office can connect to the VPN since 9am.")
+    shingles = hasher.shingles(first), hasher.shingles(second)
+    jaccard = len(shingles[0] & shingles[1]) / len(shingles[0] | shingles[1])
+    
+    estimate = float((hasher.signature(first) == hasher.signature(second)).mean())
+    assert estimate == pytest.approx(jaccard, abs=0.1)
+    assert (hasher.signature(first) == hasher.signature(first)).all()
+
+
+def test_duplicates_reuse_the_first_decision(agents, make_ticket, fake_llm):
+    assigner, fake = fake_llm()
+    dedup = NearDuplicateAssigner(assigner, threshold=0.8)
+    
+    assignments = [dedup.assign_ticket(outage(make_ticket, index), agents, 100) for index in range(5)]
+    assert fake.calls == 1
+    assert {assignment.assigned_agent_id for assignment in assignments} == {"a1"}
+    assert assignments[3].rationale.endswith("Near-duplicate of T0.")
+    
+    dedup.assign_ticket(make_ticket("T9", "Printer jammed", "Paper stuck in tray 2."), agents, 100)
+    assert fake.calls == 2
+    assert dedup.summary()["largest"] == [{"representative": "T0", "title": "VPN outage", "tickets": 5, "agent_id": "a1"}]
+    assert dedup.metrics.counter("dedup_reused") == 4
+
+
+def test_full_agent_is_not_reused(agents, make_ticket, fake_llm):
+    assigner, fake = fake_llm()
+    dedup = NearDuplicateAssigner(assigner)
+    assert dedup.assign_ticket(outage(make_ticket, 0), agents, 100).assigned_agent_id == "a1"
+    
+    agents["a1"].current_load = 11
+    assert dedup.assign_ticket(outage(make_ticket, 1), agents, 100).assigned_agent_id == "a2"
+    assert fake.calls == 2
+    # The new answer becomes the cluster's decision
+    assert dedup.assign_ticket(outage(make_ticket, 2), agents, 100).assigned_agent_id == "a2"
+    assert fake.calls == 2
+
+
+def test_batch_sends_one_ticket_per_cluster(agents, make_ticket, fake_llm):
+    assigner, fake = fake_llm()
+    dedup = NearDuplicateAssigner(assigner)
+    tickets = [outage(make_ticket, index) for index in range(4)]
+    tickets.append(make_ticket("T9", "Printer jammed", "Paper stuck in tray 2."))
+    
+    assignments = dedup.assign_tickets(tickets, agents, 100)
+    
+    assert fake.calls == 1
+    assert [assignment.ticket_id for assignment in assignments] == ["T0", "T1", "T2", "T3", "T9"]
+    assert len({assignment.assigned_agent_id for assignment in assignments[:4]}) == 1
+    assert dedup.summary()["clusters"] == 1
+
+
+def test_concurrent_duplicates_wait_for_the_first_answer(agents, make_ticket, fake_llm):
+    assigner, fake = fake_llm(FakeLLM(latency_ms=100))
+    dedup = NearDuplicateAssigner(assigner)
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        assignments = list(executor.map(lambda index: dedup.assign_ticket(outage(make_ticket, index), agents, 100),
+                                        range(8)))
+    
+    assert fake.calls == 1
+    assert {assignment.assigned_agent_id for assignment in assignments} == {"a1"}
+
+
+def test_bands_must_divide_the_signature(fake_llm):
+    with pytest.raises(ValueError, match="multiple of bands"):
+        NearDuplicateAssigner(fake_llm()[0], num_perm=64, bands=10)
@@ -0,0 +1,92 @@
+"""
+Tests for the assignment journal and resuming interrupted LLM runs.
+"""
+import json
+import pytest
+from conftest import agent_record, ticket_record
+from src.journal import AssignmentJournal, run_digest
+from src.models import Assignment
+from src.ticket_processor import QUIET, TicketProcessor
+
+
+class ScriptedAssigner:
+    """Stands in for the LLM: picks the least-loaded available agent and can fail after a number of tickets."""
+    
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.calls = []
+    
+    def assign_ticket(self, ticket, agents, total_tickets):
+        if self.fail_after is not None and len(self.calls) >= self.fail_after:
+            raise KeyboardInterrupt
+        self.calls.append(ticket.ticket_id)
+        agent = min((agent for agent in agents.values() if agent.is_available()),
+                    key=lambda agent: (agent.current_load, agent.agent_id))
+        return Assignment(ticket.ticket_id, ticket.title, agent.agent_id, f"Scripted choice of {agent.agent_id}")
+
+
+def run(dataset, journal_path, assigner, resume=False):
+    processor = TicketProcessor(dataset, backend="llm", llm_assigner=assigner, verbosity=QUIET,
+                                journal=AssignmentJournal(str(journal_path)), resume=resume)
+    processor.initialize()
+    return processor, processor.process_all_tickets()
+
+
+@pytest.fixture
+def dataset(write_dataset):
+    agents = [agent_record(f"a{index}", {"Networking": 5}, current_load=index % 2) for index in range(10)]
+    tickets = [ticket_record(f"T{index}", "Network down", f"Site {index}") for index in range(40)]
+    return agents, tickets, write_dataset(agents, tickets)
+
+
+def test_resume_continues_where_the_run_stopped(dataset, tmp_path):
+    _, _, path = dataset
+    journal = tmp_path / "journal.jsonl"
+    _, complete = run(path, tmp_path / "reference.jsonl", ScriptedAssigner())
+    
+    with pytest.raises(KeyboardInterrupt):
+        run(path, journal, ScriptedAssigner(fail_after=7))
+    assigner = ScriptedAssigner()
+    processor, resumed = run(path, journal, assigner, resume=True)
+    
+    # T35-T39 find every agent at the cap and fall back without asking the assigner
+    assert assigner.calls == [f"T{index}" for index in range(7, 35)]
+    assert resumed == complete
+    header, records = AssignmentJournal(str(journal)).replay()
+    assert header["data"] == run_digest(*TicketProcessor(path).data_loader.load_data())
+    assert [record["ticket_id"] for record in records] == [f"T{index}" for index in range(40)]
+
+
+def test_torn_last_line_is_dropped(tmp_path):
+    journal = AssignmentJournal(str(tmp_path / "journal.jsonl"))
+    journal.start({"data": "x"})
+    journal.record(Assignment("T1", "title", "a1", "why"), 1, "Available")
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as file:
+        file.write('{"ticket_id": "T2", "ti')
+    
+    header, records = journal.replay()
+    assert header == {"data": "x"}
+    assert [record["ticket_id"] for record in records] == ["T1"]
+    with open(journal.path, encoding="utf-8") as file:
+        assert [json.loads(line)["ticket_id"] for line in file.readlines()[1:]] == ["T1"]
+
+
+@pytest.mark.parametrize("change", [
+    lambda agents, tickets: agents[0].update(current_load=3),
+    lambda agents, tickets: agents[1].update(availability_status="Offline"),
+    lambda agents, tickets: agents.append(agent_record("a9")),
+    lambda agents, tickets: agents[2]["skills"].update(Networking=9),
+    lambda agents, tickets: tickets[5].update(description="Different text"),
+    lambda agents, tickets: tickets[5].update(title="Different title"),
+])
+def test_resume_refuses_changed_agents_or_tickets(dataset, write_dataset, tmp_path, change):
+    agents, tickets, path = dataset
+    journal = tmp_path / "journal.jsonl"
+    with pytest.raises(KeyboardInterrupt):
+        run(path, journal, ScriptedAssigner(fail_after=3))
+    
+    change(agents, tickets)
+    changed = write_dataset(agents, tickets, name="changed.json")
+    with pytest.raises(ValueError, match="different agents or tickets"):
+        run(changed, journal, ScriptedAssigner(), resume=True)
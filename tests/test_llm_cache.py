@@ -0,0 +1,91 @@
+"""
+Tests for the on-disk LLM response cache.
+"""
+import pytest
+from src import llm_cache
+from src.llm_cache import ResponseCache
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable stand-in for time.time inside the cache module."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(llm_cache.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def open_cache(tmp_path):
+    caches = []
+    
+    def open_cache(**options):
+        cache = ResponseCache(str(tmp_path / "cache.sqlite"), **options)
+        caches.append(cache)
+        return cache
+    
+    yield open_cache
+    for cache in caches:
+        cache.close()
+
+
+def test_key_ignores_whitespace_but_not_parameters():
+    key = ResponseCache.make_key("Assign  ticket\n T1", model="m", temperature=0.3)
+    assert key == ResponseCache.make_key("Assign ticket T1 ", temperature=0.3, model="m")
+    assert key != ResponseCache.make_key("Assign ticket T1", model="m", temperature=0.7)
+    assert key != ResponseCache.make_key("Assign ticket T2", model="m", temperature=0.3)
+
+
+def test_entries_persist_across_instances(open_cache):
+    first = open_cache()
+    first.put("k", "agent_001")
+    first.close()
+    
+    cache = open_cache()
+    assert cache.get("k") == "agent_001"
+    assert cache.get("other") is None
+    assert cache.stats() == {"hits": 1, "misses": 1, "entries": 1}
+
+
+def test_expired_entries_are_misses(open_cache, clock):
+    cache = open_cache(ttl_seconds=60)
+    cache.put("old", "a1")
+    clock[0] += 30
+    cache.put("new", "a2")
+    clock[0] += 45
+    
+    assert cache.get("old") is None
+    assert cache.get("new") == "a2"
+    assert cache.stats()["entries"] == 1
+    
+    clock[0] += 60
+    assert cache.purge_expired() == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(open_cache, clock):
+    cache = open_cache(max_entries=2)
+    cache.put("a", "1")
+    clock[0] += 1
+    cache.put("b", "2")
+    clock[0] += 1
+    assert cache.get("a") == "1"
+    clock[0] += 1
+    cache.put("c", "3")
+    
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == ("1", "3")
+    cache.put("c", "4")
+    assert cache.stats()["entries"] == 2
+
+
+def test_assigner_reuses_cached_answers(open_cache, make_agent, make_ticket, fake_llm):
+    agents = {agent.agent_id: agent for agent in [make_agent("a1"), make_agent("a2", current_load=1)]}
+    assigner, fake = fake_llm(cache=open_cache())
+    ticket = make_ticket("T1", "Network switch down")
+    
+    first = assigner.assign_ticket(ticket, agents, 100)
+    second = assigner.assign_ticket(ticket, agents, 100)
+    
+    assert first == second
+    assert fake.calls == 1
+    assert assigner.metrics.counter("llm_cache_hits") == 1
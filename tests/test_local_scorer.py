@@ -0,0 +1,94 @@
+"""
+Tests for the vectorized local scorer and the hybrid local/LLM backend.
+"""
+import pytest
+from src.local_scorer import HybridAssigner, LocalScorer
+
+
+@pytest.fixture
+def agents(make_agent):
+    roster = [
+        make_agent("agent_net", skills={"Networking": 9, "VPN_Troubleshooting": 8}),
+        make_agent("agent_db", skills={"Database_SQL": 9}),
+        make_agent("agent_hw", skills={"Hardware_Diagnostics": 9, "Laptop_Repair": 8}),
+    ]
+    return {agent.agent_id: agent for agent in roster}
+
+
+def test_best_skill_match_wins(agents, make_ticket):
+    scorer = LocalScorer()
+    tickets = [make_ticket("T1", "VPN tunnel keeps dropping"), make_ticket("T2", "SQL database query timeout"),
+               make_ticket("T3", "Laptop screen flickering")]
+    assignments = scorer.assign_tickets(tickets, agents, 100)
+    assert [assignment.assigned_agent_id for assignment in assignments] == ["agent_net", "agent_db", "agent_hw"]
+    assert "VPN_Troubleshooting" in assignments[0].rationale
+
+
+def test_skill_match_is_average_level(agents, make_ticket):
+    scorer = LocalScorer()
+    match = scorer.skill_match([["Networking", "VPN_Troubleshooting"], []], agents)
+    assert match.shape == (2, 3)
+    assert match[0].tolist() == pytest.approx([0.85, 0.0, 0.0])
+    assert match[1].tolist() == [0.0, 0.0, 0.0]
+
+
+def test_load_penalty_moves_ties_to_the_idle_agent(make_agent, make_ticket):
+    agents = {agent.agent_id: agent for agent in [
+        make_agent("busy", skills={"Networking": 8}, current_load=8),
+        make_agent("idle", skills={"Networking": 8}),
+    ]}
+    assignment = LocalScorer().assign_ticket(make_ticket("T1", "Network switch down"), agents, 100)
+    assert assignment.assigned_agent_id == "idle"
+
+
+def test_unavailable_and_full_agents_are_skipped(make_agent, make_ticket):
+    agents = {agent.agent_id: agent for agent in [
+        make_agent("expert", skills={"Networking": 10}, availability_status="Offline"),
+        make_agent("full", skills={"Networking": 9}, current_load=11),
+        make_agent("novice", skills={"Networking": 2}),
+    ]}
+    scorer = LocalScorer()
+    assert scorer.assign_ticket(make_ticket("T1", "Network switch down"), agents, 100).assigned_agent_id == "novice"
+    
+    agents["novice"].availability_status = "Offline"
+    assert scorer.assign_tickets([make_ticket("T2", "Network switch down")], agents, 100) == [None]
+    with pytest.raises(ValueError, match="No available agents"):
+        scorer.assign_ticket(make_ticket("T3", "Network switch down"), agents, 100)
+
+
+def test_assign_all_updates_workload(agents, make_ticket):
+    tickets = [make_ticket(f"T{index}", "VPN tunnel keeps dropping") for index in range(12)]
+    assignments = LocalScorer().assign_all(tickets, agents, 20)
+    
+    # The cap is 11% of 20 tickets: agent_net takes two, then the others share the rest
+    assert [assignment.assigned_agent_id for assignment in assignments[:2]] == ["agent_net", "agent_net"]
+    assert agents["agent_net"].current_load == 2
+    assert agents["agent_net"].availability_status == "UNAVAILABLE"
+    assert assignments[6:] == [None] * 6
+
+
+def test_hybrid_sends_only_unsure_tickets_to_the_llm(agents, make_ticket, fake_llm):
+    assigner, fake = fake_llm()
+    hybrid = HybridAssigner(LocalScorer(), assigner)
+    # Nobody knows printers (a tie) and T4 mentions no skill: both go to the LLM in one prompt
+    tickets = [make_ticket("T1", "VPN tunnel keeps dropping"), make_ticket("T2", "Printer jammed"),
+               make_ticket("T3", "SQL database query timeout"), make_ticket("T4", "Something is odd")]
+    
+    assignments = hybrid.assign_tickets(tickets, agents, 100)
+    
+    assert [assignment.ticket_id for assignment in assignments] == ["T1", "T2", "T3", "T4"]
+    assert assignments[0].assigned_agent_id == "agent_net"
+    assert assignments[2].assigned_agent_id == "agent_db"
+    assert (hybrid.local_decisions, hybrid.llm_decisions) == (2, 2)
+    assert fake.calls == 1
+
+
+def test_hybrid_single_ticket(agents, make_ticket, fake_llm):
+    assigner, fake = fake_llm()
+    hybrid = HybridAssigner(LocalScorer(), assigner)
+    
+    assert hybrid.assign_ticket(make_ticket("T1", "Laptop screen flickering"), agents, 100).assigned_agent_id == "agent_hw"
+    assert fake.calls == 0
+    hybrid.assign_ticket(make_ticket("T2", "Something is odd"), agents, 100)
+    assert fake.calls == 1
+    assert (hybrid.local_decisions, hybrid.llm_decisions) == (1, 1)
@@ -0,0 +1,80 @@
+"""
+Tests for run instrumentation: counters, histograms and report export.
+"""
+import json
+import pytest
+import main
+from src.metrics import Histogram, Metrics
+
+
+def test_counters_are_kept_per_label():
+    metrics = Metrics()
+    metrics.increment("llm_requests")
+    metrics.increment("llm_requests", 2)
+    metrics.increment("llm_errors", kind="timeout")
+    
+    assert metrics.counter("llm_requests") == 3
+    assert metrics.counter("llm_errors", kind="timeout") == 1
+    assert metrics.counter("llm_errors", kind="invalid") == 0
+    assert metrics.counter("llm_errors") == 0
+
+
+def test_histogram_quantiles_use_bucket_bounds():
+    histogram = Histogram((1, 2, 5, 10))
+    for value in [0.5] * 50 + [3] * 45 + [8] * 4 + [20]:
+        histogram.observe(value)
+    
+    assert histogram.quantile(0.50) == 1
+    assert histogram.quantile(0.95) == 5
+    assert histogram.quantile(0.99) == 10
+    assert histogram.quantile(1.0) == 20
+    summary = histogram.to_dict()
+    assert (summary["count"], summary["min"], summary["max"]) == (100, 0.5, 20)
+    assert summary["buckets"] == {"1": 50, "2": 50, "5": 95, "10": 99, "+Inf": 100}
+    assert Histogram((1,)).quantile(0.5) is None
+
+
+def test_timer_and_hooks_record_values():
+    metrics = Metrics()
+    seen = []
+    metrics.add_hook(lambda kind, name, value, labels: seen.append((kind, name, labels)))
+    with metrics.timer("load_data_seconds", stage="agents"):
+        pass
+    metrics.increment("assignments")
+    
+    assert metrics.histogram("load_data_seconds", stage="agents").count == 1
+    assert seen == [("histogram", "load_data_seconds", {"stage": "agents"}), ("counter", "assignments", {})]
+
+
+def test_prometheus_text_format():
+    metrics = Metrics()
+    metrics.increment("llm_errors", kind='bad "json"')
+    metrics.observe("prompt_chars", 300, buckets=(100, 500))
+    
+    assert metrics.to_prometheus().splitlines() == [
+        "# TYPE ticket_assignment_llm_errors_total counter",
+        'ticket_assignment_llm_errors_total{kind="bad \\"json\\""} 1',
+        "# TYPE ticket_assignment_prompt_chars histogram",
+        'ticket_assignment_prompt_chars_bucket{le="100"} 0',
+        'ticket_assignment_prompt_chars_bucket{le="500"} 1',
+        'ticket_assignment_prompt_chars_bucket{le="+Inf"} 1',
+        "ticket_assignment_prompt_chars_sum 300.0",
+        "ticket_assignment_prompt_chars_count 1",
+    ]
+
+
+@pytest.mark.parametrize("name", ["report.json", "report.prom"])
+def test_assign_command_writes_report(support_dataset, tmp_path, name):
+    report = tmp_path / name
+    with pytest.raises(SystemExit) as exit_info:
+        main.main(["assign", "--backend", "local", "--dataset", support_dataset, "--verbosity", "0",
+                   "--output", str(tmp_path / "output.json"), "--metrics-report", str(report)])
+    
+    assert exit_info.value.code == 0
+    text = report.read_text(encoding="utf-8")
+    if name.endswith(".json"):
+        report_data = json.loads(text)
+        assert report_data["counters"]["assignments"] == 20
+        assert report_data["histograms"]["load_data_seconds"]["count"] == 1
+    else:
+        assert "ticket_assignment_assignments_total 20" in text.splitlines()
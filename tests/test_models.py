@@ -0,0 +1,65 @@
+"""
+Tests for the agent and ticket models: interned skills and lazily loaded descriptions.
+"""
+import json
+import pickle
+from src.models import RecordFile, SkillLevels, Ticket
+
+
+def test_skill_levels_share_interned_names(make_agent):
+    first = make_agent("a1", skills=json.loads('{"Networking": 7, "Linux_Administration": 3}'))
+    second = make_agent("a2", skills=json.loads('{"Networking": 9}'))
+    
+    assert isinstance(first.skills, SkillLevels)
+    assert next(iter(first.skills)) is next(iter(second.skills))
+    assert list(first.skills.items()) == [("Networking", 7), ("Linux_Administration", 3)]
+    assert first.get_skill_score("Networking") == 7
+    assert first.get_skill_score("Cloud_AWS") == 0
+
+
+def test_agent_pickles_with_its_skills(make_agent):
+    agent = make_agent("a1", skills={"Networking": 7}, current_load=2)
+    copy = pickle.loads(pickle.dumps(agent))
+    assert copy == agent
+    assert isinstance(copy.skills, SkillLevels)
+
+
+def write_records(tmp_path, records):
+    """Write records one per line; returns (RecordFile, [(offset, length), ...])."""
+    path = tmp_path / "records.jsonl"
+    lines = [json.dumps(record).encode("utf-8") + b"\n" for record in records]
+    path.write_bytes(b"".join(lines))
+    offsets, offset = [], 0
+    for line in lines:
+        offsets.append((offset, len(line)))
+        offset += len(line)
+    return str(path), offsets
+
+
+def test_lazy_description_is_read_back(tmp_path):
+    path, offsets = write_records(tmp_path, [{"description": "first"}, {"description": "déjà vu"}])
+    record_file = RecordFile(path)
+    tickets = [Ticket(f"T{index}", "title", None, 0, (record_file, *location))
+               for index, location in enumerate(offsets)]
+    
+    assert [ticket.description for ticket in tickets] == ["first", "déjà vu"]
+    tickets[0].description = "edited"
+    assert tickets[0].description == "edited"
+    assert pickle.loads(pickle.dumps(tickets[1])).description == "déjà vu"
+    record_file.close()
+
+
+def test_record_cache_is_bounded(tmp_path):
+    path, offsets = write_records(tmp_path, [{"description": str(index)} for index in range(5)])
+    record_file = RecordFile(path, cache_size=2)
+    
+    first = record_file.read(*offsets[0])
+    assert record_file.read(*offsets[0]) is first
+    for location in offsets[1:]:
+        record_file.read(*location)
+    assert len(record_file._cache) == 2
+    assert record_file.read(*offsets[0]) is not first
+    assert record_file.read(*offsets[0]) == {"description": "0"}
+    
+    record_file.close()
+    assert not record_file._cache
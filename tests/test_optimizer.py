@@ -0,0 +1,90 @@
+"""
+Tests for the capacity-constrained auction solver and planner.
+"""
+from functools import lru_cache
+import numpy as np
+import pytest
+from src.optimizer import CapacityPlanner, solve_transportation
+
+
+def brute_force(profit: np.ndarray, capacity: np.ndarray) -> float:
+    """Best total profit over every feasible plan (all rows served when capacity allows)."""
+    num_rows, num_cols = profit.shape
+    
+    @lru_cache(maxsize=None)
+    def best(row: int, left: tuple, skips: int) -> float:
+        if row == num_rows:
+            return 0.0
+        value = best(row + 1, left, skips - 1) if skips else -np.inf
+        for column in range(num_cols):
+            if left[column]:
+                rest = left[:column] + (left[column] - 1,) + left[column + 1:]
+                value = max(value, profit[row, column] + best(row + 1, rest, skips))
+        return value
+    
+    return best(0, tuple(int(c) for c in capacity), max(0, num_rows - int(capacity.sum())))
+
+
+def plan_value(profit: np.ndarray, assigned: np.ndarray) -> float:
+    served = assigned >= 0
+    return float(profit[np.flatnonzero(served), assigned[served]].sum())
+
+
+@pytest.mark.parametrize("seed", range(4))
+def test_matches_brute_force_on_small_instances(seed):
+    rng = np.random.default_rng(seed)
+    for trial in range(150):
+        num_rows, num_cols = int(rng.integers(1, 10)), int(rng.integers(1, 5))
+        capacity = rng.integers(0, 5, num_cols)
+        if trial % 3 == 0:
+            profit = rng.random((num_rows, num_cols))
+        elif trial % 3 == 1:
+            profit = rng.integers(0, 3, (num_rows, num_cols)).astype(float)  # many ties
+        else:
+            profit = rng.normal(0, 5, (num_rows, num_cols))
+        
+        assigned = solve_transportation(profit, capacity)
+        
+        assert (np.bincount(assigned[assigned >= 0], minlength=num_cols) <= capacity).all()
+        assert (assigned >= 0).sum() == min(num_rows, capacity.sum())
+        if capacity.sum():
+            assert plan_value(profit, assigned) >= brute_force(profit, capacity) - num_rows * 1e-4 - 1e-9
+
+
+def test_surplus_capacity_reaches_optimum():
+    # More capacity than rows: prices left on under-filled columns used to make this suboptimal
+    rng = np.random.default_rng(7)
+    capacity = np.array([2, 3, 3])
+    for _ in range(50):
+        profit = rng.random((7, 3))
+        assigned = solve_transportation(profit, capacity)
+        assert plan_value(profit, assigned) >= brute_force(profit, capacity) - 7e-4
+
+
+def test_rows_beyond_capacity_are_left_unassigned():
+    profit = np.array([[1.0, 0.0], [0.9, 0.1], [0.2, 0.8]])
+    assigned = solve_transportation(profit, np.array([1, 1]))
+    assert sorted(assigned.tolist()) == [-1, 0, 1]
+    assert assigned[2] == 1
+
+
+def test_columns_without_capacity_are_skipped():
+    profit = np.array([[5.0, 1.0, 0.0], [5.0, 0.0, 1.0]])
+    assert solve_transportation(profit, np.array([0, 1, 1])).tolist() == [1, 2]
+    assert solve_transportation(profit, np.array([0, 0, 0])).tolist() == [-1, -1]
+
+
+def test_planner_respects_cap_and_availability(make_agent, make_ticket):
+    agents = {
+        "a1": make_agent("a1", skills={"Networking": 9}, current_load=1),
+        "a2": make_agent("a2", skills={"Networking": 5}),
+        "a3": make_agent("a3", skills={"Networking": 10}, availability_status="Offline"),
+    }
+    tickets = [make_ticket(f"T{index}", "Network outage") for index in range(18)]
+    planned = CapacityPlanner().plan(tickets, agents, total_tickets=50)
+    
+    # Cap int(50 * 0.11) = 5, minus a1's current load of 1
+    assert planned.count("a1") == 4
+    assert planned.count("a2") == 5
+    assert planned.count("a3") == 0
+    assert planned.count(None) == 9
@@ -0,0 +1,123 @@
+"""
+Tests for re-planning assignments after mid-shift agent updates.
+"""
+from collections import Counter
+import pytest
+from conftest import agent_record, ticket_record
+from src.models import Agent
+from src.ticket_processor import QUIET, TicketProcessor
+
+SKILLS = ["Networking", "Database_SQL", "Active_Directory", "Laptop_Repair"]
+TITLES = ["Network outage", "SQL deadlock", "Active Directory login fails", "Laptop won't charge"]
+
+
+@pytest.fixture
+def processor(write_dataset):
+    """A finished local run: 12 idle agents, 50 tickets, a cap of 5."""
+    agents = [agent_record(f"a{index}", {SKILLS[index % 4]: 4 + index % 6}) for index in range(12)]
+    tickets = [ticket_record(f"T{index:02d}", TITLES[index % 4]) for index in range(50)]
+    processor = TicketProcessor(write_dataset(agents, tickets), backend="local", verbosity=QUIET)
+    processor.initialize()
+    processor.process_all_tickets()
+    return processor
+
+
+def holders(processor):
+    return [assignment.assigned_agent_id for assignment in processor.assignments]
+
+
+def assert_consistent(processor):
+    """Loads match the assignments and nobody is over the cap."""
+    counts = Counter(holders(processor))
+    assert {agent_id: agent.current_load for agent_id, agent in processor.agents.items()} == \
+           {agent_id: counts[agent_id] for agent_id in processor.agents}
+    assert max(counts.values()) <= 5
+
+
+def test_offline_agent_hands_over_only_its_tickets(processor):
+    before = holders(processor)
+    held = [position for position, agent_id in enumerate(before) if agent_id == "a5"]
+    
+    changed = processor.update_agent("a5", availability_status="Offline")
+    
+    after = holders(processor)
+    assert [assignment.ticket_id for assignment in changed] == [f"T{position:02d}" for position in held]
+    assert "a5" not in after
+    assert [agent_id for position, agent_id in enumerate(after) if position not in held] == \
+           [agent_id for position, agent_id in enumerate(before) if position not in held]
+    assert processor.agents["a5"].current_load == 0
+    assert not processor.agents["a5"].is_available()
+
+
+def test_load_above_the_cap_releases_the_latest_tickets(processor):
+    held = [position for position, agent_id in enumerate(holders(processor)) if agent_id == "a5"]
+    
+    # Two tickets came in from elsewhere: the agent keeps its earliest three
+    changed = processor.update_agent("a5", current_load=7)
+    
+    assert [assignment.ticket_id for assignment in changed] == [f"T{position:02d}" for position in held[-2:]]
+    assert [position for position, agent_id in enumerate(holders(processor)) if agent_id == "a5"] == held[:-2]
+    assert processor.agents["a5"].current_load == 5
+    assert processor.agents["a5"].availability_status == "UNAVAILABLE"
+    
+    processor.update_agent("a5", current_load=2)
+    assert processor.agents["a5"].is_available()
+
+
+def test_skill_change_reassigns_the_agents_tickets(processor):
+    held = [position for position, agent_id in enumerate(holders(processor)) if agent_id == "a1"]
+    changed = processor.update_agent("a1", skills={"Laptop_Repair": 9})
+    
+    assert sorted(assignment.ticket_id for assignment in changed) == [f"T{position:02d}" for position in held]
+    assert dict(processor.agents["a1"].skills) == {"Laptop_Repair": 9}
+    assert_consistent(processor)
+
+
+def test_rebalance_uses_the_new_skills(processor):
+    processor.update_agent("a1", skills={"Laptop_Repair": 10}, rebalance=True)
+    
+    assert processor.metrics.counter("rebalanced_tickets") > 0
+    assert any(assignment.title == "Laptop won't charge" and assignment.assigned_agent_id == "a1"
+               for assignment in processor.assignments)
+    assert_consistent(processor)
+
+
+def test_new_agent_takes_over_matching_tickets(processor):
+    moved = processor.add_agent(Agent("a_net", "Net Expert", {"Networking": 10}, 0, "Available", 15))
+    
+    assert len(moved) == 5
+    assert all(assignment.title == "Network outage" for assignment in moved)
+    assert holders(processor).count("a_net") == 5
+    assert_consistent(processor)
+    assert processor.metrics.counter("rebalanced_tickets") == 5
+    
+    assert processor.add_agent(Agent("a_idle", "Idle", {"Networking": 1}, 0, "Available", 1), rebalance=False) == []
+
+
+def test_llm_backend_asks_only_for_released_tickets(write_dataset, fake_llm):
+    agents = [agent_record(f"a{index}", {SKILLS[index % 4]: 5}) for index in range(12)]
+    tickets = [ticket_record(f"T{index:02d}", TITLES[index % 4]) for index in range(50)]
+    assigner, fake = fake_llm()
+    processor = TicketProcessor(write_dataset(agents, tickets), backend="llm", llm_assigner=assigner,
+                                verbosity=QUIET)
+    processor.initialize()
+    processor.process_all_tickets()
+    calls = fake.calls
+    
+    changed = processor.update_agent("a3", availability_status="Offline")
+    
+    assert fake.calls - calls == len(changed) > 0
+    assert not any(assignment.rationale.startswith("Fallback") for assignment in changed)
+    assert_consistent(processor)
+
+
+def test_invalid_updates(processor, support_dataset):
+    with pytest.raises(ValueError, match="Unknown agent"):
+        processor.update_agent("nobody", availability_status="Offline")
+    with pytest.raises(ValueError, match="already exists"):
+        processor.add_agent(processor.agents["a1"])
+    
+    fresh = TicketProcessor(support_dataset, backend="local", verbosity=QUIET)
+    fresh.initialize()
+    with pytest.raises(ValueError, match="before re-planning"):
+        fresh.update_agent("agent_net", availability_status="Offline")
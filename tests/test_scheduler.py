@@ -0,0 +1,190 @@
+"""
+Tests for LLM request pacing, retries and the circuit breaker.
+"""
+import json
+import pytest
+from conftest import agent_record, ticket_record
+from benchmarks.fake_llm import FakeLLM, FakeLLMError
+from src import scheduler
+from src.scheduler import CircuitOpenError, RequestScheduler, TokenBucket, is_transient
+from src.ticket_processor import QUIET, TicketProcessor
+
+
+class APIError(Exception):
+    def __init__(self, status_code=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class AuthenticationError(Exception):
+    pass
+
+
+class Flaky:
+    """A request that raises the given errors in turn, then returns "ok"."""
+    
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+    
+    def __call__(self):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return "ok"
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """A settable stand-in for time.monotonic."""
+    now = [1000.0]
+    monkeypatch.setattr(scheduler.time, "monotonic", lambda: now[0])
+    return now
+
+
+def make_scheduler(**options):
+    """A scheduler whose sleeps are recorded instead of slept."""
+    sleeps = []
+    return RequestScheduler(sleep=sleeps.append, **options), sleeps
+
+
+class RateLimitError(Exception):
+    pass
+
+
+def test_transient_errors():
+    assert is_transient(APIError(429))
+    assert is_transient(APIError(503))
+    assert is_transient(TimeoutError())
+    assert is_transient(ConnectionResetError())
+    assert is_transient(RateLimitError())
+    assert is_transient(FakeLLMError())
+    assert not is_transient(APIError(401))
+    assert not is_transient(AuthenticationError())
+    
+    wrapped = RuntimeError("model error")
+    wrapped.__cause__ = APIError(400)
+    assert not is_transient(wrapped)
+    wrapped.__cause__ = APIError(502)
+    assert is_transient(wrapped)
+
+
+@pytest.mark.parametrize("error", [KeyError("agent_id"), TypeError("bad"), json.JSONDecodeError("Expecting value", "", 0)])
+def test_our_own_bugs_are_not_retried(error):
+    requests, sleeps = make_scheduler(max_retries=3, failure_threshold=1)
+    request = Flaky(error)
+    with pytest.raises(type(error)):
+        requests.call(request)
+    assert (request.calls, sleeps) == (1, [])
+    assert requests.state == scheduler.CLOSED
+    assert requests.metrics.counter("llm_retries_exhausted") == 0
+
+
+def test_transient_errors_are_retried_with_backoff():
+    requests, sleeps = make_scheduler(max_retries=3, base_delay=1.0, max_delay=3.0)
+    request = Flaky(APIError(429), APIError(503))
+    
+    assert requests.call(request) == "ok"
+    assert request.calls == 3
+    assert len(sleeps) == 2 and 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0
+    assert requests.metrics.counter("llm_retries") == 2
+    assert all(0 <= requests.backoff(10) <= 3.0 for _ in range(100))
+
+
+def test_retry_budget_and_permanent_errors():
+    requests, sleeps = make_scheduler(max_retries=2, failure_threshold=100)
+    request = Flaky(*[APIError(429)] * 5)
+    with pytest.raises(APIError):
+        requests.call(request)
+    assert request.calls == 3
+    assert requests.metrics.counter("llm_retries_exhausted") == 1
+    
+    permanent = Flaky(APIError(401))
+    with pytest.raises(APIError):
+        requests.call(permanent)
+    assert permanent.calls == 1
+    assert requests.state == scheduler.CLOSED
+
+
+def test_circuit_opens_and_recovers(clock):
+    requests, _ = make_scheduler(max_retries=0, failure_threshold=2, cooldown_seconds=30)
+    for _ in range(2):
+        with pytest.raises(APIError):
+            requests.call(Flaky(APIError(500)))
+    assert requests.state == scheduler.OPEN
+    
+    request = Flaky()
+    with pytest.raises(CircuitOpenError):
+        requests.call(request)
+    assert request.calls == 0
+    
+    # After the cooldown one trial goes through; a failure opens the circuit again
+    clock[0] += 30
+    with pytest.raises(APIError):
+        requests.call(Flaky(APIError(500)))
+    assert requests.state == scheduler.OPEN
+    
+    clock[0] += 30
+    assert requests.call(request) == "ok"
+    assert requests.state == scheduler.CLOSED
+    assert (requests.metrics.counter("circuit_opened"), requests.metrics.counter("circuit_closed")) == (2, 1)
+
+
+def test_requests_are_paced(clock):
+    requests, sleeps = make_scheduler(requests_per_minute=60, tokens_per_minute=1000)
+    for _ in range(60):
+        requests.call(Flaky(), estimated_tokens=10)
+    assert sleeps == []
+    
+    requests.call(Flaky(), estimated_tokens=10)
+    assert sleeps == [pytest.approx(1.0)]
+    requests.call(Flaky(), estimated_tokens=10)
+    assert sleeps[1] == pytest.approx(2.0)
+
+
+def test_unused_token_estimate_is_refunded(clock):
+    bucket = TokenBucket(1000)
+    assert bucket.reserve(1500) == 0.0  # capped at one minute's worth
+    assert bucket.reserve(500) == pytest.approx(30.0)
+    bucket.refund(400)
+    assert bucket.reserve(100) == pytest.approx(12.0)
+    
+    requests, _ = make_scheduler(tokens_per_minute=1000)
+    requests.call(lambda: "ok", estimated_tokens=800, usage=lambda result: (150, 50))
+    assert requests.tokens.tokens == pytest.approx(800)
+
+
+def test_open_circuit_falls_back_to_local_scoring(write_dataset, fake_llm):
+    agents = [agent_record(f"a{index}", {"Networking": 5 + index}) for index in range(10)]
+    tickets = [ticket_record(f"T{index}", "Network switch down") for index in range(30)]
+    requests, _ = make_scheduler(max_retries=0, failure_threshold=2, cooldown_seconds=3600)
+    assigner, fake = fake_llm(FakeLLM(error_rate=1.0), scheduler=requests)
+    processor = TicketProcessor(write_dataset(agents, tickets), backend="llm", llm_assigner=assigner,
+                                verbosity=QUIET, metrics=requests.metrics)
+    processor.initialize()
+    
+    assignments = processor.process_all_tickets(1, 1)
+    
+    assert fake.calls == 2
+    assert len(assignments) == 30
+    assert processor.metrics.counter("circuit_local_decisions") == 28
+    assert all("Fallback" not in assignment.rationale for assignment in assignments[2:])
+
+
+def test_open_circuit_scores_whole_batches_locally(write_dataset, fake_llm, capsys):
+    agents = [agent_record(f"a{index}", {"Networking": 5 + index}) for index in range(10)]
+    tickets = [ticket_record(f"T{index}", "Network switch down") for index in range(30)]
+    requests, _ = make_scheduler(max_retries=0, failure_threshold=1, cooldown_seconds=3600)
+    assigner, fake = fake_llm(FakeLLM(error_rate=1.0), scheduler=requests)
+    processor = TicketProcessor(write_dataset(agents, tickets), backend="llm", llm_assigner=assigner,
+                                verbosity=QUIET, metrics=requests.metrics)
+    processor.initialize()
+    
+    assignments = processor.process_all_tickets(1, 5)
+    
+    # Only the first batch reaches the LLM; its first retry finds the circuit open
+    assert fake.calls == 1
+    assert capsys.readouterr().out.count("Error processing") == 1
+    assert processor.metrics.counter("single_ticket_retries") == 1
+    assert processor.metrics.counter("circuit_local_decisions") == 30
+    assert not any(assignment.rationale.startswith("Fallback") for assignment in assignments)
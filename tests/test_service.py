@@ -0,0 +1,118 @@
+"""
+Tests for the assignment service: open-ticket tracking, load release and the serve loop.
+"""
+import json
+import os
+import subprocess
+import sys
+from conftest import agent_record, ticket_record
+from src.agent_pool import AgentPool
+from src.models import Assignment
+from src.output_writer import AssignmentWriter, read_assignments
+from src.service import OpenTickets, ServiceState, TicketQueue
+from src.ticket_processor import QUIET, TicketProcessor
+
+
+def test_open_tickets_close_and_expire_report_counted_flag():
+    open_tickets = OpenTickets()
+    open_tickets.open("T1", "a1", now=0.0)
+    open_tickets.open("T2", "a2", now=5.0, counted=False)
+    open_tickets.open("T3", "a1", now=9.0)
+    
+    assert open_tickets.close("T9") is None
+    assert open_tickets.close("T3") == ("a1", True)
+    assert open_tickets.expire(now=10.0, ttl=5.0) == [("a1", True), ("a2", False)]
+    assert len(open_tickets) == 0
+
+
+class FixedAssigner:
+    """assign_batch stand-in: every ticket goes to agent_id, adding load only when counted."""
+    
+    def __init__(self, agents, agent_id, counted):
+        self.agents = agents
+        self.agent_id = agent_id
+        self.counted = counted
+    
+    def __call__(self, tickets, total_tickets, cap):
+        if self.counted:
+            self.agents[self.agent_id].current_load += len(tickets)
+        return [(Assignment(ticket.ticket_id, ticket.title, self.agent_id, "test"), self.counted)
+                for ticket in tickets]
+
+
+def make_state(make_agent, tmp_path, counted):
+    agents = {"a1": make_agent("a1", current_load=2)}
+    writer = AssignmentWriter(str(tmp_path / "out.jsonl"))
+    state = ServiceState(agents, AgentPool(agents), FixedAssigner(agents, "a1", counted), writer, window=10)
+    return agents, writer, state
+
+
+def test_expiring_releases_only_counted_load(make_agent, tmp_path):
+    for counted, load_after_assign in ((True, 4), (False, 2)):
+        agents, writer, state = make_state(make_agent, tmp_path, counted)
+        with writer:
+            state.receive(ticket_record("T1", "VPN down"), arrived=0.0)
+            state.receive(ticket_record("T2", "VPN down"), arrived=0.0)
+            state.flush()
+            assert agents["a1"].current_load == load_after_assign
+            
+            state.expire(now=float("inf"), ttl=1.0)
+        # Never below the load the agent was loaded with
+        assert agents["a1"].current_load == 2
+        assert state.status()["open_tickets"] == 0
+
+
+def test_closing_pending_ticket_assigns_it_first(make_agent, tmp_path):
+    agents, writer, state = make_state(make_agent, tmp_path, counted=True)
+    with writer:
+        state.receive(ticket_record("T1", "VPN down"), arrived=0.0)
+        state.receive({"ticket_id": "T1", "event": "close"}, arrived=0.0)
+    assert writer.count == 1
+    assert agents["a1"].current_load == 2
+    assert state.counts == {"a1": 1}
+
+
+def test_invalid_ticket_is_rejected(make_agent, tmp_path):
+    agents, writer, state = make_state(make_agent, tmp_path, counted=True)
+    with writer:
+        state.receive({"ticket_id": "T1"}, arrived=0.0)
+        state.flush()
+    assert writer.count == 0
+    assert state.metrics.counter("service_rejected", reason="invalid ticket") == 1
+
+
+def test_closing_fallback_ticket_does_not_release_load(write_dataset, tmp_path):
+    # window=10 makes the cap 1: the third ticket is a fallback that adds no load
+    agents = [agent_record("a1", {"VPN_Troubleshooting": 9}), agent_record("a2", {"VPN_Troubleshooting": 8})]
+    dataset = write_dataset(agents, [])
+    ticket_queue = TicketQueue()
+    for index in range(1, 4):
+        ticket_queue.put(ticket_record(f"T{index}", "VPN tunnel keeps dropping"))
+    ticket_queue.put({"ticket_id": "T3", "event": "close"})
+    ticket_queue.put(ticket_record("T4", "VPN tunnel keeps dropping"))
+    output = str(tmp_path / "out.jsonl")
+    
+    processor = TicketProcessor(dataset, backend="local", verbosity=QUIET)
+    assert processor.serve(ticket_queue, output, batch_size=1, batch_wait=0.0, window=10) == 4
+    
+    assignments = list(read_assignments(output))
+    assert sorted(assignment.assigned_agent_id for assignment in assignments[:2]) == ["a1", "a2"]
+    assert assignments[2].rationale.startswith("Fallback assignment")
+    assert assignments[3].rationale.startswith("Fallback assignment")
+    assert {agent.current_load for agent in processor.agents.values()} == {1}
+
+
+def test_stdout_output_carries_only_assignments(write_dataset):
+    dataset = write_dataset([agent_record("a1", {"VPN_Troubleshooting": 9})], [])
+    records = [ticket_record("T1", "VPN tunnel keeps dropping"), {"ticket_id": "T1", "event": "close"}]
+    main = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+    result = subprocess.run(
+        [sys.executable, main, "serve", "--backend", "local", "--dataset", dataset, "--output", "-"],
+        input="\n".join(json.dumps(record) for record in records) + "\nnot json\n",
+        capture_output=True, text=True, timeout=60
+    )
+    
+    assert result.returncode == 0
+    assert [json.loads(line)["ticket_id"] for line in result.stdout.splitlines()] == ["T1"]
+    assert "Assigned 1 tickets" in result.stderr
+    assert "not a JSON object" in result.stderr
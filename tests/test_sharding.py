@@ -0,0 +1,106 @@
+"""
+Tests for multi-process sharded assignment and its shared load ledger.
+"""
+import multiprocessing
+from collections import Counter
+import pytest
+from conftest import agent_record, ticket_record
+from benchmarks.fake_llm import FakeLLM, FakeLLMError
+from src.local_scorer import LocalScorer
+from src.sharding import CLOSED, FULL, OPEN, AssignerFactory, LoadLedger, assign_sharded
+from src.ticket_processor import QUIET, TicketProcessor
+
+CONTEXT = multiprocessing.get_context("fork")
+
+
+class HardwareOutageLLM(FakeLLM):
+    """Fails every prompt about a laptop (module level, so workers can unpickle it)."""
+    
+    def _answer(self, prompt: str) -> str:
+        if "Laptop will not boot" in prompt:
+            raise FakeLLMError("Simulated LLM failure")
+        return super()._answer(prompt)
+
+
+def test_ledger_enforces_the_cap(make_agent):
+    agents = {agent.agent_id: agent for agent in [
+        make_agent("a1", current_load=1), make_agent("a2", availability_status="Offline")
+    ]}
+    ledger = LoadLedger(agents, max_workload=3, context=CONTEXT)
+    
+    assert [ledger.reserve(0), ledger.reserve(0), ledger.reserve(0)] == [True, True, False]
+    assert ledger.snapshot() == ([3, 0], [FULL, CLOSED])
+    assert not ledger.reserve(1)
+    ledger.release(0)
+    assert ledger.snapshot() == ([2, 0], [OPEN, CLOSED])
+    assert ledger.reserve(0)
+
+
+@pytest.fixture
+def roster(make_agent, make_ticket):
+    skills = ["Networking", "Database_SQL", "Hardware_Diagnostics", "Active_Directory"]
+    titles = ["Network switch down", "SQL query timeout", "Laptop will not boot", "Active Directory lockout"]
+    agents = {f"a{index}": make_agent(f"a{index}", skills={skills[index % 4]: 5 + index % 5}, current_load=index % 3)
+              for index in range(12)}
+    tickets = [make_ticket(f"T{index}", titles[index % 4]) for index in range(100)]
+    return agents, tickets
+
+
+@pytest.mark.parametrize("backend", ["local", "llm"])
+def test_workers_share_the_cap(roster, backend):
+    agents, tickets = roster
+    initial = {agent_id: agent.current_load for agent_id, agent in agents.items()}
+    llm_params = {"api_key": "fake-key", "agent_factory": FakeLLM}
+    factory = AssignerFactory(backend, LocalScorer(), llm_params=llm_params)
+    
+    assignments, loads, states = assign_sharded(tickets, agents, 100, factory, workers=3, chunk_size=4,
+                                                context=CONTEXT)
+    
+    assert [assignment.ticket_id for assignment in assignments] == [ticket.ticket_id for ticket in tickets]
+    counts = Counter(assignment.assigned_agent_id for assignment in assignments)
+    assert loads == [initial[agent_id] + counts[agent_id] for agent_id in agents]
+    assert max(loads) <= 11
+    assert states.count(FULL) == sum(load == 11 for load in loads)
+
+
+def test_process_sharded_writes_loads_back(write_dataset):
+    agents = [agent_record(f"a{index}", {"Networking": 9 - index}) for index in range(10)]
+    tickets = [ticket_record(f"T{index}", "Network switch down") for index in range(60)]
+    processor = TicketProcessor(write_dataset(agents, tickets), backend="local", verbosity=QUIET)
+    processor.initialize()
+    
+    assignments = processor.process_sharded(workers=2, chunk_size=8)
+    
+    counts = Counter(assignment.assigned_agent_id for assignment in assignments)
+    assert len(assignments) == 60
+    assert {agent_id: agent.current_load for agent_id, agent in processor.agents.items()} == \
+           {agent_id: counts[agent_id] for agent_id in processor.agents}
+    assert all(agent.availability_status == "UNAVAILABLE"
+               for agent in processor.agents.values() if agent.current_load == 6)
+    assert processor.metrics.counter("assignments") == 60
+
+
+def test_llm_backends_need_a_factory(support_dataset):
+    processor = TicketProcessor(support_dataset, backend="llm", verbosity=QUIET)
+    processor.initialize()
+    with pytest.raises(ValueError, match="requires an assigner_factory"):
+        processor.process_sharded(workers=2)
+
+
+def test_worker_metrics_and_errors_reach_the_parent(write_dataset, capsys):
+    agents = [agent_record(f"a{index}", {"Networking": 5}) for index in range(20)]
+    tickets = [ticket_record(f"T{index}", ["Network switch down", "Laptop will not boot"][index % 2])
+               for index in range(40)]
+    processor = TicketProcessor(write_dataset(agents, tickets), backend="llm", verbosity=QUIET)
+    processor.initialize()
+    factory = AssignerFactory("llm", processor.local_scorer,
+                              llm_params={"api_key": "fake-key", "agent_factory": HardwareOutageLLM})
+    
+    processor.process_sharded(workers=2, assigner_factory=factory, chunk_size=4)
+    
+    assert processor.metrics.counter("llm_requests") == 40
+    assert processor.metrics.counter("llm_errors") == 20
+    assert processor.metrics.counter("llm_tokens_in") > 0
+    assert processor.metrics.histogram("llm_request_seconds").count == 40
+    assert processor.metrics.counter("fallbacks", reason="processing error") == 20
+    assert capsys.readouterr().out.count("Error processing ticket") == 20
@@ -0,0 +1,80 @@
+"""
+Tests for top-k candidate shortlisting of agents in LLM prompts.
+"""
+import pytest
+from benchmarks.fake_llm import FakeLLM
+from src.shortlist import CandidateShortlist
+
+
+class RecordingLLM(FakeLLM):
+    """FakeLLM that keeps the prompts it was sent."""
+    
+    def __init__(self):
+        super().__init__()
+        self.prompts = []
+    
+    def _answer(self, prompt):
+        self.prompts.append(prompt)
+        return super()._answer(prompt)
+
+
+@pytest.fixture
+def agents(make_agent):
+    roster = [
+        make_agent("idle", skills={"Printer_Troubleshooting": 6}),
+        make_agent("vpn_expert", skills={"VPN_Troubleshooting": 9, "Networking": 7}, current_load=3),
+        make_agent("network", skills={"Networking": 8}, current_load=2),
+        make_agent("m365", skills={"Microsoft_365": 8}, current_load=1),
+        make_agent("dba", skills={"Database_SQL": 9}, current_load=1),
+    ]
+    return {agent.agent_id: agent for agent in roster}
+
+
+def ids(agents):
+    return [agent.agent_id for agent in agents]
+
+
+def test_best_skill_match_first(agents, make_ticket):
+    shortlist = CandidateShortlist(2)
+    ticket = make_ticket("T1", "VPN tunnel keeps dropping", "Remote network access fails")
+    assert ids(shortlist.shortlist(ticket, agents, 10)) == ["vpn_expert", "network"]
+    
+    scores = shortlist.scores(ticket, agents)
+    assert scores["dba"] == 0.0
+    assert scores["vpn_expert"] > scores["network"] > 0.0
+
+
+def test_extracted_skills_join_the_query(agents, make_ticket):
+    ticket = make_ticket("T1", "Outlook keeps asking for a password")
+    assert ids(CandidateShortlist(1).shortlist(ticket, agents, 10)) == ["m365"]
+
+
+def test_closed_agents_are_left_out_and_ties_go_to_low_load(agents, make_ticket):
+    agents["vpn_expert"].availability_status = "Offline"
+    ticket = make_ticket("T1", "VPN tunnel keeps dropping")
+    assert ids(CandidateShortlist(2).shortlist(ticket, agents, 2)) == ["idle", "m365"]
+    
+    unmatched = make_ticket("T2", "Something is odd")
+    assert ids(CandidateShortlist(3).shortlist(unmatched, agents, 10)) == ["idle", "m365", "dba"]
+
+
+def test_index_follows_skill_changes(agents, make_ticket):
+    shortlist = CandidateShortlist(1)
+    ticket = make_ticket("T1", "SQL query timeout")
+    assert ids(shortlist.shortlist(ticket, agents, 10)) == ["dba"]
+    agents["dba"].skills = {"Cloud_AWS": 5}
+    agents["idle"].skills["Database_SQL"] = 4
+    shortlist.invalidate()
+    assert ids(shortlist.shortlist(ticket, agents, 10)) == ["idle"]
+
+
+def test_prompt_lists_only_the_shortlist(agents, make_ticket, fake_llm):
+    assigner, fake = fake_llm(RecordingLLM(), shortlist_k=2)
+    assignment = assigner.assign_ticket(make_ticket("T1", "VPN tunnel keeps dropping", "Remote network access fails"),
+                                        agents, 100)
+    
+    # The idle printer expert would win on load alone, but is not in the prompt
+    assert assignment.assigned_agent_id == "network"
+    assert "(vpn_expert)" in fake.prompts[0] and "(idle)" not in fake.prompts[0]
+    assert assigner.metrics.counter("shortlist_agents_omitted") == 3
+    assert assigner.metrics.counter("shortlist_prompt_chars_saved") > 0
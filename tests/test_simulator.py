@@ -0,0 +1,95 @@
+"""
+Tests for the discrete-event policy simulator and the simulate command.
+"""
+import json
+from dataclasses import replace
+import pytest
+from conftest import agent_record, ticket_record
+import main
+from src.simulator import SimulationInput, SimulationParams, parameter_grid, run_sweep, simulate
+
+# Fixed 30-minute handling times, so waits can be worked out by hand
+EXACT = SimulationParams(handling_minutes=30, skill_speedup=0.0, handling_sigma=0.0)
+START = 1757827200
+
+
+@pytest.fixture
+def inputs(make_agent, make_ticket):
+    """Build a SimulationInput from agents and (title, minutes after START) pairs."""
+    def make(agents, arrivals):
+        tickets = [make_ticket(f"T{index}", title, "", START + 60 * minutes)
+                   for index, (title, minutes) in enumerate(arrivals)]
+        return SimulationInput({agent.agent_id: agent for agent in agents}, tickets)
+    return make
+
+
+def test_single_agent_queue_waits(inputs, make_agent):
+    result = simulate(inputs([make_agent("a1")], [("Network down", 0), ("Printer jammed", 0), ("VPN", 45)]), EXACT)
+    
+    # Second ticket waits for the first; the third arrives at 45 and starts at 60
+    assert result["wait_minutes"]["max"] == 30.0
+    assert result["wait_minutes"]["mean"] == 15.0
+    assert result["makespan_hours"] == 1.5
+    assert result["agents"]["a1"] == {"tickets": 3, "utilization": 1.0, "peak_open": 2}
+
+
+def test_current_load_is_queued_work(inputs, make_agent):
+    result = simulate(inputs([make_agent("a1", current_load=2)], [("Network down", 0)]), EXACT)
+    assert result["wait_minutes"]["max"] == 60.0
+    assert result["agents"]["a1"]["peak_open"] == 3
+
+
+def test_tickets_follow_skills_and_the_cap(inputs, make_agent):
+    agents = [make_agent("net", skills={"Networking": 9}), make_agent("db", skills={"Database_SQL": 9}),
+              make_agent("away", skills={"Networking": 10}, availability_status="Offline")]
+    arrivals = [("Network switch down", 0), ("SQL query timeout", 1), ("Network switch down", 2)]
+    result = simulate(inputs(agents, arrivals), EXACT)
+    assert {agent_id: agent["tickets"] for agent_id, agent in result["agents"].items()} == {"net": 2, "db": 1, "away": 0}
+    
+    # A cap of one open ticket each: the third arrival finds both agents full
+    capped = replace(EXACT, cap_fraction=0.5, window=2)
+    assert simulate(inputs(agents, arrivals), capped)["over_cap_arrivals"] == 1
+
+
+def test_runs_are_reproducible(inputs, make_agent):
+    agents = [make_agent(f"a{index}", skills={"Networking": 3 * index}) for index in range(4)]
+    simulation = inputs(agents, [("Network switch down", minutes) for minutes in range(0, 200, 7)])
+    params = SimulationParams(seed=5)
+    assert simulate(simulation, params) == simulate(simulation, params, chunk_size=4)
+    assert simulate(simulation, params) != simulate(simulation, SimulationParams(seed=6))
+
+
+def test_parameter_grid_and_sweep(inputs, make_agent):
+    grid = parameter_grid(EXACT, cap_fraction=[0.1, 0.2], load_weight=[0.0, 1.0, 2.0])
+    assert len(grid) == 6
+    assert [(params.cap_fraction, params.load_weight) for params in grid[:3]] == [(0.1, 0.0), (0.1, 1.0), (0.1, 2.0)]
+    assert {params.handling_sigma for params in grid} == {0.0}
+    
+    simulation = inputs([make_agent("a1"), make_agent("a2", current_load=1)],
+                        [("Network down", minutes) for minutes in range(0, 60, 5)])
+    assert run_sweep(simulation, grid, workers=2) == run_sweep(simulation, grid)
+
+
+def test_no_available_agents(inputs, make_agent):
+    with pytest.raises(ValueError, match="No available agents"):
+        simulate(inputs([make_agent("a1", availability_status="Offline")], [("Network down", 0)]), EXACT)
+
+
+def test_simulate_command_reads_separate_ticket_file(tmp_path):
+    dataset = tmp_path / "agents.json"
+    dataset.write_text(json.dumps({"agents": [agent_record("a1", {"Networking": 9}), agent_record("a2")]}),
+                       encoding="utf-8")
+    tickets = tmp_path / "tickets.jsonl"
+    tickets.write_text("".join(json.dumps(ticket_record(f"T{index}", "Network switch down", "",
+                                                        1757827200 + 60 * index)) + "\n" for index in range(7)),
+                       encoding="utf-8")
+    report = tmp_path / "report.json"
+    
+    with pytest.raises(SystemExit) as exit_info:
+        main.main(["simulate", "--dataset", str(dataset), "--tickets", str(tickets), "--workers", "1",
+                   "--report", str(report)])
+    
+    assert exit_info.value.code == 0
+    results = json.loads(report.read_text(encoding="utf-8"))
+    assert [result["tickets"] for result in results] == [7]
+    assert sum(agent["tickets"] for agent in results[0]["agents"].values()) == 7
@@ -0,0 +1,109 @@
+"""
+Tests for skill keyword extraction.
+"""
+import json
+import multiprocessing
+import os
+import pytest
+from conftest import agent_record, ticket_record
+import config
+import main
+from src import skills
+from src.local_scorer import LocalScorer
+from src.models import Ticket
+from src.sharding import AssignerFactory, assign_sharded
+from src.simulator import SimulationInput, SimulationParams, run_sweep
+from src.skills import SKILL_MAPPING, SkillMatcher, extract_relevant_skills
+
+
+DATASET = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dataset.json")
+
+# Substring hits of the original scan that were never meant: 'mac' inside 'machine'
+SUBSTRING_FALSE_POSITIVES = {"TKT-2025-053": {"Mac_OS"}}
+
+
+def substring_scan(text: str):
+    """The original extraction: every keyword found anywhere in the text, deduplicated."""
+    text = text.lower()
+    return list(dict.fromkeys(skill for keyword, skill in SKILL_MAPPING.items() if keyword in text))
+
+
+@pytest.fixture
+def matcher():
+    return SkillMatcher(SKILL_MAPPING)
+
+
+def test_matches_original_scan_on_dataset():
+    with open(DATASET, encoding="utf-8") as file:
+        records = json.load(file)["tickets"]
+    for record in records:
+        ticket = Ticket(record["ticket_id"], record["title"], record["description"], record["creation_timestamp"])
+        expected = [skill for skill in substring_scan(f"{ticket.title} {ticket.description}")
+                    if skill not in SUBSTRING_FALSE_POSITIVES.get(ticket.ticket_id, ())]
+        assert extract_relevant_skills(ticket) == expected, ticket.ticket_id
+
+
+def test_compound_words_keep_their_skill(matcher):
+    assert matcher.match("Cannot install updates on macOS Sonoma") == ["Mac_OS"]
+    assert matcher.match("MacBook will not charge") == ["Mac_OS"]
+    assert matcher.match("Company website returns 502") == ["Web_Server_Apache_Nginx"]
+
+
+def test_keywords_match_whole_words_only(matcher):
+    assert matcher.match("Rapid growth in machine count") == []
+    assert matcher.match("Printers jammed; VPNs dropping") == ["VPN_Troubleshooting", "Printer_Troubleshooting"]
+
+
+def test_phrases_and_slash_terms(matcher):
+    assert matcher.match("Active Directory sync broken") == ["Active_Directory"]
+    assert matcher.match("The directory is active") == []
+    assert matcher.match("CI/CD pipeline fails; python/powershell scripts") == [
+        "DevOps_CI_CD", "Python_Scripting", "PowerShell_Scripting"
+    ]
+
+
+def test_extra_mapping_is_configurable():
+    try:
+        skills.configure_skill_mapping({"okta": "Identity_Management"})
+        ticket = Ticket("T1", "Okta login loop", "", 0)
+        assert extract_relevant_skills(ticket) == ["Identity_Management"]
+        assert "Identity_Management" in skills.known_skills()
+    finally:
+        skills.configure_skill_mapping()
+
+
+@pytest.fixture
+def okta_keywords(tmp_path, monkeypatch):
+    """A keyword file mapping 'okta' to Identity_Management, set in config; the defaults are restored after."""
+    path = tmp_path / "keywords.json"
+    path.write_text(json.dumps({"okta": "Identity_Management"}), encoding="utf-8")
+    monkeypatch.setattr(config, "SKILL_KEYWORDS_PATH", str(path))
+    yield
+    skills.configure_skill_mapping()
+
+
+def test_analyze_uses_the_configured_keywords(okta_keywords, write_dataset, tmp_path):
+    dataset = write_dataset([agent_record("a1", {"Identity_Management": 8})], [ticket_record("T1", "Okta login loop")])
+    output = tmp_path / "output.jsonl"
+    output.write_text(json.dumps({"ticket_id": "T1", "title": "", "assigned_agent_id": "a1", "rationale": ""}) + "\n",
+                      encoding="utf-8")
+    report = tmp_path / "report.json"
+    with pytest.raises(SystemExit):
+        main.main(["analyze", str(output), "--dataset", dataset, "--report", str(report)])
+    assert json.loads(report.read_text(encoding="utf-8"))["mean_skill_match"] == 0.8
+
+
+def test_spawned_workers_get_the_configured_keywords(okta_keywords, make_agent, make_ticket):
+    main.configure_skills()
+    agents = {agent.agent_id: agent for agent in [make_agent("generalist"),
+                                                  make_agent("identity", skills={"Identity_Management": 9})]}
+    tickets = [make_ticket(f"T{index}", "Okta login loop", "", 1757827200 + 60 * index) for index in range(4)]
+    spawn = multiprocessing.get_context("spawn")
+    
+    assignments, _, _ = assign_sharded(tickets, agents, 20, AssignerFactory("local", LocalScorer()), workers=2,
+                                       chunk_size=2, context=spawn)
+    assert [assignment.assigned_agent_id for assignment in assignments] == ["identity"] * 2 + ["generalist"] * 2
+    
+    inputs = SimulationInput(agents, tickets)
+    grid = [SimulationParams(seed=1), SimulationParams(seed=2)]
+    assert run_sweep(inputs, grid, workers=2, context=spawn) == run_sweep(inputs, grid)
@@ -0,0 +1,124 @@
+"""
+Tests for TicketProcessor runs with the offline backends and the fake LLM.
+"""
+import json
+import threading
+from collections import Counter
+import pytest
+from benchmarks.fake_llm import FakeLLM
+from conftest import agent_record, ticket_record
+from src.ticket_processor import QUIET, TicketProcessor
+
+
+def run(dataset_path: str, backend: str, max_in_flight: int = 1, batch_size: int = 1, **options) -> TicketProcessor:
+    processor = TicketProcessor(dataset_path, backend=backend, verbosity=QUIET, **options)
+    processor.initialize()
+    processor.process_all_tickets(max_in_flight=max_in_flight, batch_size=batch_size)
+    return processor
+
+
+class ConcurrencyProbe(FakeLLM):
+    """FakeLLM that records the most requests it was answering at once."""
+    
+    def __init__(self, **options):
+        super().__init__(**options)
+        self.active = 0
+        self.peak = 0
+        self._probe_lock = threading.Lock()
+    
+    def __call__(self, prompt: str):
+        with self._probe_lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        try:
+            return super().__call__(prompt)
+        finally:
+            with self._probe_lock:
+                self.active -= 1
+
+
+def cap_respected(processor: TicketProcessor, initial_loads: dict) -> bool:
+    """Every agent's own (non-fallback) assignments keep it within the 11% cap."""
+    cap = int(len(processor.tickets) * 0.11)
+    counts = Counter(assignment.assigned_agent_id for assignment in processor.assignments
+                     if not assignment.rationale.startswith("Fallback"))
+    return all(initial_loads[agent_id] + count <= cap for agent_id, count in counts.items())
+
+
+def test_plan_places_overflow_after_the_plan_without_exceeding_the_cap(write_dataset):
+    # Loads of 3 leave 8 slots each under the cap of 11: 80 slots for 100 tickets
+    skills = ["Networking", "Database_SQL", "Active_Directory", "Laptop_Repair"]
+    agents = [agent_record(f"agent_{index:02d}", {skills[index % 4]: 5 + index % 5}, current_load=3)
+              for index in range(10)]
+    titles = ["Network outage", "SQL deadlock", "Active Directory login fails", "Laptop won't charge"]
+    tickets = [ticket_record(f"T{index:03d}", titles[index % 4]) for index in range(100)]
+    processor = run(write_dataset(agents, tickets), "optimal")
+    
+    counts = Counter(assignment.assigned_agent_id for assignment in processor.assignments)
+    fallbacks = [assignment for assignment in processor.assignments if assignment.rationale.startswith("Fallback")]
+    assert len(processor.assignments) == 100
+    assert len(fallbacks) == 20
+    assert max(counts.values()) <= 11
+    assert all(agent.current_load == 11 for agent in processor.agents.values())
+
+
+def test_concurrent_dispatch_keeps_order_and_cap(write_dataset, fake_llm):
+    agents = [agent_record(f"a{index}", {"Networking": 5 + index}, current_load=index % 3) for index in range(8)]
+    tickets = [ticket_record(f"T{index:02d}", "Network outage", f"Floor {index}") for index in range(60)]
+    dataset = write_dataset(agents, tickets)
+    assigner, probe = fake_llm(ConcurrencyProbe(latency_ms=5))
+    
+    processor = run(dataset, "llm", max_in_flight=4, llm_assigner=assigner)
+    
+    assert probe.peak > 1
+    assert probe.peak <= 4
+    assert [assignment.ticket_id for assignment in processor.assignments] == [ticket["ticket_id"] for ticket in tickets]
+    assert cap_respected(processor, {agent["agent_id"]: agent["current_load"] for agent in agents})
+
+
+def test_sequential_dispatch_sends_one_request_at_a_time(support_dataset, fake_llm):
+    assigner, probe = fake_llm(ConcurrencyProbe(latency_ms=1))
+    processor = run(support_dataset, "llm", llm_assigner=assigner)
+    assert probe.peak == 1
+    assert len(processor.assignments) == 20
+
+
+class DropsFirstTicket(FakeLLM):
+    """FakeLLM whose batch answers leave out the first ticket of the batch."""
+    
+    def _answer(self, prompt: str) -> str:
+        answer = super()._answer(prompt)
+        if "JSON object mapping" not in prompt:
+            return answer
+        mapping = json.loads(answer)
+        mapping.pop(next(iter(mapping)))
+        return json.dumps(mapping)
+
+
+@pytest.fixture
+def roomy_dataset(write_dataset):
+    """Ten idle agents and fifty tickets: the cap of 5 leaves room for every ticket."""
+    agents = [agent_record(f"a{index}", {"Networking": 5 + index % 4}) for index in range(10)]
+    tickets = [ticket_record(f"T{index:02d}", "Network outage", f"Floor {index}") for index in range(50)]
+    return write_dataset(agents, tickets)
+
+
+def test_batched_prompts_send_one_request_per_batch(roomy_dataset, fake_llm):
+    assigner, fake = fake_llm()
+    processor = run(roomy_dataset, "llm", batch_size=5, llm_assigner=assigner)
+    
+    assert fake.calls == 10
+    assert [assignment.ticket_id for assignment in processor.assignments] == [f"T{index:02d}" for index in range(50)]
+    assert not any(assignment.rationale.startswith("Fallback") for assignment in processor.assignments)
+
+
+def test_tickets_missing_from_a_batch_answer_are_retried_alone(roomy_dataset, fake_llm):
+    assigner, fake = fake_llm(DropsFirstTicket())
+    processor = run(roomy_dataset, "llm", batch_size=5, llm_assigner=assigner)
+    
+    # Ten batch requests plus one single-ticket retry per batch
+    assert fake.calls == 20
+    assert processor.metrics.counter("single_ticket_retries") == 10
+    assert assigner.metrics.counter("batch_answers_rejected") == 10
+    assert [assignment.ticket_id for assignment in processor.assignments] == [f"T{index:02d}" for index in range(50)]
+    assert not any(assignment.rationale.startswith("Fallback") for assignment in processor.assignments)